@@ -8,6 +8,7 @@ import asyncio
 import re
 import logging
 from base_agent import BaseAgent
+from entity_index import entity_index, source_key
 
 logger = logging.getLogger(__name__)
 
@@ -257,7 +258,7 @@ class ContentAgent(BaseAgent):
                 "field_constraints": constraints,
             }, summary=f"{content_type}: {len(constraints)} field constraints")
         
-        result = await asyncio.to_thread(self._migrate_all, blueprint, envelopes)
+        result = await self._migrate_all(blueprint, envelopes)
         
         # Log migration results
         await self.log_extended("content_migration_complete", {
@@ -273,20 +274,11 @@ class ContentAgent(BaseAgent):
 
     def _load_capability_envelopes(self) -> dict:
         """Load capability envelopes for field constraints."""
-        from memory import memory as shared_memory
-        envelopes = {}
-        
-        # Get all envelopes
-        envelope_keys = shared_memory.list_capability_envelopes()
-        for key in envelope_keys:
-            envelope = shared_memory.get_capability_envelope(key)
-            if envelope:
-                envelopes[key] = envelope
-        
-        return envelopes
+        # One SCAN for the names, one pipelined MGET for the envelopes
+        return {k: v for k, v in self.memory.get_capability_envelopes().items() if v}
 
-    def _migrate_all(self, blueprint: dict, envelopes: dict) -> dict:
-        """Migrate content using capability envelopes for constraints."""
+    async def _migrate_all(self, blueprint: dict, envelopes: dict) -> dict:
+        """Migrate content using capability envelopes for constraints; writes go through the pooled async client."""
         created = 0
         errors = []
 
@@ -296,6 +288,8 @@ class ContentAgent(BaseAgent):
         
         logger.info(f"[CONTENT] Starting migration with {len(field_constraints)} field constraints for article")
         
+        source_url = blueprint.get("source_url", "")
+
         # Create taxonomy terms from navigation-derived categories
         nav_items = blueprint.get("navigation", [])
         if nav_items:
@@ -304,8 +298,13 @@ class ContentAgent(BaseAgent):
                 for item in nav_items[:5]:
                     if item["title"].lower() not in ("home", "contact"):
                         try:
+                            tag_key = source_key(source_url, section=f"tag:{item['title']}")
+                            if await entity_index.aget(tag_key):
+                                logger.info(f"[CONTENT] Tag already migrated: {item['title']}")
+                                continue
                             logger.info(f"[CONTENT] Creating tag: {item['title']}")
-                            self.drupal.create_term("tags", item["title"])
+                            term = await self.async_drupal.create_term("tags", item["title"])
+                            await entity_index.aput(tag_key, term.get("id"), "taxonomy_term--tags", "")
                         except Exception as e:
                             logger.warning(f"[CONTENT] Failed to create tag {item['title']}: {e}")
                             pass
@@ -318,13 +317,16 @@ class ContentAgent(BaseAgent):
         sections_to_migrate = [s for s in sections if s.get("type") not in (None, "navigation", "footer")]
         logger.info(f"[CONTENT] Found {len(sections_to_migrate)} sections to migrate (all types except navigation/footer)")
         
+        headings = []
+        items = []
+        keys = []
         for i, section in enumerate(sections_to_migrate):
             try:
                 heading = section.get("heading", "Sample Post")
                 text = section.get("text_preview", "Content migrated by DrupalMind.")
                 section_type = section.get("type", "unknown")
                 
-                logger.info(f"[CONTENT] Migrating section {i+1}/{len(sections_to_migrate)}: {heading} (type: {section_type})")
+                logger.info(f"[CONTENT] Preparing section {i+1}/{len(sections_to_migrate)}: {heading} (type: {section_type})")
                 logger.info(f"[CONTENT]   Text preview: {text[:80]}...")
                 
                 # Apply field constraints from envelope
@@ -336,20 +338,43 @@ class ContentAgent(BaseAgent):
                 )
                 
                 logger.info(f"[CONTENT]   Applying field constraints: {list(node_data.keys())}")
-                
-                node = self.drupal.create_node("article", node_data)
-                node_id = node.get("id", "unknown")
-                nid = node.get("attributes", {}).get("drupal_internal__nid", "unknown")
-                logger.info(f"[CONTENT]   ✓ Created article node: ID={node_id}, NID={nid}")
-                
-                created += 1
+                headings.append(heading)
+                items.append(node_data)
+                keys.append(source_key(source_url, section=f"section-{section.get('index', i)}"))
             except Exception as e:
-                logger.error(f"[CONTENT]   ✗ Failed to migrate section '{heading}': {e}")
+                logger.error(f"[CONTENT]   ✗ Failed to prepare section '{section.get('heading')}': {e}")
                 errors.append(str(e))
 
-        self.memory.set("content_migration", {"created": created, "errors": errors})
+        # Upsert all articles (skip unchanged, PATCH changed, bulk-POST new), then retry
+        # only the writes that failed — not atomic items that were applied without a result
+        entries = list(zip(keys, items))
+        logger.info(f"[CONTENT] Upserting {len(entries)} article nodes")
+        results = await entity_index.aupsert_nodes(self.async_drupal, "article", entries) if entries else []
+        failed = [r["index"] for r in results if not r["ok"] and r["retryable"]]
+        if failed:
+            logger.warning(f"[CONTENT] Retrying {len(failed)} failed article(s)")
+            retries = await entity_index.aupsert_nodes(self.async_drupal, "article", [entries[i] for i in failed])
+            for idx, retry in zip(failed, retries):
+                results[idx] = {**retry, "index": idx}
+
+        unchanged = 0
+        for res in results:
+            heading = headings[res["index"]]
+            if res["ok"] and res["action"] == "unchanged":
+                unchanged += 1
+            elif res["ok"]:
+                node = res["data"] or {}
+                nid = node.get("attributes", {}).get("drupal_internal__nid", "unknown")
+                logger.info(f"[CONTENT]   ✓ {res['action'].capitalize()} article node '{heading}': ID={node.get('id', 'unknown')}, NID={nid}")
+                created += 1
+            else:
+                logger.error(f"[CONTENT]   ✗ Failed to migrate section '{heading}': {res['error']}")
+                errors.append(res["error"])
+
+        self.memory.set("content_migration", {"created": created, "unchanged": unchanged, "errors": errors})
         return {
             "created": created,
+            "unchanged": unchanged,
             "errors": errors[:3],
             "detail": f"Tags, articles created from {len(sections)} source sections with field constraints",
             "sections_migrated": len(sections_to_migrate),
@@ -473,9 +498,9 @@ class TestAgent(BaseAgent):
 
         # Check: navigation
         try:
-            menus = self.drupal.get_menu_items("main")
-            if menus:
-                checks.append({"check": "Main Navigation", "status": "pass", "detail": f"{len(menus)} menu items found"})
+            menu_count = sum(1 for _ in self.drupal.iter_menu_items("main", fields=["title"]))
+            if menu_count:
+                checks.append({"check": "Main Navigation", "status": "pass", "detail": f"{menu_count} menu items found"})
                 passed += 1
             else:
                 checks.append({"check": "Main Navigation", "status": "warn", "detail": "No menu items found"})
@@ -668,9 +693,9 @@ class QAAgent(BaseAgent):
 
         # Check navigation
         try:
-            menu_items = self.drupal.get_menu_items("main")
-            if menu_items:
-                checks.append({"check": "Navigation Links", "status": "pass", "detail": f"{len(menu_items)} nav items"})
+            menu_count = sum(1 for _ in self.drupal.iter_menu_items("main", fields=["title"]))
+            if menu_count:
+                checks.append({"check": "Navigation Links", "status": "pass", "detail": f"{menu_count} nav items"})
                 passed += 1
             else:
                 checks.append({"check": "Navigation Links", "status": "warn", "detail": "Main menu is empty"})
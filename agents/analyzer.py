@@ -14,6 +14,7 @@ import requests
 from bs4 import BeautifulSoup
 
 from base_agent import BaseAgent
+from blob_store import blob_store
 
 # Configure logging for AnalyzerAgent
 logger = logging.getLogger("drupalmind.analyzer")
@@ -159,8 +160,6 @@ class AnalyzerAgent(BaseAgent):
             return screenshots
         
         try:
-            import base64
-            
             with sync_playwright() as p:
                 browser = p.chromium.launch(headless=True)
                 page = browser.new_page(viewport={"width": 1280, "height": 800})
@@ -169,11 +168,10 @@ class AnalyzerAgent(BaseAgent):
                 try:
                     page.goto(source_url, wait_until="domcontentloaded", timeout=10000)
                     
-                    # Get screenshot as base64
-                    home_screenshot_b64 = page.screenshot(full_page=False, type="png")
-                    home_screenshot_base64 = base64.b64encode(home_screenshot_b64).decode('utf-8')
-                    screenshots["home"] = f"data:image/png;base64,{home_screenshot_base64}"
-                    logger.info(f"Captured homepage screenshot as base64 ({len(home_screenshot_base64)} chars)")
+                    # Stored in the blob store; the blueprint keeps only the blob:<sha256> ref
+                    home_png = page.screenshot(full_page=False, type="png")
+                    screenshots["home"] = blob_store.put(home_png, "image/png")
+                    logger.info(f"Captured homepage screenshot ({len(home_png)} bytes) as {screenshots['home']}")
                 except Exception as e:
                     logger.warning(f"Failed to capture homepage screenshot: {e}")
                 
@@ -184,12 +182,11 @@ class AnalyzerAgent(BaseAgent):
                         try:
                             page.goto(page_url, wait_until="domcontentloaded", timeout=10000)
                             
-                            page_b64 = page.screenshot(full_page=False, type="png")
-                            page_base64 = base64.b64encode(page_b64).decode('utf-8')
+                            page_png = page.screenshot(full_page=False, type="png")
                             
                             screenshots["pages"].append({
                                 "path": page_info.get("path"),
-                                "screenshot": f"data:image/png;base64,{page_base64}"
+                                "screenshot": blob_store.put(page_png, "image/png")
                             })
                         except Exception as e:
                             logger.warning(f"Failed to capture screenshot for {page_url}: {e}")
@@ -247,12 +244,13 @@ class AnalyzerAgent(BaseAgent):
                 ),
             }
         ]
-        raw = self.client.messages.create(
-            model=self.MODEL,
+        raw = self.llm.call_with_tools(
+            model=self.llm.get_model(),
             max_tokens=2048,
+            system="",
             messages=messages,
         )
-        text = raw.content[0].text.strip()
+        text = raw["content"].strip()
         # Strip markdown code fences if present
         text = re.sub(r"^```json\s*", "", text)
         text = re.sub(r"```\s*$", "", text)
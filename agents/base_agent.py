@@ -8,13 +8,23 @@ All agents inherit from this. Provides:
 import os
 import json
 import asyncio
+import time
 import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable, Optional
 import anthropic
+import httpx
 import openai
 
 from memory import memory as shared_memory
-from drupal_client import DrupalClient
+from blob_store import blob_store, is_ref as is_blob_ref, ref_id as blob_ref_id
+from llm_cache import llm_cache, fingerprint
+import llm_usage
+from drupal_client import DrupalClient, AsyncDrupalClient
+from entity_index import entity_index, source_key
+from drupal_metrics import DrupalMetrics
 
 # Configure detailed logging
 logging.basicConfig(
@@ -41,12 +51,30 @@ OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
 
+# Connection pool shared by the async LLM clients (one per event loop)
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "10"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+
+# Anthropic prompt caching: cache breakpoints after the system prompt, the tool
+# list and (optionally) the first user message, which carries the blueprint context
+ANTHROPIC_PROMPT_CACHE = os.getenv("ANTHROPIC_PROMPT_CACHE", "true").lower() == "true"
+ANTHROPIC_CACHE_FIRST_MESSAGE = os.getenv("ANTHROPIC_CACHE_FIRST_MESSAGE", "true").lower() == "true"
+CACHE_CONTROL = {"type": "ephemeral"}
+
+# Worker pool for tool calls of one LLM turn that may run concurrently (shared by all agents)
+TOOL_MAX_WORKERS = int(os.getenv("TOOL_MAX_WORKERS", "8"))
+_tool_pool = ThreadPoolExecutor(max_workers=TOOL_MAX_WORKERS, thread_name_prefix="drupalmind-tool")
+
 
 class LLMProvider:
     """Unified LLM interface supporting Anthropic, OpenAI, and Ollama."""
     
     def __init__(self):
         self.provider = LLM_PROVIDER
+        self._aio_clients = weakref.WeakKeyDictionary()
+        self._prompt_cache = {"calls": 0, "cache_read_tokens": 0, "cache_write_tokens": 0, "uncached_tokens": 0}
+        self._prompt_cache_lock = threading.Lock()
         self._setup_client()
     
     def _setup_client(self):
@@ -105,26 +133,47 @@ class LLMProvider:
             return f"Ollama ({self.model})"
         return self.provider
     
-    def call_with_tools(self, model: str, max_tokens: int, system: str, messages: list, tools: list = None) -> dict:
+    def _get_aio_client(self):
         """
-        Call LLM with tools. Returns response with stop_reason and content.
-        Unified interface for all providers.
+        Async SDK client for the running event loop. All of them share one
+        pooled httpx.AsyncClient per loop, so concurrent conversations reuse
+        keep-alive connections instead of each holding a worker thread.
         """
+        loop = asyncio.get_running_loop()
+        client = self._aio_clients.get(loop)
+        if client is None:
+            http = httpx.AsyncClient(
+                timeout=LLM_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                ),
+            )
+            if self.provider == "anthropic":
+                client = anthropic.AsyncAnthropic(
+                    api_key=os.getenv("ANTHROPIC_API_KEY"),
+                    base_url=ANTHROPIC_BASE_URL,
+                    http_client=http,
+                )
+            elif self.provider == "openai":
+                client = openai.AsyncOpenAI(
+                    api_key=os.getenv("OPENAI_API_KEY"),
+                    base_url=OPENAI_BASE_URL,
+                    http_client=http,
+                )
+            else:
+                client = http
+            self._aio_clients[loop] = client
+        return client
+
+    def _log_request(self, model: str, system: str, messages: list, tools: list):
         logger.info(f"┌──────────────────────────────────────────────────────────────────────")
         logger.info(f"│ LLM REQUEST | Provider: {self.get_provider_name()} | Model: {model}")
         logger.info(f"│ System: {system[:100]}...")
         logger.info(f"│ Messages: {len(messages)} | Tools: {len(tools) if tools else 0}")
         logger.info(f"└──────────────────────────────────────────────────────────────────────")
-        
-        if self.provider == "anthropic":
-            result = self._call_anthropic(model, max_tokens, system, messages, tools)
-        elif self.provider == "openai":
-            result = self._call_openai(model, max_tokens, system, messages, tools)
-        elif self.provider == "ollama":
-            result = self._call_ollama(model, max_tokens, system, messages, tools)
-        else:
-            result = {"content": "", "stop_reason": "error", "tool_calls": []}
-        
+
+    def _log_response(self, result: dict):
         logger.info(f"┌──────────────────────────────────────────────────────────────────────")
         logger.info(f"│ LLM RESPONSE | Stop Reason: {result.get('stop_reason', 'unknown')}")
         content = result.get('content', '')
@@ -136,12 +185,95 @@ class LLMProvider:
             logger.info(f"│ Tool Calls: {len(tool_calls)}")
             for tc in tool_calls:
                 logger.info(f"│   - {tc.get('name', 'unknown')}: {str(tc.get('input', {}))[:100]}...")
+        usage = result.get('usage')
+        if usage:
+            logger.info(f"│ Usage: in {usage['input_tokens']} | out {usage['output_tokens']} tokens | "
+                        f"{result.get('latency_ms', 0):.0f} ms | ~${result.get('cost_usd', 0):.4f}")
+        if usage and (usage.get('cache_read_input_tokens') or usage.get('cache_creation_input_tokens')):
+            logger.info(f"│ Prompt Cache: hit {usage['cache_read_input_tokens']} | "
+                        f"write {usage['cache_creation_input_tokens']} | uncached {usage['input_tokens']} tokens")
         logger.info(f"└──────────────────────────────────────────────────────────────────────")
+
+    def call_with_tools(self, model: str, max_tokens: int, system: str, messages: list, tools: list = None,
+                        cache: bool = True) -> dict:
+        """
+        Call LLM with tools. Returns response with stop_reason and content.
+        Unified interface for all providers. Identical requests are answered
+        from the LLM response cache unless cache=False.
+        """
+        self._log_request(model, system, messages, tools)
+        key = fingerprint(self.provider, model, max_tokens, system, messages, tools) if cache else None
+        cached = llm_cache.get(key) if key else None
+        if cached is not None:
+            logger.info(f"[LLM_CACHE] Hit {key[:12]}")
+            llm_usage.record(self.provider, model, None, 0.0, cached=True)
+            self._log_response(cached)
+            return cached
+        
+        llm_usage.check_budget()
+        started = time.perf_counter()
+        if self.provider == "anthropic":
+            result = self._call_anthropic(model, max_tokens, system, messages, tools)
+        elif self.provider == "openai":
+            result = self._call_openai(model, max_tokens, system, messages, tools)
+        elif self.provider == "ollama":
+            result = self._call_ollama(model, max_tokens, system, messages, tools)
+        else:
+            result = {"content": "", "stop_reason": "error", "tool_calls": []}
+        
+        self._record_usage(model, result, time.perf_counter() - started)
+        if key:
+            llm_cache.put(key, result)
+        self._log_response(result)
+        return result
+
+    async def acall_with_tools(self, model: str, max_tokens: int, system: str, messages: list, tools: list = None,
+                               cache: bool = True) -> dict:
+        """Non-blocking call_with_tools on the async SDK clients; same request, result and caching."""
+        self._log_request(model, system, messages, tools)
+        key = fingerprint(self.provider, model, max_tokens, system, messages, tools) if cache else None
+        cached = await asyncio.to_thread(llm_cache.get, key) if key else None
+        if cached is not None:
+            logger.info(f"[LLM_CACHE] Hit {key[:12]}")
+            llm_usage.record(self.provider, model, None, 0.0, cached=True)
+            self._log_response(cached)
+            return cached
+        
+        llm_usage.check_budget()
+        started = time.perf_counter()
+        if self.provider == "anthropic":
+            response = await self._get_aio_client().messages.create(
+                **self._anthropic_kwargs(model, max_tokens, system, messages, tools))
+            result = self._parse_anthropic(response)
+        elif self.provider == "openai":
+            response = await self._get_aio_client().chat.completions.create(
+                **self._openai_kwargs(model, max_tokens, system, messages, tools))
+            result = self._parse_openai(response)
+        elif self.provider == "ollama":
+            response = await self._get_aio_client().post(
+                f"{self.base_url}/api/chat", json=self._ollama_payload(model, max_tokens, system, messages, tools))
+            response.raise_for_status()
+            result = self._parse_ollama(response.json())
+        else:
+            result = {"content": "", "stop_reason": "error", "tool_calls": []}
         
+        self._record_usage(model, result, time.perf_counter() - started)
+        if key:
+            await asyncio.to_thread(llm_cache.put, key, result)
+        self._log_response(result)
         return result
     
+    def _record_usage(self, model: str, result: dict, latency_s: float):
+        """Attach latency and estimated cost to the result and charge them to the current job."""
+        result["latency_ms"] = round(latency_s * 1000, 1)
+        result["cost_usd"] = llm_usage.record(self.provider, model, result.get("usage"), latency_s)
+
     def _call_anthropic(self, model: str, max_tokens: int, system: str, messages: list, tools: list) -> dict:
         """Call Anthropic API."""
+        response = self.client.messages.create(**self._anthropic_kwargs(model, max_tokens, system, messages, tools))
+        return self._parse_anthropic(response)
+
+    def _anthropic_kwargs(self, model: str, max_tokens: int, system: str, messages: list, tools: list) -> dict:
         kwargs = {
             "model": model,
             "max_tokens": max_tokens,
@@ -150,13 +282,60 @@ class LLMProvider:
         }
         if tools:
             kwargs["tools"] = tools
-        
-        response = self.client.messages.create(**kwargs)
-        
-        # Convert Anthropic response to unified format
+        if ANTHROPIC_PROMPT_CACHE:
+            self._mark_cache_breakpoints(kwargs)
+        return kwargs
+
+    def _mark_cache_breakpoints(self, kwargs: dict):
+        """
+        Mark the stable prefix of a request for Anthropic prompt caching, so the
+        tool loop does not pay full input price for it on every iteration.
+        Caller-owned lists and dicts are copied, never modified.
+        """
+        if kwargs["system"]:
+            kwargs["system"] = [{"type": "text", "text": kwargs["system"], "cache_control": CACHE_CONTROL}]
+        if kwargs.get("tools"):
+            kwargs["tools"] = kwargs["tools"][:-1] + [{**kwargs["tools"][-1], "cache_control": CACHE_CONTROL}]
+        messages = kwargs["messages"]
+        # Only worth it once the conversation continues past the first message
+        if ANTHROPIC_CACHE_FIRST_MESSAGE and len(messages) > 1 and isinstance(messages[0], dict):
+            content = messages[0].get("content")
+            if isinstance(content, str) and content:
+                blocks = [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}]
+            elif isinstance(content, list) and content and isinstance(content[-1], dict):
+                blocks = content[:-1] + [{**content[-1], "cache_control": CACHE_CONTROL}]
+            else:
+                return
+            kwargs["messages"] = [{**messages[0], "content": blocks}] + messages[1:]
+
+    def _record_prompt_cache(self, usage: dict):
+        with self._prompt_cache_lock:
+            self._prompt_cache["calls"] += 1
+            self._prompt_cache["cache_read_tokens"] += usage["cache_read_input_tokens"]
+            self._prompt_cache["cache_write_tokens"] += usage["cache_creation_input_tokens"]
+            self._prompt_cache["uncached_tokens"] += usage["input_tokens"]
+
+    def prompt_cache_stats(self) -> dict:
+        """Cumulative Anthropic prompt-cache token counts since startup."""
+        with self._prompt_cache_lock:
+            stats = dict(self._prompt_cache)
+        prompt_tokens = stats["cache_read_tokens"] + stats["cache_write_tokens"] + stats["uncached_tokens"]
+        stats["hit_ratio"] = round(stats["cache_read_tokens"] / prompt_tokens, 3) if prompt_tokens else None
+        return stats
+
+    def _parse_anthropic(self, response) -> dict:
+        """Convert Anthropic response to unified format."""
         content = ""
         stop_reason = "end_turn"
         tool_calls = []
+        usage = {
+            "input_tokens": getattr(response.usage, "input_tokens", 0) or 0,
+            "output_tokens": getattr(response.usage, "output_tokens", 0) or 0,
+            # Prompt-cache hits and writes; absent (None) when nothing was marked
+            "cache_read_input_tokens": getattr(response.usage, "cache_read_input_tokens", 0) or 0,
+            "cache_creation_input_tokens": getattr(response.usage, "cache_creation_input_tokens", 0) or 0,
+        }
+        self._record_prompt_cache(usage)
         
         for block in response.content:
             if hasattr(block, "text"):
@@ -173,11 +352,16 @@ class LLMProvider:
             "content": content,
             "stop_reason": stop_reason,
             "tool_calls": tool_calls,
+            "usage": usage,
             "raw_response": response,
         }
     
     def _call_openai(self, model: str, max_tokens: int, system: str, messages: list, tools: list) -> dict:
         """Call OpenAI API."""
+        response = self.client.chat.completions.create(**self._openai_kwargs(model, max_tokens, system, messages, tools))
+        return self._parse_openai(response)
+
+    def _openai_kwargs(self, model: str, max_tokens: int, system: str, messages: list, tools: list) -> dict:
         # Convert messages to OpenAI format
         openai_messages = []
         if system:
@@ -244,10 +428,10 @@ class LLMProvider:
         if tools:
             # Convert tools to OpenAI format
             kwargs["tools"] = self._convert_tools(tools)
-        
-        response = self.client.chat.completions.create(**kwargs)
-        
-        # Convert OpenAI response to unified format
+        return kwargs
+
+    def _parse_openai(self, response) -> dict:
+        """Convert OpenAI response to unified format."""
         content = ""
         stop_reason = "end_turn"
         tool_calls = []
@@ -264,10 +448,22 @@ class LLMProvider:
         elif choice.finish_reason == "stop":
             content = choice.message.content or ""
         
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = (details.get("cached_tokens") if isinstance(details, dict)
+                         else getattr(details, "cached_tokens", 0)) or 0
+        
         return {
             "content": content,
             "stop_reason": stop_reason,
             "tool_calls": tool_calls,
+            "usage": {
+                "input_tokens": prompt_tokens - cached_tokens,
+                "output_tokens": getattr(usage, "completion_tokens", 0) or 0,
+                "cache_read_input_tokens": cached_tokens,
+                "cache_creation_input_tokens": 0,
+            },
             "raw_response": response,
         }
     
@@ -275,6 +471,13 @@ class LLMProvider:
         """Call Ollama API (local LLM)."""
         import requests
         
+        endpoint = f"{self.base_url}/api/chat"
+        payload = self._ollama_payload(model, max_tokens, system, messages, tools)
+        response = requests.post(endpoint, json=payload, timeout=LLM_TIMEOUT)
+        response.raise_for_status()
+        return self._parse_ollama(response.json())
+
+    def _ollama_payload(self, model: str, max_tokens: int, system: str, messages: list, tools: list) -> dict:
         # Prepare messages for Ollama
         ollama_messages = []
         if system:
@@ -295,8 +498,6 @@ class LLMProvider:
         # Ollama doesn't support tools natively in the same way
         # We'll use a simplified approach: if tools are provided,
         # include them in the system prompt and extract tool calls from response
-        endpoint = f"{self.base_url}/api/chat"
-        
         payload = {
             "model": model,
             "messages": ollama_messages,
@@ -313,11 +514,9 @@ class LLMProvider:
                 ollama_messages[0]["content"] += "\n\n" + tool_descriptions
             else:
                 ollama_messages.insert(0, {"role": "system", "content": tool_descriptions})
-        
-        response = requests.post(endpoint, json=payload, timeout=120)
-        response.raise_for_status()
-        result = response.json()
-        
+        return payload
+
+    def _parse_ollama(self, result: dict) -> dict:
         content = result.get("message", {}).get("content", "")
         
         # Try to extract tool calls from response
@@ -346,6 +545,12 @@ class LLMProvider:
             "content": content,
             "stop_reason": stop_reason,
             "tool_calls": tool_calls,
+            "usage": {
+                "input_tokens": result.get("prompt_eval_count", 0) or 0,
+                "output_tokens": result.get("eval_count", 0) or 0,
+                "cache_read_input_tokens": 0,
+                "cache_creation_input_tokens": 0,
+            },
             "raw_response": result,
         }
     
@@ -412,6 +617,13 @@ class BaseAgent:
     MODEL = os.getenv("AGENT_MODEL", "claude-sonnet-4-20250514")
     MAX_TOKENS = 4096
     MAX_TOOL_ITERATIONS = 20
+    # Tools that may run concurrently with each other when the model requests
+    # several in one turn: reads only. Writes run alone, in the order the model
+    # gave, since two creates for the same source key would both miss the
+    # entity index and POST twice (and menu items have no upsert at all).
+    PARALLEL_SAFE_TOOLS = frozenset({
+        "memory_read", "memory_list", "drupal_health", "get_content_types", "get_nodes", "get_menus",
+    })
 
     def __init__(self, agent_key: str, label: str):
         self.agent_key = agent_key      # short id used in log events e.g. "build"
@@ -420,9 +632,54 @@ class BaseAgent:
         # Use the unified LLM provider instead of direct Anthropic client
         self.llm = get_llm_provider()
         self.drupal = DrupalClient()
+        self._async_drupal: Optional[AsyncDrupalClient] = None
+        self._owns_async_drupal = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self.memory = shared_memory
         self._log_cb: Optional[Callable] = None  # async callback → WebSocket
 
+    @property
+    def async_drupal(self) -> AsyncDrupalClient:
+        """
+        Pooled non-blocking Drupal client. The orchestrator hands every agent the
+        job's shared client (use_async_drupal); an agent used on its own creates
+        one on first use and closes it in aclose().
+        """
+        if self._async_drupal is None:
+            self._async_drupal = AsyncDrupalClient().with_metrics(self.drupal.metrics)
+            self._owns_async_drupal = True
+        return self._async_drupal
+
+    def use_async_drupal(self, client: AsyncDrupalClient):
+        """Share `client`'s connection pool; calls are still recorded in this agent's metrics."""
+        self._async_drupal = client.with_metrics(self.drupal.metrics)
+        self._owns_async_drupal = False
+
+    async def aclose(self):
+        """Close the async Drupal client if this agent created it."""
+        if self._owns_async_drupal and self._async_drupal is not None:
+            await self._async_drupal.aclose()
+        self._async_drupal = None
+        self._owns_async_drupal = False
+
+    def attach_drupal_metrics(self, metrics: Optional[DrupalMetrics]):
+        """Record this agent's Drupal calls (sync and async) into `metrics`; None switches it off."""
+        self.drupal.metrics = metrics
+        if self._async_drupal is not None:
+            self._async_drupal.metrics = metrics
+
+    async def run_in_thread(self, fn, *args):
+        """asyncio.to_thread that lets `fn` await async Drupal calls through run_async."""
+        self._loop = asyncio.get_running_loop()
+        return await asyncio.to_thread(fn, *args)
+
+    def run_async(self, coro):
+        """From code started with run_in_thread: run `coro` on the agent's event loop and wait for it."""
+        if self._loop is None:
+            coro.close()
+            raise RuntimeError(f"{self.label}.run_async needs an event loop; start the caller with run_in_thread")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
     # ── Logging ───────────────────────────────────────────────
 
     def set_log_callback(self, cb: Callable):
@@ -454,12 +711,8 @@ class BaseAgent:
         
         # Add memory info safely
         try:
-            if hasattr(shared_memory, '_redis') and shared_memory._redis:
-                event["extended"]["memory_keys_count"] = len(shared_memory._redis.keys("*"))
-                event["extended"]["memory_backend"] = "redis"
-            elif hasattr(shared_memory, '_local'):
-                event["extended"]["memory_keys_count"] = len(shared_memory._local)
-                event["extended"]["memory_backend"] = "local"
+            event["extended"]["memory_keys_count"] = self.memory.key_count()
+            event["extended"]["memory_backend"] = self.memory.backend
         except:
             pass
         
@@ -514,6 +767,28 @@ class BaseAgent:
             }
         )
 
+    async def log_drupal_metrics(self):
+        """Emit per-operation Drupal request metrics (count, p95 latency, errors, bytes) via log_metric."""
+        if self.drupal.metrics is None:
+            return
+        for op, stats in self.drupal.metrics.snapshot()["operations"].items():
+            category = f"drupal.{op}"
+            await self.log_metric("requests", stats["count"], category=category)
+            await self.log_metric("latency_p95", stats["latency_ms"]["p95"], unit="ms", category=category)
+            await self.log_metric("errors", stats["errors"], category=category)
+            await self.log_metric("bytes_sent", stats["bytes_sent"], unit="B", category=category)
+            await self.log_metric("bytes_received", stats["bytes_received"], unit="B", category=category)
+
+    async def log_llm_usage(self, stats: dict, category: str = None):
+        """Emit LLM usage totals (tokens, latency, estimated cost) via log_metric."""
+        category = category or f"llm.{self.agent_key}"
+        await self.log_metric("calls", stats["calls"], category=category)
+        await self.log_metric("input_tokens", stats["input_tokens"], category=category)
+        await self.log_metric("output_tokens", stats["output_tokens"], category=category)
+        await self.log_metric("cache_read_tokens", stats["cache_read_tokens"], category=category)
+        await self.log_metric("avg_latency", stats["avg_latency_ms"] or 0, unit="ms", category=category)
+        await self.log_metric("cost", stats["cost_usd"], unit="USD", category=category)
+
     async def log_check(self, check_name: str, passed: bool, message: str = "", severity: str = "info"):
         """Log a check result with pass/fail status."""
         await self.log_extended(
@@ -558,9 +833,22 @@ class BaseAgent:
         
         Supports:
         - HTTP URLs (displayed directly)
+        - Blob store references (blob:<sha256>.png), served by GET /blobs/{id}
         - Base64 data URLs (data:image/png;base64,...)
         - Local file paths (not accessible from browser, logs a note)
         """
+        if is_blob_ref(image_url):
+            await self.log_extended(
+                "image",
+                {
+                    "image_url": blob_store.url(image_url),
+                    "blob_id": blob_ref_id(image_url),
+                    "label": label,
+                    "preview_width": width,
+                }
+            )
+            return
+
         # Check if it's a data URL (base64)
         if image_url and image_url.startswith('data:'):
             # It's a base64 data URL - send to UI for display
@@ -740,15 +1028,18 @@ class BaseAgent:
         max_iterations: int = None,
     ) -> str:
         """
-        Synchronous tool-use loop.
-        Call from async code via asyncio.to_thread().
+        Synchronous tool-use loop for code that already runs in a worker thread.
+        Async code should await acall_llm_with_tools() instead.
         Uses unified LLM provider for Anthropic, OpenAI, or Ollama.
         """
-        logger.info(f"══════════════════════════════════════════════════════════════════")
-        logger.info(f"║ AGENT START | {self.label} | System: {system[:50]}...")
-        logger.info(f"║ Messages: {len(messages)} | Tools: {len(tools) if tools else 0}")
-        logger.info(f"══════════════════════════════════════════════════════════════════")
-        
+        self._log_agent_start(system, messages, tools)
+        agent_token = llm_usage.current_agent.set(self.agent_key)
+        try:
+            return self._run_tool_loop(system, messages, tools, max_iterations)
+        finally:
+            llm_usage.current_agent.reset(agent_token)
+
+    def _run_tool_loop(self, system: str, messages: list, tools: list, max_iterations: int = None) -> str:
         iterations = max_iterations or self.MAX_TOOL_ITERATIONS
         
         # Get model from provider
@@ -766,74 +1057,169 @@ class BaseAgent:
             )
 
             if response["stop_reason"] == "end_turn":
-                logger.info(f"✓ Final response received ({len(response['content'])} chars)")
-                logger.info(f"Preview: {response['content'][:200]}...")
-                return response["content"]
+                return self._final_content(response)
 
             if response["stop_reason"] == "tool_use":
-                # Convert unified tool calls back to message format
-                # Include tool_calls in the assistant message for OpenAI compatibility
-                assistant_msg = {
-                    "role": "assistant",
-                    "content": response["content"]
-                }
-                if response.get("tool_calls"):
-                    assistant_msg["tool_calls"] = [
-                        {
-                            "id": tc["id"],
-                            "type": "function",
-                            "function": {
-                                "name": tc["name"],
-                                "arguments": json.dumps(tc["input"])
-                            }
-                        }
-                        for tc in response["tool_calls"]
-                    ]
-                messages.append(assistant_msg)
-                
-                tool_results = []
-                
-                logger.info(f"🔧 Tool calls: {len(response['tool_calls'])}")
-                for tc in response["tool_calls"]:
-                    tool_name = tc["name"]
-                    tool_input = tc["input"]
-                    logger.info(f"  → Executing: {tool_name}")
-                    logger.debug(f"     Input: {json.dumps(tool_input)[:200]}...")
-                    try:
-                        result = self._dispatch_tool(tool_name, tool_input)
-                        logger.info(f"  ✓ Result: {str(result)[:100]}...")
-                    except Exception as e:
-                        result = f"ERROR: {e}"
-                        logger.error(f"  ✗ Error: {e}")
-                    
-                    # Store tool result with the tool_call_id for proper handling
-                    tool_results.append({
-                        "tool_call_id": tc["id"],
-                        "content": str(result)[:8000],
-                    })
-                
-                # Add tool results in the appropriate format for the LLM provider
-                if self.llm.provider == "anthropic":
-                    # Anthropic format: user message with tool_result content blocks
-                    messages.append({
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "tool_result",
-                                "tool_use_id": result["tool_call_id"],
-                                "content": result["content"],
-                            }
-                            for result in tool_results
-                        ]
-                    })
-                else:
-                    # OpenAI format: tool message with tool_call_id and content
-                    messages.append({"role": "tool", "content": tool_results})
+                messages.append(self._assistant_message(response))
+                tool_results = self._run_tool_calls(response["tool_calls"])
+                messages.append(self._format_tool_results(tool_results))
             else:
                 break
         logger.warning("⚠ Agent loop ended without final response (max iterations reached)")
         return "Agent loop ended without final response"
 
+    async def acall_llm_with_tools(
+        self,
+        system: str,
+        messages: list,
+        tools: list,
+        max_iterations: int = None,
+    ) -> str:
+        """
+        Async tool-use loop: the LLM round trips are awaited on the event loop,
+        so many conversations can be in flight without a thread each. Tools are
+        synchronous and run on the tool worker pool.
+        """
+        self._log_agent_start(system, messages, tools)
+        agent_token = llm_usage.current_agent.set(self.agent_key)
+        try:
+            return await self._arun_tool_loop(system, messages, tools, max_iterations)
+        finally:
+            llm_usage.current_agent.reset(agent_token)
+
+    async def _arun_tool_loop(self, system: str, messages: list, tools: list, max_iterations: int = None) -> str:
+        iterations = max_iterations or self.MAX_TOOL_ITERATIONS
+        model = self.llm.get_model()
+        
+        for i in range(iterations):
+            logger.info(f"--- Iteration {i+1}/{iterations} ---")
+            response = await self.llm.acall_with_tools(
+                model=model,
+                max_tokens=self.MAX_TOKENS,
+                system=system,
+                messages=messages,
+                tools=tools if tools else None,
+            )
+
+            if response["stop_reason"] == "end_turn":
+                return self._final_content(response)
+
+            if response["stop_reason"] == "tool_use":
+                messages.append(self._assistant_message(response))
+                tool_results = await self._arun_tool_calls(response["tool_calls"])
+                messages.append(self._format_tool_results(tool_results))
+            else:
+                break
+        logger.warning("⚠ Agent loop ended without final response (max iterations reached)")
+        return "Agent loop ended without final response"
+
+    def _log_agent_start(self, system: str, messages: list, tools: list):
+        logger.info(f"══════════════════════════════════════════════════════════════════")
+        logger.info(f"║ AGENT START | {self.label} | System: {system[:50]}...")
+        logger.info(f"║ Messages: {len(messages)} | Tools: {len(tools) if tools else 0}")
+        logger.info(f"══════════════════════════════════════════════════════════════════")
+
+    def _final_content(self, response: dict) -> str:
+        logger.info(f"✓ Final response received ({len(response['content'])} chars)")
+        logger.info(f"Preview: {response['content'][:200]}...")
+        return response["content"]
+
+    def _assistant_message(self, response: dict) -> dict:
+        """Convert unified tool calls back to message format."""
+        # Include tool_calls in the assistant message for OpenAI compatibility
+        assistant_msg = {
+            "role": "assistant",
+            "content": response["content"]
+        }
+        if response.get("tool_calls"):
+            assistant_msg["tool_calls"] = [
+                {
+                    "id": tc["id"],
+                    "type": "function",
+                    "function": {
+                        "name": tc["name"],
+                        "arguments": json.dumps(tc["input"])
+                    }
+                }
+                for tc in response["tool_calls"]
+            ]
+        return assistant_msg
+
+    def _tool_batches(self, tool_calls: list) -> list:
+        """
+        Split one turn's tool calls into batches: consecutive parallel-safe calls
+        share a batch, every other call is a batch of its own.
+        """
+        batches, current = [], []
+        for tc in tool_calls:
+            if tc["name"] in self.PARALLEL_SAFE_TOOLS:
+                current.append(tc)
+                continue
+            if current:
+                batches.append(current)
+                current = []
+            batches.append([tc])
+        if current:
+            batches.append(current)
+        logger.info(f"🔧 Tool calls: {len(tool_calls)} in {len(batches)} batch(es)")
+        return batches
+
+    def _run_tool_calls(self, tool_calls: list) -> list:
+        """Run one turn's tool calls, batches concurrently on the tool pool; results keep call order."""
+        results = []
+        for batch in self._tool_batches(tool_calls):
+            if len(batch) == 1:
+                results.append(self._run_tool_call(batch[0]))
+            else:
+                results.extend(_tool_pool.map(self._run_tool_call, batch))
+        return results
+
+    async def _arun_tool_calls(self, tool_calls: list) -> list:
+        loop = asyncio.get_running_loop()
+        results = []
+        for batch in self._tool_batches(tool_calls):
+            results.extend(await asyncio.gather(
+                *(loop.run_in_executor(_tool_pool, self._run_tool_call, tc) for tc in batch)
+            ))
+        return results
+
+    def _run_tool_call(self, tc: dict) -> dict:
+        """Execute one tool call; errors are returned to the model as the result."""
+        tool_name = tc["name"]
+        tool_input = tc["input"]
+        logger.info(f"  → Executing: {tool_name}")
+        logger.debug(f"     Input: {json.dumps(tool_input)[:200]}...")
+        try:
+            result = self._dispatch_tool(tool_name, tool_input)
+            logger.info(f"  ✓ Result: {str(result)[:100]}...")
+        except Exception as e:
+            result = f"ERROR: {e}"
+            logger.error(f"  ✗ Error: {e}")
+        
+        # Store tool result with the tool_call_id for proper handling
+        return {
+            "tool_call_id": tc["id"],
+            "content": str(result)[:8000],
+        }
+
+    def _format_tool_results(self, tool_results: list) -> dict:
+        """Add tool results in the appropriate format for the LLM provider."""
+        if self.llm.provider == "anthropic":
+            # Anthropic format: user message with tool_result content blocks
+            return {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": result["tool_call_id"],
+                        "content": result["content"],
+                    }
+                    for result in tool_results
+                ]
+            }
+        # OpenAI format: tool message with tool_call_id and content
+        return {"role": "tool", "content": tool_results}
+
     def _dispatch_tool(self, name: str, inputs: dict) -> Any:
         """Route tool calls to methods. Override / extend in subclasses."""
         logger.info(f"╔══════════════════════════════════════════════════════════════")
@@ -886,15 +1272,24 @@ class BaseAgent:
         except Exception as e:
             return f"ERROR: {e}"
 
+    def _node_key(self, content_type: str, title: str, path_alias: str = "") -> str:
+        """Entity-index key for a node the model creates: its path alias, else content type + title."""
+        source_url = (self.memory.get_blueprint() or {}).get("source_url", "")
+        if path_alias:
+            return source_key(source_url, path_alias)
+        return source_key(source_url, section=f"{content_type}:{title}")
+
     def _tool_create_article(self, title: str, body: str, summary: str = "") -> str:
         try:
-            node = self.drupal.create_node("article", {
+            res = entity_index.upsert_nodes(self.drupal, "article", [(self._node_key("article", title), {
                 "title": title,
                 "body": {"value": body, "format": "basic_html", "summary": summary},
                 "status": True,
                 "promote": True,
-            })
-            return json.dumps({"id": node["id"], "title": title})
+            })])[0]
+            if not res["ok"]:
+                return f"ERROR: {res['error']}"
+            return json.dumps({"id": res["data"]["id"], "title": title, "action": res["action"]})
         except Exception as e:
             return f"ERROR: {e}"
 
@@ -907,8 +1302,10 @@ class BaseAgent:
             }
             if path_alias:
                 attrs["path"] = {"alias": path_alias}
-            node = self.drupal.create_node("page", attrs)
-            return json.dumps({"id": node["id"], "title": title, "path": path_alias})
+            res = entity_index.upsert_nodes(self.drupal, "page", [(self._node_key("page", title, path_alias), attrs)])[0]
+            if not res["ok"]:
+                return f"ERROR: {res['error']}"
+            return json.dumps({"id": res["data"]["id"], "title": title, "path": path_alias, "action": res["action"]})
         except Exception as e:
             return f"ERROR: {e}"
 
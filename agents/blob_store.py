@@ -0,0 +1,207 @@
+"""
+DrupalMind — Blob store
+Content-addressed storage for screenshots and other binary artifacts.
+Blobs are keyed by the SHA-256 of their bytes, so an identical screenshot is
+stored once; memory values and WebSocket events carry a short "blob:<id>"
+reference instead of a base64 data URL, and main.py serves the bytes at
+GET /blobs/{id}.
+
+BLOB_BACKEND=disk (default, sharded directories, memory-mapped reads)
+           | redis (the shared Redis, for multi-host deployments)
+           | s3 (any S3-compatible endpoint such as a local MinIO; needs boto3)
+"""
+import os
+import re
+import mmap
+import hashlib
+import logging
+import mimetypes
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+BLOB_BACKEND = os.getenv("BLOB_BACKEND", "disk").lower()
+BLOB_DIR = os.getenv("BLOB_DIR", "/tmp/drupalmind_blobs")
+BLOB_PUBLIC_PATH = os.getenv("BLOB_PUBLIC_PATH", "/api/blobs").rstrip("/")
+BLOB_S3_ENDPOINT = os.getenv("BLOB_S3_ENDPOINT", "http://minio:9000")
+BLOB_S3_BUCKET = os.getenv("BLOB_S3_BUCKET", "drupalmind-blobs")
+
+REF_PREFIX = "blob:"
+# <sha256 hex>[.<ext>] — also what keeps ids from escaping BLOB_DIR
+BLOB_ID_RE = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]{1,8})?$")
+
+_EXTENSIONS = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp", "image/gif": ".gif"}
+
+
+def blob_id_for(data: bytes, content_type: str = "application/octet-stream") -> str:
+    ext = _EXTENSIONS.get(content_type) or mimetypes.guess_extension(content_type) or ""
+    return hashlib.sha256(data).hexdigest() + ext
+
+
+def is_ref(value) -> bool:
+    return isinstance(value, str) and value.startswith(REF_PREFIX) and valid_id(value[len(REF_PREFIX):])
+
+
+def ref_id(ref: str) -> str:
+    return ref[len(REF_PREFIX):]
+
+
+def valid_id(blob_id: str) -> bool:
+    return bool(BLOB_ID_RE.match(blob_id or ""))
+
+
+def content_type_of(blob_id: str) -> str:
+    return mimetypes.guess_type(f"blob{os.path.splitext(blob_id)[1]}")[0] or "application/octet-stream"
+
+
+# ── Backends ──────────────────────────────────────────────────
+
+class DiskBackend:
+    """BLOB_DIR/ab/cd/<id>; writes are atomic (temp file + rename)."""
+
+    def __init__(self, root: str = BLOB_DIR):
+        self.root = root
+
+    def path(self, blob_id: str) -> str:
+        return os.path.join(self.root, blob_id[:2], blob_id[2:4], blob_id)
+
+    def exists(self, blob_id: str) -> bool:
+        return os.path.exists(self.path(blob_id))
+
+    def put(self, blob_id: str, data: bytes):
+        path = self.path(blob_id)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    @contextmanager
+    def open(self, blob_id: str) -> Iterator[memoryview]:
+        with open(self.path(blob_id), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+
+class RedisBackend:
+    """Blobs as plain Redis strings under drupalmind:blob:<id>, outside any job namespace."""
+
+    def __init__(self):
+        from memory import memory
+        if not memory._redis:
+            raise RuntimeError("BLOB_BACKEND=redis but Redis is not reachable")
+        self._redis = memory._redis
+        self._prefix = f"{memory._prefix}blob:"
+
+    def exists(self, blob_id: str) -> bool:
+        return bool(self._redis.exists(self._prefix + blob_id))
+
+    def put(self, blob_id: str, data: bytes):
+        self._redis.set(self._prefix + blob_id, data, nx=True)
+
+    @contextmanager
+    def open(self, blob_id: str) -> Iterator[memoryview]:
+        data = self._redis.get(self._prefix + blob_id)
+        if data is None:
+            raise FileNotFoundError(blob_id)
+        yield memoryview(data)
+
+
+class S3Backend:
+    """Any S3-compatible object store; credentials come from the usual AWS_* variables."""
+
+    def __init__(self, endpoint: str = BLOB_S3_ENDPOINT, bucket: str = BLOB_S3_BUCKET):
+        import boto3
+        self._s3 = boto3.client("s3", endpoint_url=endpoint)
+        self._bucket = bucket
+
+    def exists(self, blob_id: str) -> bool:
+        try:
+            self._s3.head_object(Bucket=self._bucket, Key=blob_id)
+            return True
+        except Exception:
+            return False
+
+    def put(self, blob_id: str, data: bytes):
+        if not self.exists(blob_id):
+            self._s3.put_object(Bucket=self._bucket, Key=blob_id, Body=data, ContentType=content_type_of(blob_id))
+
+    @contextmanager
+    def open(self, blob_id: str) -> Iterator[memoryview]:
+        try:
+            body = self._s3.get_object(Bucket=self._bucket, Key=blob_id)["Body"].read()
+        except Exception as e:
+            raise FileNotFoundError(blob_id) from e
+        yield memoryview(body)
+
+
+_BACKENDS = {"disk": DiskBackend, "redis": RedisBackend, "s3": S3Backend}
+
+
+# ── Store ─────────────────────────────────────────────────────
+
+class BlobStore:
+
+    def __init__(self, backend=None):
+        self._backend = backend
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            if BLOB_BACKEND not in _BACKENDS:
+                raise ValueError(f"Unknown BLOB_BACKEND '{BLOB_BACKEND}'")
+            self._backend = _BACKENDS[BLOB_BACKEND]()
+        return self._backend
+
+    def put(self, data: bytes, content_type: str = "application/octet-stream") -> str:
+        """Store bytes (once per content) and return the "blob:<id>" reference."""
+        blob_id = blob_id_for(data, content_type)
+        self.backend.put(blob_id, data)
+        return REF_PREFIX + blob_id
+
+    def exists(self, blob_id: str) -> bool:
+        return valid_id(blob_id) and self.backend.exists(blob_id)
+
+    @contextmanager
+    def open(self, blob_id: str) -> Iterator[memoryview]:
+        """Zero-copy view of a blob (memory-mapped on disk). Raises FileNotFoundError."""
+        if not valid_id(blob_id):
+            raise FileNotFoundError(blob_id)
+        with self.backend.open(blob_id) as view:
+            yield view
+
+    def get(self, blob_id: str) -> Optional[bytes]:
+        try:
+            with self.open(blob_id) as view:
+                return bytes(view)
+        except FileNotFoundError:
+            return None
+
+    def path(self, blob_id: str) -> Optional[str]:
+        """Filesystem path for the disk backend (lets the API use sendfile), else None."""
+        if isinstance(self.backend, DiskBackend) and self.exists(blob_id):
+            return self.backend.path(blob_id)
+        return None
+
+    def url(self, ref_or_id: str) -> str:
+        blob_id = ref_id(ref_or_id) if is_ref(ref_or_id) else ref_or_id
+        return f"{BLOB_PUBLIC_PATH}/{blob_id}"
+
+
+blob_store = BlobStore()
@@ -10,7 +10,8 @@ import logging
 import re
 from typing import Any, Optional
 from base_agent import BaseAgent
-from memory import memory as shared_memory
+import llm_usage
+from entity_index import entity_index, source_key
 from bs4 import BeautifulSoup
 
 # Configure logging for BuildAgent
@@ -31,6 +32,12 @@ FORBIDDEN_STYLE_PATTERNS = [
 ]
 MAX_HTML_LENGTH = 50000
 
+# delete_test_content only removes articles with exactly these titles (the throwaway
+# nodes ProbeAgent creates, left behind when its own cleanup fails), never anything
+# the entity index maps to migrated content, and at most this many per call
+TEST_CONTENT_TITLES = ("Test Title", "Body Test", "Generic Field Test", "Special chars: <>&\"'")
+MAX_TEST_CONTENT_DELETES = 20
+
 
 class ContentAssembler:
     """
@@ -314,6 +321,10 @@ class BuildAgent(BaseAgent):
     MAX_MESO_ITERATIONS = 3
     SIMILARITY_THRESHOLD = 0.85
     MIN_SIMILARITY_THRESHOLD = 0.30  # Minimum threshold - below this, page needs major rework
+    # record_built_page appends to a shared list and create_homepage sets the front page: not listed
+    PARALLEL_SAFE_TOOLS = BaseAgent.PARALLEL_SAFE_TOOLS | {
+        "get_blueprint", "get_mapping_manifest", "get_built_pages", "get_component_knowledge",
+    }
 
     def __init__(self):
         super().__init__("build", "BuildAgent")
@@ -373,11 +384,11 @@ class BuildAgent(BaseAgent):
     
     def get_mapping_for_element(self, element_id: str) -> Optional[dict]:
         """Get the mapping for a specific element from the manifest."""
-        return shared_memory.get_mapping_for_element(element_id)
+        return self.memory.get_mapping_for_element(element_id)
 
     def get_mapping_manifest(self) -> dict:
         """Get the full mapping manifest."""
-        return shared_memory.get_mapping_manifest() or {}
+        return self.memory.get_mapping_manifest() or {}
 
     # ── Micro-Loop: Component Refinement ─────────────────────────
     
@@ -395,6 +406,10 @@ class BuildAgent(BaseAgent):
         best_similarity = 0
         
         for iteration in range(self.MAX_MICRO_ITERATIONS):
+            budget_spent = llm_usage.budget_exceeded()
+            if budget_spent:
+                await self.log_warning("Micro-loop stopped: LLM budget exhausted", {"scope": component_scope, "reason": budget_spent})
+                break
             logger.info(f"Micro-loop iteration {iteration + 1}/{self.MAX_MICRO_ITERATIONS} for {component_scope}")
             
             # Run visual diff
@@ -501,12 +516,13 @@ class BuildAgent(BaseAgent):
         messages = [{"role": "user", "content": analysis_prompt}]
         
         try:
-            response = self.client.messages.create(
-                model=self.MODEL,
+            response = await self.llm.acall_with_tools(
+                model=self.llm.get_model(),
                 max_tokens=1024,
+                system="",
                 messages=messages,
             )
-            analysis_text = response.content[0].text.strip()
+            analysis_text = response["content"].strip()
             
             # Try to parse as JSON
             import re
@@ -629,12 +645,17 @@ class BuildAgent(BaseAgent):
         
         try:
             logger.info(f"[BUILD] Saving homepage to Drupal...")
-            node = self.drupal.create_node("page", {
+            blueprint = self.memory.get_blueprint() or {}
+            home_key = source_key(blueprint.get("source_url", ""), "/", section="homepage")
+            res = entity_index.upsert_nodes(self.drupal, "page", [(home_key, {
                 "title": title,
                 "body": {"value": full_body, "format": "full_html"},
                 "status": True,
                 "path": {"alias": "/home"},
-            })
+            })])[0]
+            if not res["ok"]:
+                raise Exception(res["error"])
+            node = res["data"] or {}
             nid = node.get("attributes", {}).get("drupal_internal__nid", "")
             # Also store the UUID
             node_id = node.get("id", "")
@@ -646,16 +667,24 @@ class BuildAgent(BaseAgent):
             return f"ERROR: {e}"
 
     def _tool_delete_test_content(self) -> str:
-        """Remove any test articles created during development."""
+        """Remove leftover probe articles (exact marker titles only, capped)."""
         try:
-            nodes = self.drupal.get_nodes("article", limit=20)
-            deleted = 0
-            for n in nodes:
-                title = n["attributes"].get("title", "")
-                if "test" in title.lower() or "api test" in title.lower():
-                    self.drupal.delete_node("article", n["id"])
-                    deleted += 1
-            return f"Deleted {deleted} test articles"
+            migrated = entity_index.uuids()
+            test_ids = []
+            for title in TEST_CONTENT_TITLES:
+                for n in self.drupal.iter_nodes("article", fields=["title"], params={"filter[title]": title}):
+                    if n["attributes"].get("title") == title and n["id"] not in migrated:
+                        test_ids.append(n["id"])
+                    if len(test_ids) >= MAX_TEST_CONTENT_DELETES:
+                        break
+                if len(test_ids) >= MAX_TEST_CONTENT_DELETES:
+                    break
+            deleted = set()
+            for node_id in test_ids:
+                if self.drupal.delete_node("article", node_id):
+                    deleted.add(node_id)
+            entity_index.forget_uuids(deleted)
+            return f"Deleted {len(deleted)} test articles"
         except Exception as e:
             return f"ERROR: {e}"
 
@@ -730,7 +759,7 @@ class BuildAgent(BaseAgent):
             "min_similarity_threshold": self.MIN_SIMILARITY_THRESHOLD,
         })
         
-        result = await asyncio.to_thread(self._run_build_loop, blueprint)
+        result = await self._run_build_loop(blueprint)
         built = self.memory.get_or_default("built_pages", [])
         
         # Log built pages
@@ -761,6 +790,10 @@ class BuildAgent(BaseAgent):
                 
                 # Meso-loop: try up to MAX_MESO_ITERATIONS times per page
                 while page_meso_iterations < self.MAX_MESO_ITERATIONS and total_meso_iterations < 10:
+                    budget_spent = llm_usage.budget_exceeded()
+                    if budget_spent:
+                        await self.log_warning("Meso-loop stopped: LLM budget exhausted", {"page": page_path, "reason": budget_spent})
+                        break
                     try:
                         logger.info(f"[MESO] Running visual diff for {page_path}...")
                         meso_result = await self.refine_page(page_path, source_url)
@@ -871,7 +904,7 @@ class BuildAgent(BaseAgent):
             "sections_count": len(page_spec.get("sections", [])),
         }, summary=f"Building: {title} ({content_type})")
         
-        result = await asyncio.to_thread(self._build_single_page, page_spec)
+        result = await self._build_single_page(page_spec)
         
         # Log build result
         await self.log_data("page_built", {
@@ -883,14 +916,14 @@ class BuildAgent(BaseAgent):
         await self.log_done(f"Page built: {title}")
         return result
 
-    def _run_build_loop(self, blueprint: dict) -> dict:
+    async def _run_build_loop(self, blueprint: dict) -> dict:
         """Use LLM to drive the build process."""
         # Check if V5 content consolidation is enabled
         from config import V5_FEATURES
         
         if V5_FEATURES.get("ENABLE_CONTENT_CONSOLIDATION", False):
-            # Use V5 build loop with content consolidation
-            return self._run_build_loop_v5(blueprint)
+            # Use V5 build loop with content consolidation; its node writes go through the pooled async client
+            return await self.run_in_thread(self._run_build_loop_v5, blueprint)
         
         # Fall back to original LLM-based build
         tools = self.COMMON_TOOLS + [
@@ -979,8 +1012,8 @@ class BuildAgent(BaseAgent):
         logger.info(f"║ Tools available: {len(tools)}")
         logger.info("══════════════════════════════════════════════════════════════")
         
-        result = self.call_llm_with_tools(SYSTEM_PROMPT, messages, tools)
-        return {"result": result, "built": self.memory.get_or_default("built_pages", [])}
+        result = await self.acall_llm_with_tools(SYSTEM_PROMPT, messages, tools)
+        return {"result": result, "built": await self.memory.aio.get_or_default("built_pages", [])}
 
     def _run_build_loop_v5(self, blueprint: dict) -> dict:
         """
@@ -1051,6 +1084,8 @@ class BuildAgent(BaseAgent):
         
         logger.info(f"[BUILD] Building {len(pages)} pages individually")
         
+        # Assemble and validate every page first, grouped by content type for bulk creation
+        prepared: dict[str, list] = {}
         for page in pages:
             try:
                 # Find sections for this page
@@ -1059,7 +1094,6 @@ class BuildAgent(BaseAgent):
                 # Assemble content
                 assembled_content = assembler.assemble_page_content(page_sections, page)
                 
-                # Create node in Drupal
                 content_type = page.get("content_type", "page")
                 
                 node_data = {
@@ -1086,22 +1120,34 @@ class BuildAgent(BaseAgent):
                     errors.append(f"Validation failed for {page.get('title')}: {error}")
                     continue
                 
-                # Create node
-                node = self.drupal.create_node(content_type, node_data)
+                page_key = source_key(blueprint.get("source_url", ""), page.get("path") or "/")
+                prepared.setdefault(content_type, []).append((page, page_key, node_data, len(page_sections)))
+                
+            except Exception as e:
+                logger.error(f"[BUILD] ✗ Error building page {page.get('title')}: {e}")
+                errors.append(str(e))
+        
+        # Upsert nodes per content type: unchanged pages are skipped, changed ones PATCHed, new ones bulk-created
+        for content_type, entries in prepared.items():
+            results = self.run_async(entity_index.aupsert_nodes(
+                self.async_drupal, content_type, [(page_key, node_data) for _, page_key, node_data, _ in entries]
+            ))
+            for res in results:
+                page, _, _, sections_count = entries[res["index"]]
+                if not res["ok"]:
+                    logger.error(f"[BUILD] ✗ Error building page {page.get('title')}: {res['error']}")
+                    errors.append(res["error"])
+                    continue
                 
                 built_pages.append({
                     "title": page.get("title"),
-                    "id": node.get("id"),
+                    "id": (res["data"] or {}).get("id"),
                     "path": page.get("path"),
                     "content_type": content_type,
-                    "sections_count": len(page_sections)
+                    "sections_count": sections_count
                 })
                 
-                logger.info(f"[BUILD] ✓ Built page: {page.get('title')} with {len(page_sections)} sections")
-                
-            except Exception as e:
-                logger.error(f"[BUILD] ✗ Error building page {page.get('title')}: {e}")
-                errors.append(str(e))
+                logger.info(f"[BUILD] ✓ Built page ({res['action']}): {page.get('title')} with {sections_count} sections")
         
         # Store built pages
         self.memory.set("built_pages", built_pages)
@@ -1161,20 +1207,25 @@ class BuildAgent(BaseAgent):
         if not is_valid:
             return {"success": False, "error": error}
         
-        # Create the node
+        # Upsert the node (re-runs PATCH or skip the page instead of duplicating it)
         try:
-            node = self.drupal.create_node(content_type, node_data)
+            page_key = source_key(blueprint.get("source_url", ""), mapping.get("path") or "/",
+                                  section=f"consolidated:{mapping.get('title')}")
+            res = self.run_async(entity_index.aupsert_nodes(self.async_drupal, content_type, [(page_key, node_data)]))[0]
+            if not res["ok"]:
+                return {"success": False, "error": res["error"]}
             
             return {
                 "success": True,
-                "node_id": node.get("id"),
+                "node_id": (res["data"] or {}).get("id"),
+                "action": res["action"],
                 "sections_consolidated": len(page_sections)
             }
             
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def _build_single_page(self, page_spec: dict) -> dict:
+    async def _build_single_page(self, page_spec: dict) -> dict:
         """Build one page using LLM."""
         tools = self.COMMON_TOOLS + [
             {
@@ -1215,5 +1266,5 @@ class BuildAgent(BaseAgent):
                 ),
             }
         ]
-        result = self.call_llm_with_tools(SYSTEM_PROMPT, messages, tools)
+        result = await self.acall_llm_with_tools(SYSTEM_PROMPT, messages, tools)
         return {"result": result}
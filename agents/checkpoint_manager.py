@@ -86,10 +86,10 @@ class CheckpointManager:
         Returns:
             Latest checkpoint data or None
         """
+        checkpoints = self._get_checkpoints(source_url)
         for phase in reversed(self.PHASES):
-            checkpoint = self.get_checkpoint(source_url, phase)
-            if checkpoint:
-                return checkpoint
+            if checkpoints.get(phase):
+                return checkpoints[phase]
         return None
     
     def can_resume(self, source_url: str) -> bool:
@@ -116,11 +116,23 @@ class CheckpointManager:
         Returns:
             Phase name or None if no checkpoints
         """
+        return self._last_completed(self._get_checkpoints(source_url))
+
+    def _last_completed(self, checkpoints: Dict[str, Dict[str, Any]]) -> Optional[str]:
         for phase in reversed(self.PHASES):
-            checkpoint = self.get_checkpoint(source_url, phase)
+            checkpoint = checkpoints.get(phase)
             if checkpoint and checkpoint.get('completed'):
                 return phase
         return None
+
+    def _get_checkpoints(self, source_url: str) -> Dict[str, Dict[str, Any]]:
+        """All checkpoints of a source URL by phase, fetched in one round trip."""
+        try:
+            keys = {self._get_checkpoint_key(source_url, phase): phase for phase in self.PHASES}
+            return {keys[k]: v for k, v in self.memory.get_many(keys).items()}
+        except Exception as e:
+            logger.error(f"Failed to get checkpoints: {e}")
+            return {}
     
     def get_next_phase(self, source_url: str) -> Optional[str]:
         """
@@ -132,8 +144,9 @@ class CheckpointManager:
         Returns:
             Next phase name or None if migration complete
         """
-        last_phase = self.get_last_completed_phase(source_url)
-        
+        return self._next_phase(self.get_last_completed_phase(source_url))
+
+    def _next_phase(self, last_phase: Optional[str]) -> Optional[str]:
         if last_phase is None:
             return 'probe'  # Start from beginning
             
@@ -156,16 +169,17 @@ class CheckpointManager:
         Returns:
             Dict with progress information
         """
+        checkpoints = self._get_checkpoints(source_url)
+        last_completed = self._last_completed(checkpoints)
         progress = {
-            'can_resume': self.can_resume(source_url),
-            'last_completed_phase': self.get_last_completed_phase(source_url),
-            'next_phase': self.get_next_phase(source_url),
+            'can_resume': checkpoints.get('analysis') is not None,
+            'last_completed_phase': last_completed,
+            'next_phase': self._next_phase(last_completed),
             'completed_phases': [],
             'pending_phases': []
         }
         
         # Determine completed and pending phases
-        last_completed = self.get_last_completed_phase(source_url)
         if last_completed:
             try:
                 last_index = self.PHASES.index(last_completed)
@@ -265,26 +279,16 @@ class CheckpointManager:
         checkpoints = []
         
         try:
-            # Try to list all keys matching checkpoint pattern
-            if hasattr(self.memory, '_redis'):
-                keys = self.memory._redis.keys('checkpoint:*')
-                for key in keys:
-                    try:
-                        key_str = key.decode() if isinstance(key, bytes) else key
-                        parts = key_str.split(':')
-                        if len(parts) >= 3:
-                            source_url = ':'.join(parts[1:-1]).replace('_', '/').replace('_', '.')
-                            phase = parts[-1]
-                            checkpoint = self.get_checkpoint(source_url, phase)
-                            if checkpoint:
-                                checkpoints.append({
-                                    'source_url': source_url,
-                                    'phase': phase,
-                                    'timestamp': checkpoint.get('timestamp'),
-                                    'completed': checkpoint.get('completed', False)
-                                })
-                    except Exception:
-                        continue
+            # SCAN for the keys, then one pipelined MGET; the stored record carries the real source URL
+            records = self.memory.get_many(self.memory.iter_keys('checkpoint:'))
+            for key, checkpoint in records.items():
+                if isinstance(checkpoint, dict):
+                    checkpoints.append({
+                        'source_url': checkpoint.get('source_url'),
+                        'phase': checkpoint.get('phase', key.rsplit(':', 1)[-1]),
+                        'timestamp': checkpoint.get('timestamp'),
+                        'completed': checkpoint.get('completed', False)
+                    })
         except Exception as e:
             logger.error(f"Failed to list checkpoints: {e}")
         
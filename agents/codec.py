@@ -0,0 +1,63 @@
+"""
+DrupalMind — JSON codec
+Pluggable JSON encode/decode used on the Drupal wire path. Uses orjson when
+it is installed (bytes in, bytes out, no intermediate str), falling back to
+the stdlib json module. DRUPAL_JSON_CODEC=auto | orjson | json picks one.
+"""
+import os
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli  # noqa: F401 — requests/urllib3 and httpx decode br when it is importable
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+JSON_CODEC = os.getenv("DRUPAL_JSON_CODEC", "auto").lower()
+
+# Response encodings both HTTP clients can decode in this environment
+ACCEPT_ENCODING = "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+if JSON_CODEC == "orjson" and not ORJSON_AVAILABLE:
+    raise ImportError("DRUPAL_JSON_CODEC=orjson but orjson is not installed")
+
+USE_ORJSON = ORJSON_AVAILABLE and JSON_CODEC != "json"
+CODEC_NAME = "orjson" if USE_ORJSON else "json"
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, default=str, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _stdlib_loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    # json.loads accepts UTF-8 bytes directly; memoryview needs a copy first
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+if USE_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        return orjson.loads(data)
+else:
+    dumps = _stdlib_dumps
+    loads = _stdlib_loads
+
+
+def response_json(r) -> Any:
+    """Decode a requests/httpx response body straight from bytes."""
+    return loads(r.content)
@@ -1,14 +1,247 @@
 """
 DrupalMind — Drupal JSON:API Client
 Wraps all interactions with the Drupal REST/JSON:API endpoints.
+DrupalClient is the blocking client used from thread-pooled agent code;
+AsyncDrupalClient covers the write-heavy surface on a pooled httpx client
+so many JSON:API requests can be in flight on one event loop.
 """
 import os
+import copy
 import json
+import time
 import base64
+import asyncio
+import mimetypes
+import threading
 import requests
-from typing import Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from itertools import islice
+from typing import Any, AsyncIterator, BinaryIO, Iterable, Iterator, Optional, Union
 from requests.auth import HTTPBasicAuth
 
+import resilience
+from resilience import CircuitOpenError, AsyncAdaptiveLimiter, OVERLOAD_STATUS, RETRYABLE_STATUS, parse_retry_after
+from drupal_metrics import DrupalMetrics
+from codec import ACCEPT_ENCODING, dumps, response_json
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+
+# Connection pool tuning for AsyncDrupalClient
+POOL_MAX_CONNECTIONS = int(os.getenv("DRUPAL_POOL_MAX_CONNECTIONS", "100"))
+POOL_MAX_KEEPALIVE = int(os.getenv("DRUPAL_POOL_MAX_KEEPALIVE", "20"))
+POOL_KEEPALIVE_EXPIRY = float(os.getenv("DRUPAL_POOL_KEEPALIVE_EXPIRY", "30"))
+MAX_CONCURRENCY_PER_HOST = int(os.getenv("DRUPAL_MAX_CONCURRENCY_PER_HOST", "32"))
+REQUEST_TIMEOUT = float(os.getenv("DRUPAL_REQUEST_TIMEOUT", "30"))
+
+# Drupal caps JSON:API collection pages at 50 items
+JSONAPI_PAGE_LIMIT = 50
+
+# Bulk writes: JSON:API Atomic Operations extension, with a batched fallback
+ATOMIC_MODE = os.getenv("DRUPAL_ATOMIC_OPERATIONS", "auto").lower()  # auto | on | off
+ATOMIC_ENDPOINT = os.getenv("DRUPAL_ATOMIC_ENDPOINT", "jsonapi/operations")
+ATOMIC_BATCH_SIZE = int(os.getenv("DRUPAL_ATOMIC_BATCH_SIZE", "50"))
+BULK_MAX_WORKERS = int(os.getenv("DRUPAL_BULK_MAX_WORKERS", "8"))
+ATOMIC_MEDIA_TYPE = 'application/vnd.api+json; ext="https://jsonapi.org/ext/atomic"'
+
+# Streaming uploads: bytes read per chunk from a file handle
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# Media bundle + file field that receives an upload, by MIME major type
+UPLOAD_TARGETS = {
+    "image": "media/image/field_media_image",
+    "video": "media/video/field_media_video_file",
+    "audio": "media/audio/field_media_audio_file",
+}
+UPLOAD_DEFAULT_TARGET = "media/document/field_media_document"
+
+# Discovery metadata (content types, fields, menus, views, block types) cache TTL; 0 disables
+METADATA_TTL = float(os.getenv("DRUPAL_METADATA_TTL", "300"))
+
+
+def _collection_params(resource_type: str, params: dict = None, fields: list = None,
+                       page_size: int = JSONAPI_PAGE_LIMIT) -> dict:
+    """Query params for the first page of a collection, with an optional sparse fieldset."""
+    query = dict(params or {})
+    query["page[limit]"] = min(page_size, JSONAPI_PAGE_LIMIT)
+    if fields:
+        query[f"fields[{resource_type}]"] = ",".join(fields)
+    return query
+
+
+def _next_link(doc: dict) -> Optional[str]:
+    nxt = (doc.get("links") or {}).get("next")
+    if isinstance(nxt, dict):
+        return nxt.get("href")
+    return nxt
+
+
+# ── Atomic operations (shared by both clients) ───────────────
+
+class AtomicOutcomeUnknown(Exception):
+    """An atomic batch may or may not have been applied (read timeout, 502/504); its items must not be re-sent."""
+
+
+def _atomic_rejected(status: int) -> bool:
+    """A definite "not applied": 4xx, 500, or 503 load shedding. Other 5xx may have landed the write."""
+    return status < 500 or status in (500, 503)
+
+
+def _fill_atomic_results(results: list, batch: list[int], created: Optional[list], error: str = None):
+    """Results for one atomic batch; an item without a created resource is reported but never re-sent."""
+    for k, i in enumerate(batch):
+        if created is not None and k < len(created):
+            results[i] = {"index": i, "ok": True, "retryable": False, "data": created[k], "error": None}
+        else:
+            results[i] = {"index": i, "ok": False, "retryable": False, "data": None,
+                          "error": error or "Atomic batch was applied but returned no result for this operation"}
+
+
+# ── Payload builders (shared by both clients) ─────────────────
+
+def _node_payload(content_type: str, attributes: dict, relationships: dict = None, node_id: str = None) -> dict:
+    payload = {
+        "data": {
+            "type": f"node--{content_type}",
+            "attributes": attributes,
+        }
+    }
+    if node_id:
+        payload["data"]["id"] = node_id
+    if relationships:
+        payload["data"]["relationships"] = relationships
+    return payload
+
+
+def _menu_item_payload(menu_id: str, title: str, url: str, weight: int = 0) -> dict:
+    return {
+        "data": {
+            "type": "menu_link_content--menu_link_content",
+            "attributes": {
+                "title": title,
+                "link": {"uri": f"internal:{url}"},
+                "menu_name": menu_id,
+                "weight": weight,
+                "enabled": True,
+            }
+        }
+    }
+
+
+def _media_image_payload(name: str, file_id: str) -> dict:
+    return {
+        "data": {
+            "type": "media--image",
+            "attributes": {"name": name},
+            "relationships": {
+                "field_media_image": {
+                    "data": {"type": "file--file", "id": file_id}
+                }
+            }
+        }
+    }
+
+
+def _term_payload(vocabulary: str, name: str, description: str = "") -> dict:
+    return {
+        "data": {
+            "type": f"taxonomy_term--{vocabulary}",
+            "attributes": {
+                "name": name,
+                "description": {"value": description, "format": "plain_text"},
+            }
+        }
+    }
+
+
+def _custom_block_payload(block_type: str, info: str, body: str, format: str = "full_html") -> dict:
+    return {
+        "data": {
+            "type": f"block_content--{block_type}",
+            "attributes": {
+                "info": info,
+                "body": {"value": body, "format": format},
+            }
+        }
+    }
+
+
+def _upload_headers(filename: str, length: Optional[int] = None) -> dict:
+    headers = {
+        "Content-Type": "application/octet-stream",
+        "Content-Disposition": f'file; filename="{filename}"',
+        "Accept": "application/vnd.api+json",
+    }
+    if length is not None:
+        headers["Content-Length"] = str(length)
+    return headers
+
+
+def _upload_target(filename: str, mime_type: Optional[str] = None) -> str:
+    """Pick the media file field for an upload; Drupal itself derives the MIME type from the filename."""
+    mime_type = mime_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return UPLOAD_TARGETS.get(mime_type.split("/", 1)[0], UPLOAD_DEFAULT_TARGET)
+
+
+def _body_length(body) -> Optional[int]:
+    """Size of an upload body without reading it: len() for bytes, fstat for real files."""
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        return len(body)
+    try:
+        return os.fstat(body.fileno()).st_size - body.tell()
+    except (AttributeError, OSError, ValueError):
+        return None  # generator or in-memory stream: sent chunked
+
+
+def _is_file(body) -> bool:
+    return hasattr(body, "read") and hasattr(body, "seek")
+
+
+async def _aread_chunks(fh: BinaryIO) -> AsyncIterator[bytes]:
+    """Feed a blocking file handle to httpx chunk by chunk without stalling the event loop."""
+    while chunk := await asyncio.to_thread(fh.read, UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+class MetadataCache:
+    """
+    Process-wide cache for discovery lookups, shared by every DrupalClient.
+    Entries are keyed by (base_url, name) and hold the already-transformed
+    result plus the response ETag. Fresh entries are served without touching
+    the network; stale entries are revalidated with If-None-Match.
+    """
+
+    def __init__(self, ttl: float = METADATA_TTL):
+        self.ttl = ttl
+        self._entries: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[dict]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: tuple, value: Any, etag: Optional[str] = None):
+        with self._lock:
+            self._entries[key] = {"value": value, "etag": etag, "expires": time.monotonic() + self.ttl}
+
+    def invalidate(self, base_url: str = None, name: str = None):
+        """Drop entries for a site and/or a lookup name ("fields" drops every "fields:<type>")."""
+        with self._lock:
+            for key in list(self._entries):
+                url, entry_name = key
+                if base_url and url != base_url:
+                    continue
+                if name and entry_name != name and not entry_name.startswith(f"{name}:"):
+                    continue
+                del self._entries[key]
+
+
+metadata_cache = MetadataCache()
+
 
 class DrupalClient:
     def __init__(self):
@@ -22,6 +255,12 @@ class DrupalClient:
         }
         self.session = requests.Session()
         self.session.auth = self.auth
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        # None until the first bulk write tells us whether atomic operations work
+        self._atomic_supported: Optional[bool] = {"on": True, "off": False}.get(ATOMIC_MODE)
+        self.resilience = resilience.for_host(self.base_url)
+        # Opt-in instrumentation; set to a DrupalMetrics to record every call
+        self.metrics: Optional[DrupalMetrics] = None
 
     def _jsonapi_url(self, path: str) -> str:
         return f"{self.base_url}/jsonapi/{path.lstrip('/')}"
@@ -29,23 +268,119 @@ class DrupalClient:
     def _rest_url(self, path: str) -> str:
         return f"{self.base_url}/{path.lstrip('/')}"
 
+    def _send(self, method: str, url: str, op: str = None, **kwargs) -> requests.Response:
+        """Send through _send_with_retry, recording the call under `op` when metrics are attached."""
+        if self.metrics is None:
+            return self._send_with_retry(method, url, **kwargs)
+        started = time.perf_counter()
+        try:
+            r = self._send_with_retry(method, url, **kwargs)
+        except Exception as e:
+            self.metrics.record(op or method, time.perf_counter() - started, error=type(e).__name__)
+            raise
+        self.metrics.record(
+            op or method, time.perf_counter() - started, r.status_code,
+            bytes_sent=int(r.request.headers.get("Content-Length") or 0) if r.request is not None else 0,
+            bytes_received=len(r.content or b""),
+        )
+        return r
+
+    def _send_with_retry(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Every Drupal request goes through here: default timeout, a slot from the
+        host's adaptive limiter, the endpoint family's circuit breaker, and
+        jittered retries on 429/503 (plus 502/504 and transport errors when
+        resending is safe). Overload responses shrink the limiter and back off
+        but never trip the breaker. The last response is returned as-is once retries
+        are exhausted, so callers keep their own status handling.
+        """
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        if "json" in kwargs:
+            kwargs["data"] = dumps(kwargs.pop("json"))
+        policy, limiter = self.resilience.policy, self.resilience.limiter
+        breaker = self.resilience.breaker(url)
+        body = kwargs.get("data")
+        rewind_to = body.tell() if _is_file(body) else None
+        one_shot = body is not None and rewind_to is None and not isinstance(body, (bytes, bytearray, str, dict))
+        attempt = 0
+        while True:
+            breaker.before_request()
+            if attempt and rewind_to is not None:
+                body.seek(rewind_to)
+            limiter.acquire()
+            started = time.monotonic()
+            try:
+                r = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                limiter.release(ok=False)
+                breaker.record_failure()
+                connect_failed = isinstance(e, requests.ConnectTimeout)
+                if one_shot or not policy.retry_error(method, connect_failed, attempt):
+                    raise
+                time.sleep(policy.delay(attempt))
+                attempt += 1
+                continue
+
+            overloaded = r.status_code in OVERLOAD_STATUS
+            limiter.release(overloaded=overloaded, ok=r.ok, rtt=time.monotonic() - started)
+            breaker.record_response(r.status_code)
+            if r.status_code not in RETRYABLE_STATUS:
+                return r
+            if one_shot or not policy.retry_status(method, r.status_code, attempt):
+                return r
+            time.sleep(policy.delay(attempt, parse_retry_after(r.headers.get("Retry-After"))))
+            attempt += 1
+
+    # ── Discovery metadata cache ─────────────────────────────
+
+    def _get_metadata(self, name: str, path: str, transform, params: dict = None,
+                      strict: bool = False, op: str = None) -> list[dict]:
+        """
+        Fetch a discovery collection through metadata_cache. A fresh entry is a
+        dictionary hit; a stale one is revalidated with If-None-Match and a 304
+        just extends its lifetime. Failed lookups are never cached.
+        """
+        key = (self.base_url, name)
+        entry = metadata_cache.get(key) if metadata_cache.ttl > 0 else None
+        if entry and entry["expires"] > time.monotonic():
+            return copy.deepcopy(entry["value"])
+
+        headers = dict(self.jsonapi_headers)
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        r = self._send("GET", self._jsonapi_url(path), params=params, headers=headers, op=op or f"get_{name}")
+
+        if r.status_code == 304 and entry:
+            metadata_cache.put(key, entry["value"], entry["etag"])
+            return copy.deepcopy(entry["value"])
+        if r.status_code != 200:
+            if strict:
+                r.raise_for_status()
+            return []
+
+        value = transform(response_json(r).get("data", []))
+        if metadata_cache.ttl > 0:
+            metadata_cache.put(key, value, r.headers.get("ETag"))
+        return copy.deepcopy(value)
+
+    def invalidate_metadata(self, name: str = None):
+        """
+        Forget cached discovery results for this site: all of them, or one of
+        "content_types", "fields" (or "fields:<type>"), "block_types", "views", "menus".
+        """
+        metadata_cache.invalidate(self.base_url, name)
+
     # ── Discovery ────────────────────────────────────────────
 
     def get_api_index(self) -> dict:
         """Get all available JSON:API resource types."""
-        r = self.session.get(self._jsonapi_url(""), headers=self.jsonapi_headers)
+        r = self._send("GET", self._jsonapi_url(""), headers=self.jsonapi_headers, op="get_api_index")
         r.raise_for_status()
-        return r.json()
+        return response_json(r)
 
     def get_content_types(self) -> list[dict]:
         """Return all Drupal content type definitions."""
-        r = self.session.get(
-            self._jsonapi_url("node_type/node_type"),
-            headers=self.jsonapi_headers
-        )
-        r.raise_for_status()
-        data = r.json().get("data", [])
-        return [
+        return self._get_metadata("content_types", "node_type/node_type", lambda data: [
             {
                 "id": ct["id"],
                 "machine_name": ct["attributes"]["drupal_internal__type"],
@@ -53,259 +388,334 @@ class DrupalClient:
                 "description": ct["attributes"].get("description", ""),
             }
             for ct in data
-        ]
+        ], strict=True)
 
     def get_fields_for_type(self, content_type: str) -> list[dict]:
         """Return field definitions for a content type."""
-        r = self.session.get(
-            self._jsonapi_url(f"field_config/field_config"),
+        return self._get_metadata(
+            f"fields:{content_type}",
+            "field_config/field_config",
+            lambda data: [
+                {
+                    "field_name": f["attributes"].get("field_name", ""),
+                    "label": f["attributes"].get("label", ""),
+                    "field_type": f["attributes"].get("field_type", ""),
+                    "required": f["attributes"].get("required", False),
+                }
+                for f in data
+            ],
             params={"filter[entity_type]": "node", "filter[bundle]": content_type},
-            headers=self.jsonapi_headers
+            op="get_fields_for_type",
         )
-        if r.status_code != 200:
-            return []
-        data = r.json().get("data", [])
-        return [
-            {
-                "field_name": f["attributes"].get("field_name", ""),
-                "label": f["attributes"].get("label", ""),
-                "field_type": f["attributes"].get("field_type", ""),
-                "required": f["attributes"].get("required", False),
-            }
-            for f in data
-        ]
 
     def get_block_types(self) -> list[dict]:
         """Return all block content types."""
-        r = self.session.get(
-            self._jsonapi_url("block_content_type/block_content_type"),
-            headers=self.jsonapi_headers
-        )
-        if r.status_code != 200:
-            return []
-        return r.json().get("data", [])
+        return self._get_metadata("block_types", "block_content_type/block_content_type", lambda data: data)
 
     def get_views(self) -> list[dict]:
         """Return all Views."""
-        r = self.session.get(
-            self._jsonapi_url("view/view"),
-            headers=self.jsonapi_headers
-        )
-        if r.status_code != 200:
-            return []
-        return [
+        return self._get_metadata("views", "view/view", lambda data: [
             {
                 "id": v["id"],
                 "label": v["attributes"].get("label", ""),
                 "machine_name": v["attributes"].get("drupal_internal__id", ""),
             }
-            for v in r.json().get("data", [])
-        ]
+            for v in data
+        ])
 
     def get_menus(self) -> list[dict]:
         """Return all menus."""
-        r = self.session.get(
-            self._jsonapi_url("menu/menu"),
-            headers=self.jsonapi_headers
-        )
-        if r.status_code != 200:
-            return []
-        return [
+        return self._get_metadata("menus", "menu/menu", lambda data: [
             {
                 "id": m["id"],
                 "label": m["attributes"].get("label", ""),
                 "machine_name": m["attributes"].get("drupal_internal__id", ""),
             }
-            for m in r.json().get("data", [])
-        ]
+            for m in data
+        ])
+
+    # ── Collections (paginated) ───────────────────────────────
+
+    def _fetch_page(self, url: str, params: dict = None, op: str = "iter_collection") -> Optional[dict]:
+        r = self._send("GET", url, params=params, headers=self.jsonapi_headers, op=op)
+        if r.status_code != 200:
+            return None
+        return response_json(r)
+
+    def iter_collection(self, path: str, resource_type: str, params: dict = None,
+                        fields: list = None, page_size: int = JSONAPI_PAGE_LIMIT,
+                        prefetch: bool = True) -> Iterator[dict]:
+        """
+        Lazily yield every resource in a JSON:API collection by following links.next.
+        Only the current page is held in memory; with prefetch=True the next page
+        is requested in a background thread while the caller consumes this one.
+        """
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        op = f"iter_collection:{resource_type}"
+        try:
+            doc = self._fetch_page(
+                self._jsonapi_url(path),
+                _collection_params(resource_type, params, fields, page_size),
+                op,
+            )
+            while doc:
+                next_url = _next_link(doc)
+                upcoming = executor.submit(self._fetch_page, next_url, None, op) if next_url and executor else None
+                yield from doc.get("data", [])
+                if not next_url:
+                    break
+                doc = upcoming.result() if upcoming else self._fetch_page(next_url, None, op)
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_nodes(self, content_type: str, fields: list = None, params: dict = None,
+                   page_size: int = JSONAPI_PAGE_LIMIT, prefetch: bool = True) -> Iterator[dict]:
+        """Stream all nodes of a content type. fields limits the attributes returned."""
+        return self.iter_collection(
+            f"node/{content_type}", f"node--{content_type}", params, fields, page_size, prefetch
+        )
+
+    def iter_terms(self, vocabulary: str, fields: list = None, params: dict = None,
+                   page_size: int = JSONAPI_PAGE_LIMIT, prefetch: bool = True) -> Iterator[dict]:
+        """Stream all taxonomy terms of a vocabulary."""
+        return self.iter_collection(
+            f"taxonomy_term/{vocabulary}", f"taxonomy_term--{vocabulary}", params, fields, page_size, prefetch
+        )
+
+    def iter_menu_items(self, menu_id: str, fields: list = None, page_size: int = JSONAPI_PAGE_LIMIT,
+                        prefetch: bool = True) -> Iterator[dict]:
+        """Stream all menu links of a menu."""
+        return self.iter_collection(
+            "menu_link_content/menu_link_content", "menu_link_content--menu_link_content",
+            {"filter[menu_name]": menu_id}, fields, page_size, prefetch
+        )
 
     # ── Nodes (Content) ──────────────────────────────────────
 
     def get_nodes(self, content_type: str, limit: int = 50) -> list[dict]:
-        r = self.session.get(
-            self._jsonapi_url(f"node/{content_type}"),
-            params={"page[limit]": limit},
-            headers=self.jsonapi_headers
-        )
-        if r.status_code != 200:
-            return []
-        return r.json().get("data", [])
+        """Return up to `limit` nodes, following pagination past Drupal's 50-item page cap."""
+        return list(islice(
+            self.iter_nodes(content_type, page_size=limit, prefetch=limit > JSONAPI_PAGE_LIMIT),
+            limit,
+        ))
 
     def create_node(self, content_type: str, attributes: dict, relationships: dict = None) -> dict:
-        payload = {
-            "data": {
-                "type": f"node--{content_type}",
-                "attributes": attributes,
-            }
-        }
-        if relationships:
-            payload["data"]["relationships"] = relationships
-
-        r = self.session.post(
+        payload = _node_payload(content_type, attributes, relationships)
+        r = self._send(
+            "POST",
             self._jsonapi_url(f"node/{content_type}"),
+            op="create_node",
             json=payload,
             headers=self.jsonapi_headers
         )
         if not r.ok:
             raise Exception(f"Failed to create node: {r.status_code} {r.text[:500]}")
-        return r.json().get("data", {})
+        return response_json(r).get("data", {})
+
+    def create_nodes_bulk(self, content_type: str, items: list[dict],
+                          max_workers: int = BULK_MAX_WORKERS) -> list[dict]:
+        """
+        Create many nodes of one type. Each item is an attributes dict, or a
+        {"attributes": ..., "relationships": ...} dict.
+
+        Uses the JSON:API Atomic Operations extension when the site supports it,
+        otherwise POSTs with at most max_workers requests in flight. Returns one
+        result per input item, in order: {"index", "ok", "retryable", "data", "error"}.
+        An item whose atomic batch may have been applied (missing result, read
+        timeout, 502/504) has ok=False and retryable=False: the node may exist,
+        so callers re-submit only the items with ok=False and retryable=True.
+        """
+        docs = [
+            _node_payload(content_type, it["attributes"], it.get("relationships"))
+            if "attributes" in it else _node_payload(content_type, it)
+            for it in items
+        ]
+        results: list[Optional[dict]] = [None] * len(docs)
+        pending = list(range(len(docs)))
+
+        if self._atomic_supported is not False:
+            for start in range(0, len(docs), ATOMIC_BATCH_SIZE):
+                batch = list(range(start, min(start + ATOMIC_BATCH_SIZE, len(docs))))
+                try:
+                    created = self._atomic_add([docs[i] for i in batch])
+                except AtomicOutcomeUnknown as e:
+                    _fill_atomic_results(results, batch, None, str(e))
+                    continue
+                if created is None:
+                    break  # extension unavailable or batch rejected — the rest goes through the fallback
+                _fill_atomic_results(results, batch, created)
+            pending = [i for i, res in enumerate(results) if res is None]
+
+        if pending:
+            def _create(i: int) -> dict:
+                attrs = docs[i]["data"]["attributes"]
+                rels = docs[i]["data"].get("relationships")
+                try:
+                    return {"index": i, "ok": True, "retryable": False,
+                            "data": self.create_node(content_type, attrs, rels), "error": None}
+                except Exception as e:
+                    return {"index": i, "ok": False, "retryable": True, "data": None, "error": str(e)}
+
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                for res in pool.map(_create, pending):
+                    results[res["index"]] = res
+        return results
+
+    def _atomic_add(self, docs: list[dict]) -> Optional[list[dict]]:
+        """
+        Submit one atomic batch of "add" operations. Returns the created
+        resources, or None when the batch was definitely not applied (extension
+        missing, connect failure, or the all-or-nothing batch was rejected) so
+        the caller falls back. Raises AtomicOutcomeUnknown when it may have landed.
+        """
+        headers = {"Content-Type": ATOMIC_MEDIA_TYPE, "Accept": ATOMIC_MEDIA_TYPE}
+        body = {"atomic:operations": [{"op": "add", "data": d["data"]} for d in docs]}
+        try:
+            r = self._send("POST", self._rest_url(ATOMIC_ENDPOINT), json=body, headers=headers, op="create_nodes_bulk")
+        except (requests.ConnectTimeout, CircuitOpenError):
+            return None
+        except requests.RequestException as e:
+            raise AtomicOutcomeUnknown(f"Atomic batch outcome unknown ({type(e).__name__}); not re-sent") from e
+        if r.status_code in (404, 405, 406, 415):
+            self._atomic_supported = False
+            return None
+        if not r.ok:
+            if _atomic_rejected(r.status_code):
+                return None
+            raise AtomicOutcomeUnknown(f"Atomic batch outcome unknown (HTTP {r.status_code}); not re-sent")
+        self._atomic_supported = True
+        return [res.get("data", {}) for res in response_json(r).get("atomic:results", [])]
 
     def update_node(self, content_type: str, node_id: str, attributes: dict) -> dict:
-        payload = {
-            "data": {
-                "type": f"node--{content_type}",
-                "id": node_id,
-                "attributes": attributes,
-            }
-        }
-        r = self.session.patch(
+        payload = _node_payload(content_type, attributes, node_id=node_id)
+        r = self._send(
+            "PATCH",
             self._jsonapi_url(f"node/{content_type}/{node_id}"),
+            op="update_node",
             json=payload,
             headers=self.jsonapi_headers
         )
         if not r.ok:
             raise Exception(f"Failed to update node: {r.status_code} {r.text[:500]}")
-        return r.json().get("data", {})
+        return response_json(r).get("data", {})
 
     def delete_node(self, content_type: str, node_id: str) -> bool:
-        r = self.session.delete(
+        r = self._send(
+            "DELETE",
             self._jsonapi_url(f"node/{content_type}/{node_id}"),
+            op="delete_node",
             headers=self.jsonapi_headers
         )
         return r.status_code == 204
 
     def get_node_by_id(self, content_type: str, node_id: str) -> Optional[dict]:
-        r = self.session.get(
+        r = self._send(
+            "GET",
             self._jsonapi_url(f"node/{content_type}/{node_id}"),
+            op="get_node_by_id",
             headers=self.jsonapi_headers
         )
         if r.status_code != 200:
             return None
-        return r.json().get("data")
+        return response_json(r).get("data")
+
+    def node_exists(self, content_type: str, node_id: str) -> bool:
+        """True on 200, False on an explicit 404; any other outcome raises, since it proves nothing."""
+        r = self._send(
+            "GET",
+            self._jsonapi_url(f"node/{content_type}/{node_id}"),
+            op="node_exists",
+            headers=self.jsonapi_headers
+        )
+        if r.status_code in (200, 404):
+            return r.status_code == 200
+        raise Exception(f"Failed to look up node: {r.status_code}")
 
     # ── Menu Items ────────────────────────────────────────────
 
     def create_menu_item(self, menu_id: str, title: str, url: str, weight: int = 0) -> dict:
-        payload = {
-            "data": {
-                "type": "menu_link_content--menu_link_content",
-                "attributes": {
-                    "title": title,
-                    "link": {"uri": f"internal:{url}"},
-                    "menu_name": menu_id,
-                    "weight": weight,
-                    "enabled": True,
-                }
-            }
-        }
-        r = self.session.post(
+        payload = _menu_item_payload(menu_id, title, url, weight)
+        r = self._send(
+            "POST",
             self._jsonapi_url("menu_link_content/menu_link_content"),
+            op="create_menu_item",
             json=payload,
             headers=self.jsonapi_headers
         )
         if not r.ok:
             raise Exception(f"Failed to create menu item: {r.status_code} {r.text[:300]}")
-        return r.json().get("data", {})
+        return response_json(r).get("data", {})
 
     def get_menu_items(self, menu_id: str) -> list[dict]:
-        r = self.session.get(
-            self._jsonapi_url("menu_link_content/menu_link_content"),
-            params={"filter[menu_name]": menu_id},
-            headers=self.jsonapi_headers
-        )
-        if r.status_code != 200:
-            return []
-        return r.json().get("data", [])
+        return list(self.iter_menu_items(menu_id))
 
     # ── Media / Files ─────────────────────────────────────────
 
-    def upload_file(self, filename: str, file_bytes: bytes, mime_type: str = "image/jpeg") -> Optional[dict]:
-        """Upload a binary file and return the file entity."""
-        headers = {
-            "Content-Type": "application/octet-stream",
-            "Content-Disposition": f'file; filename="{filename}"',
-            "Accept": "application/vnd.api+json",
-        }
-        r = self.session.post(
-            self._jsonapi_url("media/image/field_media_image"),
-            data=file_bytes,
-            headers=headers
+    def upload_file(self, filename: str, data: Union[bytes, BinaryIO, Iterable[bytes]],
+                    mime_type: str = None) -> Optional[dict]:
+        """
+        Upload a file and return the file entity. data may be bytes, an open
+        binary file (streamed from disk, Content-Length from fstat) or an
+        iterator of byte chunks (sent chunked), so memory stays flat for large
+        files. mime_type (guessed from filename if omitted) picks the media field.
+        """
+        r = self._send(
+            "POST",
+            self._jsonapi_url(_upload_target(filename, mime_type)),
+            op="upload_file",
+            data=data,
+            headers=_upload_headers(filename, _body_length(data))
         )
         if not r.ok:
             return None
-        return r.json().get("data")
+        return response_json(r).get("data")
 
     def create_media_image(self, name: str, file_id: str) -> Optional[dict]:
-        payload = {
-            "data": {
-                "type": "media--image",
-                "attributes": {"name": name},
-                "relationships": {
-                    "field_media_image": {
-                        "data": {"type": "file--file", "id": file_id}
-                    }
-                }
-            }
-        }
-        r = self.session.post(
+        payload = _media_image_payload(name, file_id)
+        r = self._send(
+            "POST",
             self._jsonapi_url("media/image"),
+            op="create_media_image",
             json=payload,
             headers=self.jsonapi_headers
         )
         if not r.ok:
             return None
-        return r.json().get("data")
+        return response_json(r).get("data")
 
     # ── Taxonomy ──────────────────────────────────────────────
 
     def create_term(self, vocabulary: str, name: str, description: str = "") -> dict:
-        payload = {
-            "data": {
-                "type": f"taxonomy_term--{vocabulary}",
-                "attributes": {
-                    "name": name,
-                    "description": {"value": description, "format": "plain_text"},
-                }
-            }
-        }
-        r = self.session.post(
+        payload = _term_payload(vocabulary, name, description)
+        r = self._send(
+            "POST",
             self._jsonapi_url(f"taxonomy_term/{vocabulary}"),
+            op="create_term",
             json=payload,
             headers=self.jsonapi_headers
         )
         if not r.ok:
             raise Exception(f"Failed to create term: {r.status_code} {r.text[:300]}")
-        return r.json().get("data", {})
+        return response_json(r).get("data", {})
 
     def get_terms(self, vocabulary: str) -> list[dict]:
-        r = self.session.get(
-            self._jsonapi_url(f"taxonomy_term/{vocabulary}"),
-            headers=self.jsonapi_headers
-        )
-        if r.status_code != 200:
-            return []
-        return r.json().get("data", [])
+        return list(self.iter_terms(vocabulary))
 
     # ── Custom CSS Block ──────────────────────────────────────
 
     def create_custom_block(self, block_type: str, info: str, body: str, format: str = "full_html") -> dict:
-        payload = {
-            "data": {
-                "type": f"block_content--{block_type}",
-                "attributes": {
-                    "info": info,
-                    "body": {"value": body, "format": format},
-                }
-            }
-        }
-        r = self.session.post(
+        payload = _custom_block_payload(block_type, info, body, format)
+        r = self._send(
+            "POST",
             self._jsonapi_url(f"block_content/{block_type}"),
+            op="create_custom_block",
             json=payload,
             headers=self.jsonapi_headers
         )
         if not r.ok:
             raise Exception(f"Failed to create block: {r.status_code} {r.text[:300]}")
-        return r.json().get("data", {})
+        return response_json(r).get("data", {})
 
     # ── Utility ───────────────────────────────────────────────
 
@@ -323,3 +733,356 @@ class DrupalClient:
     def get_site_url(self) -> str:
         """Return the public URL (from the host's perspective)."""
         return os.getenv("DRUPAL_PUBLIC_URL", "http://localhost:5500")
+
+
+class AsyncDrupalClient:
+    """
+    Non-blocking counterpart to DrupalClient for the write-heavy surface.
+    One pooled httpx.AsyncClient is shared by every call; keep-alive
+    connections are reused and the AIMD limiter, capped at max_per_host,
+    is the only bound on how many requests are in flight against the
+    client's Drupal host.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = POOL_MAX_CONNECTIONS,
+        max_keepalive: int = POOL_MAX_KEEPALIVE,
+        keepalive_expiry: float = POOL_KEEPALIVE_EXPIRY,
+        max_per_host: int = MAX_CONCURRENCY_PER_HOST,
+        timeout: float = REQUEST_TIMEOUT,
+    ):
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for AsyncDrupalClient")
+        self.base_url = os.getenv("DRUPAL_API_URL", "http://drupal").rstrip("/")
+        self.user = os.getenv("DRUPAL_API_USER", "apiuser")
+        self.password = os.getenv("DRUPAL_API_PASS", "apiuser")
+        self.jsonapi_headers = {
+            "Content-Type": "application/vnd.api+json",
+            "Accept": "application/vnd.api+json",
+        }
+        # Breakers and retry policy are shared with DrupalClient; the limiter is per event loop
+        self.resilience = resilience.for_host(self.base_url)
+        self.limiter = AsyncAdaptiveLimiter(maximum=max_per_host)
+        self.metrics: Optional[DrupalMetrics] = None
+        self._atomic_supported: Optional[bool] = {"on": True, "off": False}.get(ATOMIC_MODE)
+        self.client = httpx.AsyncClient(
+            auth=(self.user, self.password),
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+
+    async def __aenter__(self) -> "AsyncDrupalClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    def with_metrics(self, metrics: Optional[DrupalMetrics]) -> "AsyncDrupalClient":
+        """A view sharing this client's connection pool and limits that records into `metrics`."""
+        view = copy.copy(self)
+        view.metrics = metrics
+        return view
+
+    def _jsonapi_url(self, path: str) -> str:
+        return f"{self.base_url}/jsonapi/{path.lstrip('/')}"
+
+    def _rest_url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    async def _request(self, method: str, url: str, op: str = None, **kwargs) -> "httpx.Response":
+        """Async counterpart of DrupalClient._send."""
+        if self.metrics is None:
+            return await self._request_with_retry(method, url, **kwargs)
+        started = time.perf_counter()
+        try:
+            r = await self._request_with_retry(method, url, **kwargs)
+        except Exception as e:
+            self.metrics.record(op or method, time.perf_counter() - started, error=type(e).__name__)
+            raise
+        self.metrics.record(
+            op or method, time.perf_counter() - started, r.status_code,
+            bytes_sent=int(r.request.headers.get("Content-Length") or 0),
+            bytes_received=len(r.content),
+        )
+        return r
+
+    async def _request_with_retry(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        """Async counterpart of DrupalClient._send_with_retry: breaker, adaptive limit and jittered retries."""
+        if "json" in kwargs:
+            kwargs["content"] = dumps(kwargs.pop("json"))
+        policy = self.resilience.policy
+        breaker = self.resilience.breaker(url)
+        body = kwargs.get("content")
+        rewind_to = body.tell() if _is_file(body) else None
+        one_shot = body is not None and rewind_to is None and not isinstance(body, (bytes, bytearray, str))
+        attempt = 0
+        while True:
+            breaker.before_request()
+            if rewind_to is not None:
+                body.seek(rewind_to)
+                kwargs["content"] = _aread_chunks(body)
+            await self.limiter.acquire()
+            started = time.monotonic()
+            try:
+                r = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                await self.limiter.release(ok=False)
+                breaker.record_failure()
+                connect_failed = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if one_shot or not policy.retry_error(method, connect_failed, attempt):
+                    raise
+                await asyncio.sleep(policy.delay(attempt))
+                attempt += 1
+                continue
+
+            overloaded = r.status_code in OVERLOAD_STATUS
+            await self.limiter.release(overloaded=overloaded, ok=r.is_success, rtt=time.monotonic() - started)
+            breaker.record_response(r.status_code)
+            if r.status_code not in RETRYABLE_STATUS:
+                return r
+            if one_shot or not policy.retry_status(method, r.status_code, attempt):
+                return r
+            await asyncio.sleep(policy.delay(attempt, parse_retry_after(r.headers.get("Retry-After"))))
+            attempt += 1
+
+    # ── Collections (paginated) ───────────────────────────────
+
+    async def _fetch_page(self, url: str, params: dict = None, op: str = "iter_collection") -> Optional[dict]:
+        r = await self._request("GET", url, params=params, headers=self.jsonapi_headers, op=op)
+        if r.status_code != 200:
+            return None
+        return response_json(r)
+
+    async def aiter_collection(self, path: str, resource_type: str, params: dict = None,
+                               fields: list = None, page_size: int = JSONAPI_PAGE_LIMIT,
+                               prefetch: bool = True) -> AsyncIterator[dict]:
+        """Async counterpart of DrupalClient.iter_collection; the next page is fetched as a task."""
+        upcoming: Optional[asyncio.Task] = None
+        op = f"iter_collection:{resource_type}"
+        try:
+            doc = await self._fetch_page(
+                self._jsonapi_url(path),
+                _collection_params(resource_type, params, fields, page_size),
+                op,
+            )
+            while doc:
+                next_url = _next_link(doc)
+                if next_url and prefetch:
+                    upcoming = asyncio.create_task(self._fetch_page(next_url, None, op))
+                for item in doc.get("data", []):
+                    yield item
+                if not next_url:
+                    break
+                doc = await upcoming if upcoming else await self._fetch_page(next_url, None, op)
+                upcoming = None
+        finally:
+            if upcoming and not upcoming.done():
+                upcoming.cancel()
+
+    def aiter_nodes(self, content_type: str, fields: list = None, params: dict = None,
+                    page_size: int = JSONAPI_PAGE_LIMIT, prefetch: bool = True) -> AsyncIterator[dict]:
+        return self.aiter_collection(
+            f"node/{content_type}", f"node--{content_type}", params, fields, page_size, prefetch
+        )
+
+    def aiter_terms(self, vocabulary: str, fields: list = None, params: dict = None,
+                    page_size: int = JSONAPI_PAGE_LIMIT, prefetch: bool = True) -> AsyncIterator[dict]:
+        return self.aiter_collection(
+            f"taxonomy_term/{vocabulary}", f"taxonomy_term--{vocabulary}", params, fields, page_size, prefetch
+        )
+
+    def aiter_menu_items(self, menu_id: str, fields: list = None, page_size: int = JSONAPI_PAGE_LIMIT,
+                         prefetch: bool = True) -> AsyncIterator[dict]:
+        return self.aiter_collection(
+            "menu_link_content/menu_link_content", "menu_link_content--menu_link_content",
+            {"filter[menu_name]": menu_id}, fields, page_size, prefetch
+        )
+
+    # ── Nodes (Content) ──────────────────────────────────────
+
+    async def get_nodes(self, content_type: str, limit: int = 50) -> list[dict]:
+        nodes = []
+        pages = self.aiter_nodes(content_type, page_size=limit, prefetch=limit > JSONAPI_PAGE_LIMIT)
+        async with aclosing(pages):
+            async for node in pages:
+                nodes.append(node)
+                if len(nodes) >= limit:
+                    break
+        return nodes
+
+    async def create_node(self, content_type: str, attributes: dict, relationships: dict = None) -> dict:
+        r = await self._request(
+            "POST",
+            self._jsonapi_url(f"node/{content_type}"),
+            op="create_node",
+            json=_node_payload(content_type, attributes, relationships),
+            headers=self.jsonapi_headers
+        )
+        if not r.is_success:
+            raise Exception(f"Failed to create node: {r.status_code} {r.text[:500]}")
+        return response_json(r).get("data", {})
+
+    async def create_nodes_bulk(self, content_type: str, items: list[dict],
+                                max_workers: int = BULK_MAX_WORKERS) -> list[dict]:
+        """Async counterpart of DrupalClient.create_nodes_bulk; same result shape and retryable rules."""
+        docs = [
+            _node_payload(content_type, it["attributes"], it.get("relationships"))
+            if "attributes" in it else _node_payload(content_type, it)
+            for it in items
+        ]
+        results: list[Optional[dict]] = [None] * len(docs)
+        pending = list(range(len(docs)))
+
+        if self._atomic_supported is not False:
+            for start in range(0, len(docs), ATOMIC_BATCH_SIZE):
+                batch = list(range(start, min(start + ATOMIC_BATCH_SIZE, len(docs))))
+                try:
+                    created = await self._atomic_add([docs[i] for i in batch])
+                except AtomicOutcomeUnknown as e:
+                    _fill_atomic_results(results, batch, None, str(e))
+                    continue
+                if created is None:
+                    break  # extension unavailable or batch rejected — the rest goes through the fallback
+                _fill_atomic_results(results, batch, created)
+            pending = [i for i, res in enumerate(results) if res is None]
+
+        if pending:
+            slots = asyncio.Semaphore(max(1, max_workers))
+
+            async def _create(i: int) -> dict:
+                attrs = docs[i]["data"]["attributes"]
+                rels = docs[i]["data"].get("relationships")
+                async with slots:
+                    try:
+                        return {"index": i, "ok": True, "retryable": False,
+                                "data": await self.create_node(content_type, attrs, rels), "error": None}
+                    except Exception as e:
+                        return {"index": i, "ok": False, "retryable": True, "data": None, "error": str(e)}
+
+            for res in await asyncio.gather(*(_create(i) for i in pending)):
+                results[res["index"]] = res
+        return results
+
+    async def _atomic_add(self, docs: list[dict]) -> Optional[list[dict]]:
+        """Async counterpart of DrupalClient._atomic_add."""
+        headers = {"Content-Type": ATOMIC_MEDIA_TYPE, "Accept": ATOMIC_MEDIA_TYPE}
+        body = {"atomic:operations": [{"op": "add", "data": d["data"]} for d in docs]}
+        try:
+            r = await self._request("POST", self._rest_url(ATOMIC_ENDPOINT), json=body, headers=headers,
+                                    op="create_nodes_bulk")
+        except (httpx.ConnectError, httpx.ConnectTimeout, CircuitOpenError):
+            return None
+        except httpx.TransportError as e:
+            raise AtomicOutcomeUnknown(f"Atomic batch outcome unknown ({type(e).__name__}); not re-sent") from e
+        if r.status_code in (404, 405, 406, 415):
+            self._atomic_supported = False
+            return None
+        if not r.is_success:
+            if _atomic_rejected(r.status_code):
+                return None
+            raise AtomicOutcomeUnknown(f"Atomic batch outcome unknown (HTTP {r.status_code}); not re-sent")
+        self._atomic_supported = True
+        return [res.get("data", {}) for res in response_json(r).get("atomic:results", [])]
+
+    async def node_exists(self, content_type: str, node_id: str) -> bool:
+        """Async counterpart of DrupalClient.node_exists."""
+        r = await self._request(
+            "GET",
+            self._jsonapi_url(f"node/{content_type}/{node_id}"),
+            op="node_exists",
+            headers=self.jsonapi_headers
+        )
+        if r.status_code in (200, 404):
+            return r.status_code == 200
+        raise Exception(f"Failed to look up node: {r.status_code}")
+
+    async def update_node(self, content_type: str, node_id: str, attributes: dict) -> dict:
+        r = await self._request(
+            "PATCH",
+            self._jsonapi_url(f"node/{content_type}/{node_id}"),
+            op="update_node",
+            json=_node_payload(content_type, attributes, node_id=node_id),
+            headers=self.jsonapi_headers
+        )
+        if not r.is_success:
+            raise Exception(f"Failed to update node: {r.status_code} {r.text[:500]}")
+        return response_json(r).get("data", {})
+
+    # ── Menu Items ────────────────────────────────────────────
+
+    async def create_menu_item(self, menu_id: str, title: str, url: str, weight: int = 0) -> dict:
+        r = await self._request(
+            "POST",
+            self._jsonapi_url("menu_link_content/menu_link_content"),
+            op="create_menu_item",
+            json=_menu_item_payload(menu_id, title, url, weight),
+            headers=self.jsonapi_headers
+        )
+        if not r.is_success:
+            raise Exception(f"Failed to create menu item: {r.status_code} {r.text[:300]}")
+        return response_json(r).get("data", {})
+
+    # ── Media / Files ─────────────────────────────────────────
+
+    async def upload_file(self, filename: str, data: Union[bytes, BinaryIO, AsyncIterator[bytes]],
+                          mime_type: str = None) -> Optional[dict]:
+        """Upload a file and return the file entity; open files are streamed in chunks off the event loop."""
+        r = await self._request(
+            "POST",
+            self._jsonapi_url(_upload_target(filename, mime_type)),
+            op="upload_file",
+            content=data,
+            headers=_upload_headers(filename, _body_length(data))
+        )
+        if not r.is_success:
+            return None
+        return response_json(r).get("data")
+
+    async def create_media_image(self, name: str, file_id: str) -> Optional[dict]:
+        r = await self._request(
+            "POST",
+            self._jsonapi_url("media/image"),
+            op="create_media_image",
+            json=_media_image_payload(name, file_id),
+            headers=self.jsonapi_headers
+        )
+        if not r.is_success:
+            return None
+        return response_json(r).get("data")
+
+    # ── Taxonomy ──────────────────────────────────────────────
+
+    async def create_term(self, vocabulary: str, name: str, description: str = "") -> dict:
+        r = await self._request(
+            "POST",
+            self._jsonapi_url(f"taxonomy_term/{vocabulary}"),
+            op="create_term",
+            json=_term_payload(vocabulary, name, description),
+            headers=self.jsonapi_headers
+        )
+        if not r.is_success:
+            raise Exception(f"Failed to create term: {r.status_code} {r.text[:300]}")
+        return response_json(r).get("data", {})
+
+    # ── Custom CSS Block ──────────────────────────────────────
+
+    async def create_custom_block(self, block_type: str, info: str, body: str, format: str = "full_html") -> dict:
+        r = await self._request(
+            "POST",
+            self._jsonapi_url(f"block_content/{block_type}"),
+            op="create_custom_block",
+            json=_custom_block_payload(block_type, info, body, format),
+            headers=self.jsonapi_headers
+        )
+        if not r.is_success:
+            raise Exception(f"Failed to create block: {r.status_code} {r.text[:300]}")
+        return response_json(r).get("data", {})
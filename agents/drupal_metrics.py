@@ -0,0 +1,96 @@
+"""
+DrupalMind — Drupal request instrumentation
+Opt-in per-operation counters for DrupalClient / AsyncDrupalClient:
+request count, latency histogram, bytes sent/received and errors by status.
+Enable with DRUPAL_METRICS=true; the orchestrator then attaches one
+DrupalMetrics per agent for each job.
+"""
+import os
+import bisect
+import threading
+from typing import Optional
+
+DRUPAL_METRICS_ENABLED = os.getenv("DRUPAL_METRICS", "false").lower() == "true"
+
+# Upper bounds of the latency buckets in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+
+class _OpStats:
+    __slots__ = ("count", "errors", "bytes_sent", "bytes_received", "latency_sum_ms", "latency_max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors: dict[str, int] = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency_sum_ms = 0.0
+        self.latency_max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th request (max latency for the open bucket)."""
+        if not self.count:
+            return None
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                bound = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.latency_max_ms
+                return round(min(bound, self.latency_max_ms), 1)
+        return round(self.latency_max_ms, 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": sum(self.errors.values()),
+            "errors_by_status": dict(self.errors),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency_ms": {
+                "avg": round(self.latency_sum_ms / self.count, 1) if self.count else None,
+                "p50": self.percentile(0.50),
+                "p95": self.percentile(0.95),
+                "max": round(self.latency_max_ms, 1),
+                "histogram": {
+                    **{f"le_{b}": n for b, n in zip(LATENCY_BUCKETS_MS, self.buckets)},
+                    "inf": self.buckets[-1],
+                },
+            },
+        }
+
+
+class DrupalMetrics:
+    """Thread-safe; one instance may be shared by a sync and an async client."""
+
+    def __init__(self):
+        self._ops: dict[str, _OpStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, op: str, latency_s: float, status: Optional[int] = None, error: str = None,
+               bytes_sent: int = 0, bytes_received: int = 0):
+        """One logical call (retries included). status is None when no response came back."""
+        latency_ms = latency_s * 1000
+        with self._lock:
+            stats = self._ops.get(op)
+            if stats is None:
+                stats = self._ops[op] = _OpStats()
+            stats.count += 1
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            stats.latency_sum_ms += latency_ms
+            stats.latency_max_ms = max(stats.latency_max_ms, latency_ms)
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+            if error or (status is not None and status >= 400):
+                key = error or str(status)
+                stats.errors[key] = stats.errors.get(key, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            ops = {op: stats.to_dict() for op, stats in sorted(self._ops.items())}
+        return {
+            "operations": ops,
+            "total_requests": sum(o["count"] for o in ops.values()),
+            "total_errors": sum(o["errors"] for o in ops.values()),
+            "total_time_ms": round(sum((o["latency_ms"]["avg"] or 0) * o["count"] for o in ops.values()), 1),
+        }
@@ -0,0 +1,186 @@
+"""
+DrupalMind — Source → Drupal entity index
+Persistent map from a piece of source content (source URL + section) to the
+Drupal entity it became, with a hash of the payload that was sent.
+Turns node creation into an upsert so re-running a migration only touches
+what changed: unchanged content is skipped, changed content is PATCHed and
+only new content is POSTed.
+"""
+import json
+import asyncio
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import urljoin
+
+from memory import memory as shared_memory
+from drupal_client import BULK_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "entity_index"
+
+
+def source_key(source_url: str, path: str = "", section=None) -> str:
+    """Stable identity for source content: absolute URL, plus #section when it is one part of a page."""
+    url = urljoin(source_url or "", path) if path else (source_url or "")
+    return f"{url}#{section}" if section is not None else url
+
+
+def content_hash(content_type: str, attributes: dict, relationships: dict = None) -> str:
+    canonical = json.dumps([content_type, attributes, relationships or {}], sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class EntityIndex:
+    """
+    Stored as one hash in shared memory under "entity_index", one field per
+    source key: {"uuid", "content_type", "content_hash"}. Writes touch only
+    their own fields (HSET/HDEL), so concurrent jobs and processes never
+    overwrite each other's entries. It is deliberately not job-scoped, so a
+    later run finds the earlier run's entities.
+    """
+
+    def __init__(self, store=None):
+        self.store = store or shared_memory
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.store.get_field(INDEX_KEY, key)
+
+    async def aget(self, key: str) -> Optional[dict]:
+        return (await self.store.aio.get_fields(INDEX_KEY, [key])).get(key)
+
+    def put(self, key: str, uuid: str, content_type: str, digest: str):
+        self.update({key: {"uuid": uuid, "content_type": content_type, "content_hash": digest}})
+
+    async def aput(self, key: str, uuid: str, content_type: str, digest: str):
+        await self.store.aio.set_fields(INDEX_KEY, {key: {"uuid": uuid, "content_type": content_type,
+                                                          "content_hash": digest}})
+
+    def update(self, entries: dict):
+        self.store.set_fields(INDEX_KEY, entries)
+
+    def uuids(self) -> set:
+        """Every Drupal entity the index maps source content to."""
+        return {v["uuid"] for v in self.store.get_dict(INDEX_KEY).values() if v.get("uuid")}
+
+    def forget_uuids(self, uuids: set):
+        """Drop entries whose entity was deleted in Drupal, so the next run re-creates them."""
+        stale = [k for k, v in self.store.get_dict(INDEX_KEY).items() if v.get("uuid") in uuids]
+        self.store.delete_fields(INDEX_KEY, stale)
+
+    def _plan(self, content_type: str, entries: list[tuple[str, dict]], known: dict):
+        """Split entries into unchanged (already answered), to-update and to-create, given their index entries."""
+        results: list[Optional[dict]] = [None] * len(entries)
+        to_update, to_create = [], []
+        for i, (key, attributes) in enumerate(entries):
+            entry = known.get(key)
+            digest = content_hash(content_type, attributes)
+            if not entry or not entry.get("uuid") or entry.get("content_type") != content_type:
+                to_create.append(i)
+            elif entry.get("content_hash") == digest:
+                results[i] = {"index": i, "ok": True, "retryable": False, "data": {"id": entry["uuid"]},
+                              "error": None, "action": "unchanged"}
+            else:
+                to_update.append(i)
+        return results, to_update, to_create
+
+    def _changed(self, content_type: str, entries: list[tuple[str, dict]], results: list[dict]) -> dict:
+        """Index entries for every entity that was written; logs the tally."""
+        changed = {}
+        for res in results:
+            uuid = (res["data"] or {}).get("id")
+            if res["ok"] and res["action"] != "unchanged" and uuid:
+                key, attributes = entries[res["index"]]
+                changed[key] = {"uuid": uuid, "content_type": content_type,
+                                "content_hash": content_hash(content_type, attributes)}
+
+        counts = {a: sum(1 for r in results if r["ok"] and r["action"] == a) for a in ("unchanged", "updated", "created")}
+        logger.info(f"[INDEX] {content_type}: {counts['created']} created, {counts['updated']} updated, "
+                    f"{counts['unchanged']} unchanged")
+        return changed
+
+    def upsert_nodes(self, drupal, content_type: str, entries: list[tuple[str, dict]],
+                     max_workers: int = BULK_MAX_WORKERS) -> list[dict]:
+        """
+        Upsert nodes of one content type. entries are (source_key, attributes) pairs.
+        Returns one result per entry, in order, shaped like create_nodes_bulk's
+        plus an "action": "unchanged" | "updated" | "created". Only results with
+        retryable=True are safe to re-submit.
+        """
+        index = self.store.get_fields(INDEX_KEY, [key for key, _ in entries])
+        results, to_update, to_create = self._plan(content_type, entries, index)
+
+        def _update(i: int) -> Optional[dict]:
+            key, attributes = entries[i]
+            uuid = index[key]["uuid"]
+            try:
+                node = drupal.update_node(content_type, uuid, attributes)
+                return {"index": i, "ok": True, "retryable": False, "data": node, "error": None, "action": "updated"}
+            except Exception as e:
+                try:
+                    if not drupal.node_exists(content_type, uuid):
+                        return None  # 404: deleted on the Drupal side — create it again
+                except Exception:
+                    pass  # unknown (5xx, 429, circuit open): the node may exist, so never re-create
+                return {"index": i, "ok": False, "retryable": True, "data": None, "error": str(e), "action": "updated"}
+
+        if to_update:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                for i, res in zip(to_update, pool.map(_update, to_update)):
+                    if res is None:
+                        to_create.append(i)
+                    else:
+                        results[i] = res
+
+        if to_create:
+            to_create.sort()
+            created = drupal.create_nodes_bulk(content_type, [entries[i][1] for i in to_create], max_workers)
+            for i, res in zip(to_create, created):
+                results[i] = {**res, "index": i, "action": "created"}
+
+        self.update(self._changed(content_type, entries, results))
+        return results
+
+    async def aupsert_nodes(self, drupal, content_type: str, entries: list[tuple[str, dict]],
+                            max_workers: int = BULK_MAX_WORKERS) -> list[dict]:
+        """upsert_nodes against an AsyncDrupalClient; PATCHes and POSTs share its connection pool."""
+        index = await self.store.aio.get_fields(INDEX_KEY, [key for key, _ in entries])
+        results, to_update, to_create = self._plan(content_type, entries, index)
+        slots = asyncio.Semaphore(max(1, max_workers))
+
+        async def _update(i: int) -> Optional[dict]:
+            key, attributes = entries[i]
+            uuid = index[key]["uuid"]
+            async with slots:
+                try:
+                    node = await drupal.update_node(content_type, uuid, attributes)
+                    return {"index": i, "ok": True, "retryable": False, "data": node, "error": None, "action": "updated"}
+                except Exception as e:
+                    try:
+                        if not await drupal.node_exists(content_type, uuid):
+                            return None  # 404: deleted on the Drupal side — create it again
+                    except Exception:
+                        pass  # unknown (5xx, 429, circuit open): the node may exist, so never re-create
+                    return {"index": i, "ok": False, "retryable": True, "data": None, "error": str(e), "action": "updated"}
+
+        if to_update:
+            for i, res in zip(to_update, await asyncio.gather(*(_update(i) for i in to_update))):
+                if res is None:
+                    to_create.append(i)
+                else:
+                    results[i] = res
+
+        if to_create:
+            to_create.sort()
+            created = await drupal.create_nodes_bulk(content_type, [entries[i][1] for i in to_create], max_workers)
+            for i, res in zip(to_create, created):
+                results[i] = {**res, "index": i, "action": "created"}
+
+        changed = self._changed(content_type, entries, results)
+        if changed:
+            await self.store.aio.set_fields(INDEX_KEY, changed)
+        return results
+
+entity_index = EntityIndex()
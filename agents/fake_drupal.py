@@ -0,0 +1,395 @@
+"""
+DrupalMind — Fake Drupal JSON:API server
+Stdlib-only, in-memory stand-in for the parts of Drupal's JSON:API that
+DrupalClient uses, for benchmarks and offline runs without a Drupal container.
+
+Covers node types, field_config, block content types, views, menus, nodes,
+menu links, taxonomy terms, block_content, media, file upload and the Atomic
+Operations endpoint, with links.next pagination, sparse fieldsets and ETags
+on discovery lookups and gzip for large responses. Faults are configurable: fixed latency plus jitter,
+a random 500 rate, random 429s with Retry-After, and a concurrency capacity
+above which requests get 503.
+
+    python fake_drupal.py --port 8089 --latency-ms 40 --rate-429 0.05 --capacity 16
+    DRUPAL_API_URL=http://localhost:8089 python ../run_benchmark.py
+"""
+import gzip
+import json
+import time
+import uuid
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+JSONAPI_TYPE = "application/vnd.api+json"
+PAGE_LIMIT = 50
+GZIP_MIN_BYTES = 1024  # like mod_deflate/nginx gzip_min_length: small bodies go out as-is
+
+CONTENT_TYPES = {"article": "Article", "page": "Basic page"}
+FIELDS = {
+    "article": [("body", "Body", "text_with_summary", False), ("field_tags", "Tags", "entity_reference", False),
+                ("field_image", "Image", "image", False)],
+    "page": [("body", "Body", "text_with_summary", False)],
+}
+MENUS = {"main": "Main navigation", "footer": "Footer"}
+BLOCK_TYPES = ["basic"]
+VIEWS = {"frontpage": "Frontpage", "content": "Content"}
+
+
+class FakeDrupal:
+    """In-memory entity store plus fault settings; shared by all handler threads."""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 rate_429: float = 0, retry_after: float = 1, capacity: int = 0, atomic: bool = True,
+                 compress: bool = True):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.capacity = capacity
+        self.atomic = atomic
+        self.compress = compress
+        self.entities: dict[str, dict[str, dict]] = {}  # resource type -> uuid -> resource
+        self.stats = {"requests": 0, "errors_500": 0, "throttled_429": 0, "overloaded_503": 0, "bytes_uploaded": 0}
+        self._in_flight = 0
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    # ── Store ────────────────────────────────────────────────
+
+    def create(self, rtype: str, attributes: dict, relationships: dict = None) -> dict:
+        with self._lock:
+            internal = self._next_id
+            self._next_id += 1
+            resource = {
+                "type": rtype,
+                "id": str(uuid.uuid4()),
+                "attributes": {**attributes, "drupal_internal__" + ("nid" if rtype.startswith("node--") else "id"): internal},
+                "relationships": relationships or {},
+            }
+            self.entities.setdefault(rtype, {})[resource["id"]] = resource
+            return resource
+
+    def get(self, rtype: str, rid: str) -> Optional[dict]:
+        return self.entities.get(rtype, {}).get(rid)
+
+    def update(self, rtype: str, rid: str, attributes: dict) -> Optional[dict]:
+        with self._lock:
+            resource = self.get(rtype, rid)
+            if resource:
+                resource["attributes"].update(attributes)
+            return resource
+
+    def delete(self, rtype: str, rid: str) -> bool:
+        with self._lock:
+            return self.entities.get(rtype, {}).pop(rid, None) is not None
+
+    def list(self, rtype: str) -> list[dict]:
+        with self._lock:
+            return list(self.entities.get(rtype, {}).values())
+
+    # ── Faults ───────────────────────────────────────────────
+
+    def enter(self) -> Optional[int]:
+        """Admit a request, or return the status to fail it with."""
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.capacity and self._in_flight >= self.capacity:
+                self.stats["overloaded_503"] += 1
+                return 503
+            if self.rate_429 and random.random() < self.rate_429:
+                self.stats["throttled_429"] += 1
+                return 429
+            if self.error_rate and random.random() < self.error_rate:
+                self.stats["errors_500"] += 1
+                return 500
+            self._in_flight += 1
+        delay = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+        return None
+
+    def leave(self):
+        with self._lock:
+            self._in_flight -= 1
+
+
+def _config_collection(rtype: str, items: list[tuple[str, dict]]) -> list[dict]:
+    return [{"type": rtype, "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"{rtype}/{key}")), "attributes": attrs}
+            for key, attrs in items]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "FakeDrupal/1.0"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    drupal: FakeDrupal = None  # bound per server by FakeDrupalServer
+
+    def log_message(self, format, *args):
+        pass
+
+    # ── Plumbing ─────────────────────────────────────────────
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(chunks)
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _drain_body(self) -> int:
+        """Consume an upload in fixed-size pieces, counting bytes without keeping them."""
+        total = 0
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            return len(self._read_body())
+        remaining = int(self.headers.get("Content-Length") or 0)
+        while remaining:
+            piece = self.rfile.read(min(remaining, 64 * 1024))
+            if not piece:
+                break
+            total += len(piece)
+            remaining -= len(piece)
+        return total
+
+    def _send(self, status: int, doc: dict = None, headers: dict = None):
+        body = json.dumps(doc).encode() if doc is not None else b""
+        self.send_response(status)
+        if doc is not None:
+            self.send_header("Content-Type", JSONAPI_TYPE)
+        if (self.drupal.compress and len(body) >= GZIP_MIN_BYTES
+                and "gzip" in self.headers.get("Accept-Encoding", "")):
+            body = gzip.compress(body, compresslevel=5)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, detail: str = ""):
+        self.close_connection = True  # the request body may not have been consumed
+        self._send(status, {"errors": [{"status": str(status), "detail": detail}]})
+
+    def _dispatch(self, method: str):
+        fault = self.drupal.enter()
+        if fault:
+            if self.headers.get("Content-Length") or self.headers.get("Transfer-Encoding"):
+                self._drain_body()
+            headers = {"Retry-After": str(self.drupal.retry_after)} if fault in (429, 503) else None
+            self._send(fault, {"errors": [{"status": str(fault), "detail": "Injected fault"}]}, headers)
+            return
+        try:
+            url = urlparse(self.path)
+            parts = [p for p in url.path.split("/") if p]
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if parts[:1] == ["jsonapi"]:
+                self._route(method, parts[1:], query)
+            else:
+                self._error(404, "Not found")
+        except Exception as e:
+            self._error(500, str(e))
+        finally:
+            self.drupal.leave()
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PATCH(self):
+        self._dispatch("PATCH")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    # ── Routes ───────────────────────────────────────────────
+
+    def _route(self, method: str, parts: list[str], query: dict):
+        if not parts:
+            return self._send(200, {"links": {"self": {"href": "/jsonapi"}}, "data": []})
+        if parts == ["operations"] and method == "POST":
+            return self._atomic() if self.drupal.atomic else self._error(404, "Atomic operations not enabled")
+        if method == "GET" and len(parts) == 2 and parts[0] == parts[1]:
+            config = self._config(parts[0], query)
+            if config is not None:
+                return self._send_cached(config)
+        if parts[0] == "media" and len(parts) == 3 and method == "POST":
+            return self._upload(parts[1], parts[2])
+
+        rtype = self._resource_type(parts)
+        if rtype is None:
+            return self._error(404, f"Unknown resource /{'/'.join(parts)}")
+        rid = parts[2] if len(parts) > 2 else None
+
+        if method == "GET" and rid:
+            resource = self.drupal.get(rtype, rid)
+            return self._send(200, {"data": resource}) if resource else self._error(404, "Not found")
+        if method == "GET":
+            return self._collection(rtype, parts, query)
+        if method == "POST" and not rid:
+            data = json.loads(self._read_body() or b"{}").get("data", {})
+            if data.get("type") != rtype:
+                return self._error(422, f"Type mismatch: expected {rtype}")
+            created = self.drupal.create(rtype, data.get("attributes", {}), data.get("relationships"))
+            return self._send(201, {"data": created})
+        if method == "PATCH" and rid:
+            data = json.loads(self._read_body() or b"{}").get("data", {})
+            resource = self.drupal.update(rtype, rid, data.get("attributes", {}))
+            return self._send(200, {"data": resource}) if resource else self._error(404, "Not found")
+        if method == "DELETE" and rid:
+            return self._send(204) if self.drupal.delete(rtype, rid) else self._error(404, "Not found")
+        self._error(405, "Method not allowed")
+
+    @staticmethod
+    def _resource_type(parts: list[str]) -> Optional[str]:
+        if len(parts) < 2:
+            return None
+        entity, bundle = parts[0], parts[1]
+        if entity in ("node", "taxonomy_term", "block_content", "media", "menu_link_content", "file"):
+            return f"{entity}--{bundle}"
+        return None
+
+    def _config(self, entity: str, query: dict) -> Optional[list]:
+        if entity == "node_type":
+            return _config_collection("node_type--node_type", [
+                (k, {"drupal_internal__type": k, "name": v, "description": ""}) for k, v in CONTENT_TYPES.items()
+            ])
+        if entity == "field_config":
+            bundle = query.get("filter[bundle]")
+            return _config_collection("field_config--field_config", [
+                (f"{b}.{name}", {"field_name": name, "label": label, "field_type": ftype, "required": req, "bundle": b})
+                for b, fields in FIELDS.items() if not bundle or b == bundle
+                for name, label, ftype, req in fields
+            ])
+        if entity == "block_content_type":
+            return _config_collection("block_content_type--block_content_type",
+                                      [(b, {"drupal_internal__id": b, "label": b.title()}) for b in BLOCK_TYPES])
+        if entity == "menu":
+            return _config_collection("menu--menu", [(k, {"drupal_internal__id": k, "label": v}) for k, v in MENUS.items()])
+        if entity == "view":
+            return _config_collection("view--view", [(k, {"drupal_internal__id": k, "label": v}) for k, v in VIEWS.items()])
+        return None
+
+    def _send_cached(self, data: list):
+        body = {"data": data}
+        etag = '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, headers={"ETag": etag})
+        self._send(200, body, {"ETag": etag})
+
+    def _collection(self, rtype: str, parts: list[str], query: dict):
+        items = self.drupal.list(rtype)
+        for key, value in query.items():
+            if key.startswith("filter[") and key.endswith("]"):
+                field = key[len("filter["):-1]
+                items = [i for i in items if str(i["attributes"].get(field)) == value]
+        limit = min(int(query.get("page[limit]", PAGE_LIMIT)), PAGE_LIMIT)
+        offset = int(query.get("page[offset]", 0))
+        page = items[offset:offset + limit]
+        sparse = query.get(f"fields[{rtype}]")
+        if sparse:
+            keep = set(sparse.split(","))
+            page = [{**i, "attributes": {k: v for k, v in i["attributes"].items() if k in keep}} for i in page]
+        doc = {"data": page, "links": {}}
+        if offset + limit < len(items):
+            nxt = {**query, "page[offset]": offset + limit, "page[limit]": limit}
+            doc["links"]["next"] = {"href": f"http://{self.headers.get('Host')}/jsonapi/{'/'.join(parts)}?{urlencode(nxt)}"}
+        self._send(200, doc)
+
+    def _upload(self, bundle: str, field: str):
+        disposition = self.headers.get("Content-Disposition", "")
+        filename = disposition.split("filename=")[-1].strip('"') if "filename=" in disposition else "upload.bin"
+        size = self._drain_body()
+        with self.drupal._lock:
+            self.drupal.stats["bytes_uploaded"] += size
+        created = self.drupal.create("file--file", {
+            "filename": filename, "filesize": size, "uri": {"value": f"public://{filename}"},
+        })
+        self._send(201, {"data": created})
+
+    def _atomic(self):
+        ops = json.loads(self._read_body() or b"{}").get("atomic:operations", [])
+        results = []
+        for op in ops:
+            if op.get("op") != "add":
+                return self._error(400, f"Unsupported op {op.get('op')}")
+            data = op.get("data", {})
+            results.append({"data": self.drupal.create(data.get("type", ""), data.get("attributes", {}),
+                                                        data.get("relationships"))})
+        self._send(200, {"atomic:results": results})
+
+
+class FakeDrupalServer:
+    """Runs a FakeDrupal on a background thread. Port 0 picks a free port."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **faults):
+        self.drupal = FakeDrupal(**faults)
+        handler = type("FakeDrupalHandler", (_Handler,), {"drupal": self.drupal})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeDrupalServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeDrupalServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Drupal JSON:API server for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=0, help="fixed latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="extra random latency, 0..N ms")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of requests failing with 500")
+    parser.add_argument("--rate-429", type=float, default=0, help="fraction of requests throttled with 429")
+    parser.add_argument("--retry-after", type=float, default=1, help="Retry-After seconds on 429/503")
+    parser.add_argument("--capacity", type=int, default=0, help="max concurrent requests before 503 (0 = unlimited)")
+    parser.add_argument("--no-atomic", action="store_true", help="disable the Atomic Operations endpoint")
+    parser.add_argument("--no-gzip", action="store_true", help="never gzip responses")
+    args = parser.parse_args()
+
+    server = FakeDrupalServer(
+        args.host, args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        rate_429=args.rate_429, retry_after=args.retry_after, capacity=args.capacity, atomic=not args.no_atomic,
+        compress=not args.no_gzip,
+    )
+    print(f"Fake Drupal listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(server.drupal.stats))
+
+
+if __name__ == "__main__":
+    main()
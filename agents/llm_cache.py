@@ -0,0 +1,249 @@
+"""
+DrupalMind — LLM response cache
+Content-addressed cache in front of LLMProvider.call_with_tools. The key is a
+SHA-256 fingerprint of provider, model, max_tokens, system prompt, messages
+and tools, so a re-run that sends the same prompt gets the stored response
+back without a round trip. Only the unified result (content, stop_reason,
+tool_calls) is stored; tools named in a cached response are still executed.
+
+LLM_CACHE=disk (files under LLM_CACHE_DIR) | redis (shared Redis) | off
+LLM_CACHE_MAX_MB bounds the cache; the least recently used entries are evicted.
+LLM_CACHE_BYPASS=true skips lookups but still records fresh responses.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Optional
+
+import codec
+
+logger = logging.getLogger("drupalmind.llm_cache")
+
+LLM_CACHE = os.getenv("LLM_CACHE", "disk").lower()
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "/tmp/drupalmind_llm_cache")
+LLM_CACHE_MAX_BYTES = int(float(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024)
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "false").lower() == "true"
+
+# Eviction frees down to this fraction of the bound, so it does not run on every write
+LOW_WATER = 0.9
+# Only finished turns are worth replaying
+CACHEABLE_STOP_REASONS = ("end_turn", "tool_use")
+
+
+def fingerprint(provider: str, model: str, max_tokens: int, system: str, messages: list, tools: Optional[list]) -> str:
+    """Stable hash of everything that determines the response."""
+    request = {
+        "provider": provider,
+        "model": model,
+        "max_tokens": max_tokens,
+        "system": system,
+        "messages": messages,
+        "tools": tools or [],
+    }
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+# ── Backends ──────────────────────────────────────────────────
+
+class DiskCache:
+    """LLM_CACHE_DIR/ab/<key>.json; the file mtime is the LRU clock."""
+
+    def __init__(self, root: str = LLM_CACHE_DIR, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def _entries(self) -> list:
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for shard in os.scandir(self.root):
+            if shard.is_dir():
+                for f in os.scandir(shard.path):
+                    if f.name.endswith(".json"):
+                        st = f.stat()
+                        entries.append((st.st_mtime, st.st_size, f.path))
+        return entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            os.utime(path)
+            return raw
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, raw: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+        os.replace(tmp, path)
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._bytes += len(raw)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes * LOW_WATER:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+                removed += 1
+            except FileNotFoundError:
+                pass
+        self._bytes = total
+        logger.info(f"[LLM_CACHE] Evicted {removed} entries, {total} bytes left")
+
+    def clear(self) -> int:
+        with self._lock:
+            entries = self._entries()
+            for _, _, path in entries:
+                os.unlink(path)
+            self._bytes = 0
+        return len(entries)
+
+
+class RedisCache:
+    """Entries under drupalmind:llm_cache:<key>, with a sorted set as the LRU clock."""
+
+    def __init__(self, max_bytes: int = LLM_CACHE_MAX_BYTES):
+        from memory import memory
+        if not memory._redis:
+            raise RuntimeError("LLM_CACHE=redis but Redis is not reachable")
+        self._redis = memory._redis
+        self.max_bytes = max_bytes
+        self._prefix = f"{memory._prefix}llm_cache:"
+        self._lru_key = f"{self._prefix}__lru__"
+        self._sizes_key = f"{self._prefix}__sizes__"
+        self._bytes_key = f"{self._prefix}__bytes__"
+
+    def get(self, key: str) -> Optional[bytes]:
+        raw = self._redis.get(self._prefix + key)
+        if raw is not None:
+            self._redis.zadd(self._lru_key, {key: time.time()})
+        return raw
+
+    def put(self, key: str, raw: bytes):
+        if not self._redis.set(self._prefix + key, raw, nx=True):
+            return
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zadd(self._lru_key, {key: time.time()})
+        pipe.hset(self._sizes_key, key, len(raw))
+        pipe.incrby(self._bytes_key, len(raw))
+        total = pipe.execute()[-1]
+        if total > self.max_bytes:
+            self._evict(total)
+
+    def _evict(self, total: int):
+        removed = 0
+        while total > self.max_bytes * LOW_WATER:
+            keys = [k.decode() for k in self._redis.zrange(self._lru_key, 0, 99)]
+            if not keys:
+                break
+            sizes = [int(s or 0) for s in self._redis.hmget(self._sizes_key, keys)]
+            freed = sum(sizes)
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.unlink(*[self._prefix + k for k in keys])
+            pipe.zrem(self._lru_key, *keys)
+            pipe.hdel(self._sizes_key, *keys)
+            pipe.decrby(self._bytes_key, freed)
+            total = pipe.execute()[-1]
+            removed += len(keys)
+        logger.info(f"[LLM_CACHE] Evicted {removed} entries, {total} bytes left")
+
+    def clear(self) -> int:
+        keys = [k.decode() for k in self._redis.zrange(self._lru_key, 0, -1)]
+        pipe = self._redis.pipeline(transaction=False)
+        if keys:
+            pipe.unlink(*[self._prefix + k for k in keys])
+        pipe.unlink(self._lru_key, self._sizes_key, self._bytes_key)
+        pipe.execute()
+        return len(keys)
+
+
+_BACKENDS = {"disk": DiskCache, "redis": RedisCache}
+
+
+# ── Cache ─────────────────────────────────────────────────────
+
+class LLMCache:
+
+    def __init__(self, backend=None, bypass: bool = LLM_CACHE_BYPASS):
+        self.enabled = backend is not None or LLM_CACHE in _BACKENDS
+        self.bypass = bypass
+        self._backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = _BACKENDS[LLM_CACHE]()
+        return self._backend
+
+    def get(self, key: str) -> Optional[dict]:
+        """Stored result for a fingerprint, or None. Cache failures count as misses."""
+        if not self.enabled or self.bypass:
+            return None
+        try:
+            raw = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"[LLM_CACHE] Lookup failed: {e}")
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        result = codec.loads(raw)
+        result["cached"] = True
+        return result
+
+    def put(self, key: str, result: dict):
+        if not self.enabled or result.get("stop_reason") not in CACHEABLE_STOP_REASONS:
+            return
+        entry = {
+            "content": result.get("content", ""),
+            "stop_reason": result["stop_reason"],
+            "tool_calls": result.get("tool_calls", []),
+        }
+        try:
+            self.backend.put(key, codec.dumps(entry))
+        except Exception as e:
+            logger.warning(f"[LLM_CACHE] Store failed: {e}")
+
+    def clear(self) -> int:
+        return self.backend.clear() if self.enabled else 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": LLM_CACHE if self.enabled else "off",
+            "bypass": self.bypass,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+llm_cache = LLMCache()
@@ -0,0 +1,199 @@
+"""
+DrupalMind — LLM usage accounting
+Records input, output and prompt-cache tokens, latency and an estimated cost
+for every LLM call, aggregated per agent and per orchestrator phase for one
+job. The orchestrator installs a UsageTracker for its job and sets the current
+phase and agent through context variables, so the shared LLMProvider
+attributes each call without extra arguments (asyncio.to_thread copies the
+context into worker threads).
+
+Optional per-job budgets stop runaway refinement loops:
+LLM_JOB_MAX_TOKENS (input + output tokens) and LLM_JOB_MAX_COST_USD.
+"""
+import os
+import threading
+from contextvars import ContextVar
+from typing import Optional
+
+LLM_JOB_MAX_TOKENS = int(os.getenv("LLM_JOB_MAX_TOKENS", "0"))
+LLM_JOB_MAX_COST_USD = float(os.getenv("LLM_JOB_MAX_COST_USD", "0"))
+
+# USD per million tokens: (input, output). Matched by model-name prefix, longest first.
+MODEL_PRICES = {
+    "claude-opus-4": (15.0, 75.0),
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-3-7-sonnet": (3.0, 15.0),
+    "claude-3-5-sonnet": (3.0, 15.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "claude-3-haiku": (0.25, 1.25),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4.1-mini": (0.4, 1.6),
+    "gpt-4.1": (2.0, 8.0),
+}
+# Prompt-cache reads and writes relative to the input price (Anthropic pricing)
+CACHE_READ_FACTOR = 0.1
+CACHE_WRITE_FACTOR = 1.25
+
+
+def _parse_prices(spec: str) -> dict:
+    """LLM_PRICES="model=input/output,..." in USD per million tokens."""
+    prices = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        model, _, pair = item.partition("=")
+        inp, _, out = pair.partition("/")
+        prices[model.strip()] = (float(inp), float(out or inp))
+    return prices
+
+
+MODEL_PRICES.update(_parse_prices(os.getenv("LLM_PRICES", "")))
+
+
+def model_prices(provider: str, model: str) -> tuple:
+    if provider == "ollama":
+        return (0.0, 0.0)
+    for prefix in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model.startswith(prefix):
+            return MODEL_PRICES[prefix]
+    return (0.0, 0.0)
+
+
+def estimate_cost(provider: str, model: str, usage: dict) -> float:
+    price_in, price_out = model_prices(provider, model)
+    cost = (
+        usage.get("input_tokens", 0) * price_in
+        + usage.get("cache_read_input_tokens", 0) * price_in * CACHE_READ_FACTOR
+        + usage.get("cache_creation_input_tokens", 0) * price_in * CACHE_WRITE_FACTOR
+        + usage.get("output_tokens", 0) * price_out
+    )
+    return cost / 1_000_000
+
+
+class LLMBudgetExceeded(RuntimeError):
+    """Raised instead of making an LLM call once the job's token or cost budget is spent."""
+
+
+class _Totals:
+    __slots__ = ("calls", "cached_responses", "input_tokens", "output_tokens",
+                 "cache_read_tokens", "cache_write_tokens", "latency_s", "cost_usd")
+
+    def __init__(self):
+        self.calls = 0
+        self.cached_responses = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self.latency_s = 0.0
+        self.cost_usd = 0.0
+
+    def add(self, usage: dict, latency_s: float, cost: float, cached: bool):
+        self.calls += 1
+        self.cached_responses += int(cached)
+        self.input_tokens += usage.get("input_tokens", 0)
+        self.output_tokens += usage.get("output_tokens", 0)
+        self.cache_read_tokens += usage.get("cache_read_input_tokens", 0)
+        self.cache_write_tokens += usage.get("cache_creation_input_tokens", 0)
+        self.latency_s += latency_s
+        self.cost_usd += cost
+
+    @property
+    def tokens(self) -> int:
+        return self.input_tokens + self.cache_read_tokens + self.cache_write_tokens + self.output_tokens
+
+    def to_dict(self) -> dict:
+        fresh = self.calls - self.cached_responses
+        return {
+            "calls": self.calls,
+            "cached_responses": self.cached_responses,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "total_tokens": self.tokens,
+            "latency_s": round(self.latency_s, 2),
+            "avg_latency_ms": round(self.latency_s * 1000 / fresh, 1) if fresh else None,
+            "cost_usd": round(self.cost_usd, 4),
+        }
+
+
+class UsageTracker:
+    """One job's LLM usage. Thread-safe: tool loops report from worker threads."""
+
+    def __init__(self, job_id: str = None, max_tokens: int = LLM_JOB_MAX_TOKENS,
+                 max_cost_usd: float = LLM_JOB_MAX_COST_USD):
+        self.job_id = job_id
+        self.max_tokens = max_tokens
+        self.max_cost_usd = max_cost_usd
+        self.total = _Totals()
+        self.by_agent: dict[str, _Totals] = {}
+        self.by_phase: dict[str, _Totals] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, model: str, usage: Optional[dict], latency_s: float,
+               cached: bool = False, agent: str = None, phase: str = None) -> float:
+        """Add one call; returns its estimated cost in USD."""
+        usage = usage or {}
+        cost = 0.0 if cached else estimate_cost(provider, model, usage)
+        agent = agent or current_agent.get() or "unknown"
+        phase = phase or current_phase.get() or "unknown"
+        with self._lock:
+            self.total.add(usage, latency_s, cost, cached)
+            self.by_agent.setdefault(agent, _Totals()).add(usage, latency_s, cost, cached)
+            self.by_phase.setdefault(phase, _Totals()).add(usage, latency_s, cost, cached)
+        return cost
+
+    def budget_exceeded(self) -> Optional[str]:
+        """Why the budget is spent, or None while there is budget left."""
+        if self.max_tokens and self.total.tokens >= self.max_tokens:
+            return f"token budget of {self.max_tokens} reached ({self.total.tokens} used)"
+        if self.max_cost_usd and self.total.cost_usd >= self.max_cost_usd:
+            return f"cost budget of ${self.max_cost_usd:.2f} reached (${self.total.cost_usd:.2f} spent)"
+        return None
+
+    def agent_usage(self, agent: str) -> Optional[dict]:
+        with self._lock:
+            totals = self.by_agent.get(agent)
+            return totals.to_dict() if totals else None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "total": self.total.to_dict(),
+                "by_agent": {k: v.to_dict() for k, v in sorted(self.by_agent.items())},
+                "by_phase": {k: v.to_dict() for k, v in self.by_phase.items()},
+                "budget": {
+                    "max_tokens": self.max_tokens or None,
+                    "max_cost_usd": self.max_cost_usd or None,
+                    "exceeded": self.budget_exceeded(),
+                },
+            }
+
+
+# ── Context ───────────────────────────────────────────────────
+
+current_tracker: ContextVar[Optional[UsageTracker]] = ContextVar("llm_usage_tracker", default=None)
+current_phase: ContextVar[Optional[str]] = ContextVar("llm_usage_phase", default=None)
+current_agent: ContextVar[Optional[str]] = ContextVar("llm_usage_agent", default=None)
+
+
+def record(provider: str, model: str, usage: Optional[dict], latency_s: float, cached: bool = False) -> float:
+    """Record a call against the current job, if any; returns the estimated cost."""
+    tracker = current_tracker.get()
+    if tracker is None:
+        return estimate_cost(provider, model, usage or {}) if not cached else 0.0
+    return tracker.record(provider, model, usage, latency_s, cached)
+
+
+def check_budget():
+    """Raise LLMBudgetExceeded when the current job's budget is spent."""
+    tracker = current_tracker.get()
+    reason = tracker.budget_exceeded() if tracker else None
+    if reason:
+        raise LLMBudgetExceeded(f"LLM budget exceeded for job {tracker.job_id}: {reason}")
+
+
+def budget_exceeded() -> Optional[str]:
+    tracker = current_tracker.get()
+    return tracker.budget_exceeded() if tracker else None
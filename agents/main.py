@@ -8,11 +8,13 @@ import asyncio
 import uuid
 from typing import Optional
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks, Request
+from fastapi.responses import FileResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
 from memory import memory
+from blob_store import blob_store, valid_id, content_type_of
 from orchestrator import OrchestratorAgent
 
 
@@ -92,7 +94,7 @@ async def start_build(request: BuildRequest, background_tasks: BackgroundTasks):
 async def get_build(job_id: str):
     if job_id not in jobs:
         raise HTTPException(404, "Job not found")
-    return {**jobs[job_id], "result": memory.get(f"job_{job_id}_result")}
+    return {**jobs[job_id], "result": await memory.for_job(job_id).aio.get("result")}
 
 
 @app.get("/build/{job_id}/content-stats")
@@ -102,7 +104,7 @@ async def get_content_migration_stats(job_id: str):
         raise HTTPException(404, "Job not found")
     
     # Get migration result from memory
-    result = memory.get(f"job_{job_id}_result")
+    result = await memory.for_job(job_id).aio.get("result")
     
     if not result:
         return {
@@ -134,13 +136,27 @@ async def list_jobs():
 
 
 @app.get("/memory")
-async def get_memory():
-    return {"keys": memory.list_keys(), "backend": memory.backend}
+async def get_memory(prefix: str = "", limit: Optional[int] = None, job_id: Optional[str] = None):
+    store = (memory.for_job(job_id) if job_id else memory).aio
+    # SCAN-based listing; limit stops the scan early on large keyspaces
+    keys: dict = {}
+    async for key in store.iter_keys(prefix):
+        keys.setdefault(key)
+        if limit and len(keys) >= limit:
+            break
+    return {"keys": list(keys), "backend": memory.backend}
+
+
+@app.get("/memory/stats")
+async def get_memory_stats(job_id: Optional[str] = None, top: int = 10):
+    """Bytes and key counts by key class and by job, plus the largest keys."""
+    store = memory.for_job(job_id) if job_id else memory
+    return await asyncio.to_thread(store.stats, top)
 
 
 @app.get("/memory/{key:path}")
-async def get_memory_key(key: str):
-    val = memory.get(key)
+async def get_memory_key(key: str, job_id: Optional[str] = None):
+    val = await (memory.for_job(job_id) if job_id else memory).aio.get(key)
     if val is None:
         raise HTTPException(404, "Key not found")
     return {"key": key, "value": val}
@@ -148,10 +164,55 @@ async def get_memory_key(key: str):
 
 @app.delete("/memory/reset")
 async def reset_memory():
-    memory.clear_job()
+    await memory.aio.clear_job()
     return {"reset": True}
 
 
+@app.delete("/memory/jobs/{job_id}")
+async def drop_job_memory(job_id: str):
+    """Drop one job's namespace; shared knowledge and other jobs are untouched."""
+    if jobs.get(job_id, {}).get("status") in ("queued", "running"):
+        raise HTTPException(409, "Job is still running")
+    removed = await memory.aio.clear_job(job_id)
+    return {"job_id": job_id, "removed": removed}
+
+
+@app.get("/llm/stats")
+async def get_llm_stats():
+    """LLM response-cache hits and Anthropic prompt-cache token counts since startup."""
+    from base_agent import get_llm_provider
+    from llm_cache import llm_cache
+    llm = get_llm_provider()
+    return {
+        "provider": llm.provider,
+        "response_cache": llm_cache.stats(),
+        "prompt_cache": llm.prompt_cache_stats() if llm.provider == "anthropic" else None,
+    }
+
+
+# ── Blobs ─────────────────────────────────────────────────────
+# Ids are content hashes, so a blob never changes: cache it forever
+BLOB_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@app.get("/blobs/{blob_id}")
+async def get_blob(blob_id: str, request: Request):
+    """Serve a screenshot or other artifact from the content-addressed blob store."""
+    if not valid_id(blob_id):
+        raise HTTPException(404, "Blob not found")
+    headers = {"ETag": f'"{blob_id}"', "Cache-Control": BLOB_CACHE_CONTROL}
+    etags = {t.strip().removeprefix("W/").strip('"') for t in request.headers.get("if-none-match", "").split(",")}
+    if blob_id in etags or "*" in etags:
+        return Response(status_code=304, headers=headers)
+    path = await asyncio.to_thread(blob_store.path, blob_id)
+    if path:
+        return FileResponse(path, media_type=content_type_of(blob_id), headers=headers)
+    data = await asyncio.to_thread(blob_store.get, blob_id)
+    if data is None:
+        raise HTTPException(404, "Blob not found")
+    return Response(content=data, media_type=content_type_of(blob_id), headers=headers)
+
+
 # ── WebSocket ─────────────────────────────────────────────────
 @app.websocket("/ws/{job_id}")
 async def ws_endpoint(websocket: WebSocket, job_id: str):
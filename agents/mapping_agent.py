@@ -11,7 +11,6 @@ import logging
 import time
 from typing import Any, Optional
 from base_agent import BaseAgent
-from memory import memory as shared_memory
 
 # Configure logging for MappingAgent
 logger = logging.getLogger("drupalmind.mapping")
@@ -44,6 +43,10 @@ CONFIDENCE_THRESHOLD_LOW = 0.5
 class MappingAgent(BaseAgent):
     """Maps source elements to Drupal components with confidence scoring."""
 
+    PARALLEL_SAFE_TOOLS = BaseAgent.PARALLEL_SAFE_TOOLS | {
+        "get_mapping_manifest", "get_element_mapping", "list_review_items",
+    }
+
     def __init__(self):
         super().__init__("mapping", "MappingAgent")
 
@@ -58,7 +61,7 @@ class MappingAgent(BaseAgent):
             "source": "blueprint",
         })
         
-        blueprint = shared_memory.get_blueprint()
+        blueprint = self.memory.get_blueprint()
         if not blueprint:
             await self.log_error("No blueprint found - run AnalyzerAgent first")
             await self.log_extended("mapping_error", {"error": "No blueprint"})
@@ -68,7 +71,7 @@ class MappingAgent(BaseAgent):
         envelopes = self._get_all_envelopes()
         
         # Get global knowledge
-        knowledge = shared_memory.get_global_knowledge()
+        knowledge = self.memory.get_global_knowledge()
         
         await self.log_data("mapping_inputs", {
             "blueprint_pages": len(blueprint.get("pages", [])),
@@ -85,7 +88,7 @@ class MappingAgent(BaseAgent):
         )
         
         # Store mapping manifest
-        shared_memory.set_mapping_manifest(result)
+        self.memory.set_mapping_manifest(result)
         
         # Log detailed mapping for each element
         mappings = result.get("mappings", [])
@@ -187,13 +190,7 @@ class MappingAgent(BaseAgent):
 
     def _get_all_envelopes(self) -> dict:
         """Get all capability envelopes from memory."""
-        envelopes = {}
-        envelope_keys = shared_memory.list_capability_envelopes()
-        for key in envelope_keys:
-            envelope = shared_memory.get_capability_envelope(key)
-            if envelope:
-                envelopes[key] = envelope
-        return envelopes
+        return {k: v for k, v in self.memory.get_capability_envelopes().items() if v}
 
     def _create_mapping_manifest(self, blueprint: dict, envelopes: dict, knowledge: dict) -> dict:
         """Create the full mapping manifest."""
@@ -594,21 +591,21 @@ class MappingAgent(BaseAgent):
 
     def _tool_get_mapping_manifest(self) -> str:
         """Get the current mapping manifest."""
-        manifest = shared_memory.get_mapping_manifest()
+        manifest = self.memory.get_mapping_manifest()
         if manifest:
             return json.dumps(manifest, indent=2)
         return "No mapping manifest found."
 
     def _tool_get_element_mapping(self, element_id: str) -> str:
         """Get mapping for a specific element."""
-        mapping = shared_memory.get_mapping_for_element(element_id)
+        mapping = self.memory.get_mapping_for_element(element_id)
         if mapping:
             return json.dumps(mapping, indent=2)
         return f"No mapping found for element '{element_id}'"
 
     def _tool_list_review_items(self) -> str:
         """List all elements that need human review."""
-        manifest = shared_memory.get_mapping_manifest()
+        manifest = self.memory.get_mapping_manifest()
         if not manifest:
             return "No mapping manifest found."
         
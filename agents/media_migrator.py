@@ -2,16 +2,23 @@
 DrupalMind - Media Migrator
 Handles media asset download and upload to Drupal.
 """
+import asyncio
 import logging
 import requests
 import os
+import shutil
 import hashlib
+import tempfile
+import mimetypes
 from typing import List, Dict, Optional
 from pathlib import Path
 from urllib.parse import urlparse, urljoin
 
 logger = logging.getLogger(__name__)
 
+# Downloads + uploads in flight at once; the client's own limiter still caps Drupal
+MEDIA_MAX_CONCURRENCY = int(os.getenv("MEDIA_MAX_CONCURRENCY", "4"))
+
 
 class MediaMigrator:
     """Handles media asset download and upload to Drupal."""
@@ -21,7 +28,7 @@ class MediaMigrator:
         Initialize the media migrator.
         
         Args:
-            drupal_client: DrupalClient instance for uploading files
+            drupal_client: AsyncDrupalClient for uploading files (usually the job's shared client)
             source_url: Base URL of the source website
             cache_dir: Local directory for caching downloaded media
         """
@@ -39,9 +46,9 @@ class MediaMigrator:
         # Track migration progress
         self.media_map = {}  # Maps old URLs to new Drupal file IDs
     
-    def migrate_media(self, content_list: List[Dict]) -> Dict:
+    async def migrate_media(self, content_list: List[Dict]) -> Dict:
         """
-        Download and upload all media from content.
+        Download and upload all media from content, MEDIA_MAX_CONCURRENCY items at a time.
         
         Args:
             content_list: List of content items with potential media
@@ -68,33 +75,32 @@ class MediaMigrator:
         
         logger.info(f"Found {len(all_media_urls)} media items to migrate")
         
-        for old_url in all_media_urls:
-            try:
-                # Skip if already processed
-                if old_url in report['media_map']:
-                    continue
-                    
-                # Download media
-                local_path = self._download_media(old_url)
+        slots = asyncio.Semaphore(MEDIA_MAX_CONCURRENCY)
+        
+        async def _migrate(old_url: str) -> Optional[str]:
+            async with slots:
+                # Download media (blocking requests stream, so off the event loop)
+                local_path = await asyncio.to_thread(self._download_media, old_url)
                 if not local_path:
-                    report['failed'] += 1
-                    report['failed_urls'].append(old_url)
                     logger.warning(f"✗ Failed to download: {old_url}")
-                    continue
+                    return None
                 
                 # Upload to Drupal
-                drupal_file_id = self._upload_to_drupal(local_path, old_url)
-                if drupal_file_id:
-                    report['successful'] += 1
-                    report['media_map'][old_url] = drupal_file_id
-                    logger.info(f"✓ Migrated media: {old_url} -> {drupal_file_id}")
-                else:
-                    report['failed'] += 1
-                    report['failed_urls'].append(old_url)
+                drupal_file_id = await self._upload_to_drupal(local_path, old_url)
+                if not drupal_file_id:
                     logger.warning(f"✗ Failed to upload: {old_url}")
-            
-            except Exception as e:
-                logger.error(f"Media migration error for {old_url}: {e}")
+                return drupal_file_id
+        
+        outcomes = await asyncio.gather(*(_migrate(url) for url in all_media_urls), return_exceptions=True)
+        for old_url, outcome in zip(all_media_urls, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Media migration error for {old_url}: {outcome}")
+                outcome = None
+            if outcome:
+                report['successful'] += 1
+                report['media_map'][old_url] = outcome
+                logger.info(f"✓ Migrated media: {old_url} -> {outcome}")
+            else:
                 report['failed'] += 1
                 report['failed_urls'].append(old_url)
         
@@ -165,24 +171,38 @@ class MediaMigrator:
             if not filename or filename in ['/', '']:
                 filename = f'media_{hashlib.md5(url.encode()).hexdigest()[:8]}'
             
-            # Check for file extension
-            if '.' not in filename:
-                filename += '.jpg'  # Default to jpg
-            
-            local_path = self.cache_dir / filename
+            # Cache by URL: one directory per URL hash, so files sharing a basename never collide
+            url_dir = self.cache_dir / hashlib.sha256(url.encode()).hexdigest()[:16]
             
             # Check if already cached
-            if local_path.exists():
-                logger.debug(f"Using cached: {url}")
-                return str(local_path)
-            
-            # Download file
-            response = self.session.get(url, timeout=30, allow_redirects=True)
-            response.raise_for_status()
+            if url_dir.is_dir():
+                for cached in url_dir.iterdir():
+                    if cached.is_file() and cached.suffix != '.part':
+                        logger.debug(f"Using cached: {url}")
+                        return str(cached)
             
-            # Save to cache
-            with open(local_path, 'wb') as f:
-                f.write(response.content)
+            # Stream the download to disk so large files never sit in memory
+            with self.session.get(url, timeout=30, allow_redirects=True, stream=True) as response:
+                response.raise_for_status()
+                
+                # Name the file after its real type when the URL has no extension
+                if '.' not in filename:
+                    content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+                    filename += mimetypes.guess_extension(content_type) or '.bin'
+                url_dir.mkdir(parents=True, exist_ok=True)
+                local_path = url_dir / filename
+                
+                # A private temp file per download; only a complete file is renamed into place
+                fd, partial = tempfile.mkstemp(dir=url_dir, suffix='.part')
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=64 * 1024):
+                            f.write(chunk)
+                    os.replace(partial, local_path)
+                except BaseException:
+                    if os.path.exists(partial):
+                        os.unlink(partial)
+                    raise
             
             logger.debug(f"Downloaded: {url} -> {local_path}")
             return str(local_path)
@@ -197,7 +217,7 @@ class MediaMigrator:
             logger.error(f"Failed to download {url}: {e}")
             return None
     
-    def _upload_to_drupal(self, local_path: str, original_url: str) -> Optional[str]:
+    async def _upload_to_drupal(self, local_path: str, original_url: str) -> Optional[str]:
         """
         Upload file to Drupal and return file ID.
         
@@ -209,47 +229,19 @@ class MediaMigrator:
             Drupal file ID or None if failed
         """
         try:
-            with open(local_path, 'rb') as f:
-                file_content = f.read()
-            
             filename = Path(local_path).name
             
-            # Use Drupal JSON:API to upload
-            if hasattr(self.drupal_client, 'upload_file'):
-                response = self.drupal_client.upload_file(
+            # Stream the file handle as the request body instead of reading it into memory
+            with open(local_path, 'rb') as f:
+                file_entity = await self.drupal_client.upload_file(
                     filename=filename,
-                    content=file_content
+                    data=f,
+                    mime_type=mimetypes.guess_type(filename)[0]
                 )
-                
-                if response and 'data' in response:
-                    file_id = response['data'].get('id')
-                    logger.info(f"Uploaded to Drupal: {filename} (ID: {file_id})")
-                    return file_id
-            
-            # Fallback: Use base64 encoding method
-            import base64
-            b64_content = base64.b64encode(file_content).decode('utf-8')
-            
-            # Try to create file entity
-            payload = {
-                "data": {
-                    "type": "file--file",
-                    "attributes": {
-                        "filename": filename,
-                        "uri": f"base64:{b64_content}"
-                    }
-                }
-            }
-            
-            response = self.drupal_client._make_request(
-                'POST',
-                '/jsonapi/file/file',
-                json=payload
-            )
             
-            if response and 'data' in response:
-                file_id = response['data'].get('id')
-                logger.info(f"Uploaded to Drupal (base64): {filename} (ID: {file_id})")
+            if file_entity:
+                file_id = file_entity.get('id')
+                logger.info(f"Uploaded to Drupal: {filename} (ID: {file_id})")
                 return file_id
             
             return None
@@ -293,9 +285,11 @@ class MediaMigrator:
     def cleanup_cache(self):
         """Clean up cached media files."""
         try:
-            for file in self.cache_dir.iterdir():
-                if file.is_file():
-                    file.unlink()
+            for entry in self.cache_dir.iterdir():
+                if entry.is_dir():
+                    shutil.rmtree(entry)
+                elif entry.is_file():
+                    entry.unlink()
             logger.info(f"Cleaned up cache directory: {self.cache_dir}")
         except Exception as e:
             logger.warning(f"Failed to cleanup cache: {e}")
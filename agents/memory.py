@@ -4,108 +4,794 @@ Redis-backed shared memory for all agents.
 Falls back to in-memory dict if Redis is unavailable.
 """
 import os
+import copy
+import asyncio
 import json
 import time
 import logging
-from typing import Any, Optional
+import threading
+import weakref
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional
+
+from memory_codec import decode, encode
 
 logger = logging.getLogger(__name__)
 
 try:
     import redis
+    import redis.asyncio as aioredis
     REDIS_AVAILABLE = True
 except ImportError:
     REDIS_AVAILABLE = False
 
+# Keys requested per SCAN round trip, and keys per pipelined UNLINK batch
+SCAN_COUNT = int(os.getenv("MEMORY_SCAN_COUNT", "1000"))
+DELETE_CHUNK = int(os.getenv("MEMORY_DELETE_CHUNK", "500"))
+# Keys per MGET command; all chunks of one get_many still share a single pipeline
+MGET_CHUNK = int(os.getenv("MEMORY_MGET_CHUNK", "500"))
+
+# Optional in-process near cache in front of Redis (see NearCache)
+NEAR_CACHE_ENABLED = os.getenv("MEMORY_NEAR_CACHE", "false").lower() == "true"
+NEAR_CACHE_SIZE = int(os.getenv("MEMORY_NEAR_CACHE_SIZE", "256"))
+NEAR_CACHE_TTL = float(os.getenv("MEMORY_NEAR_CACHE_TTL", "300"))
+INVALIDATION_CHANNEL = "drupalmind:__invalidate__"
+
+# Connection pool size of the asyncio client (one pool per event loop)
+ASYNC_MAX_CONNECTIONS = int(os.getenv("MEMORY_ASYNC_MAX_CONNECTIONS", "50"))
+
+
+def _parse_ttl_policy(spec: str) -> list[tuple[str, int]]:
+    """"visual_diff/=86400,missing_pieces_=3600" -> [(prefix, seconds)], longest prefix first."""
+    policy = []
+    for part in spec.split(","):
+        prefix, _, seconds = part.strip().rpartition("=")
+        if prefix and seconds.strip().isdigit():
+            policy.append((prefix.strip(), int(seconds)))
+    return sorted(policy, key=lambda p: len(p[0]), reverse=True)
+
+
+# TTL for keys written without an explicit ttl, by key prefix (job namespace not included)
+TTL_POLICY = _parse_ttl_policy(os.getenv("MEMORY_TTL_POLICY", ""))
+# Per-job byte budget (0 = unlimited). Over it, the least recently used
+# regenerable artifacts of that job are evicted.
+JOB_MAX_BYTES = int(os.getenv("MEMORY_JOB_MAX_BYTES", "0"))
+EVICTABLE_PREFIXES = tuple(p.strip() for p in os.getenv(
+    "MEMORY_EVICTABLE_PREFIXES", "visual_diff/,missing_pieces_,meso_loop_results").split(",") if p.strip())
+# Budget bookkeeping inside each job namespace: {key: bytes} and {evictable key: last use}
+SIZES_KEY = "__memory_sizes__"
+LRU_KEY = "__memory_lru__"
+# Running total of SIZES_KEY, so a write never has to sum the whole hash
+BYTES_KEY = "__memory_bytes__"
+
+# KEYS: sizes hash, byte counter. ARGV: name, size pairs; size "-" drops the name.
+# Applies the size changes and returns the job's new total. A missing counter is
+# rebuilt from the hash once; removals alone never create it (clear_job may have
+# just unlinked it).
+_ACCOUNT_SCRIPT = """
+local delta, adds = 0, false
+for i = 1, #ARGV, 2 do
+  local old = tonumber(redis.call('HGET', KEYS[1], ARGV[i]) or '0')
+  if ARGV[i + 1] == '-' then
+    redis.call('HDEL', KEYS[1], ARGV[i])
+    delta = delta - old
+  else
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    delta = delta + tonumber(ARGV[i + 1]) - old
+    adds = true
+  end
+end
+if redis.call('EXISTS', KEYS[2]) == 1 then
+  return redis.call('INCRBY', KEYS[2], delta)
+end
+if not adds then
+  return 0
+end
+local total = 0
+for _, size in ipairs(redis.call('HVALS', KEYS[1])) do
+  total = total + tonumber(size)
+end
+redis.call('SET', KEYS[2], total)
+return total
+"""
+
+# Key classes reported by stats(); other keys are classed by their first "/" or ":" segment
+KEY_CLASSES = ("missing_pieces_", "visual_diff/", "mapping_manifest:", "build_plan:", "gap_report:")
+
+
+def policy_ttl(key: str) -> Optional[int]:
+    for prefix, seconds in TTL_POLICY:
+        if key.startswith(prefix):
+            return seconds
+    return None
+
+
+def key_class(key: str) -> str:
+    for prefix in KEY_CLASSES:
+        if key.startswith(prefix):
+            return prefix
+    cut = min((i for i in (key.find("/"), key.find(":")) if i >= 0), default=-1)
+    return key[:cut + 1] if cut >= 0 else key
+
+
+# Secondary indexes written beside the mapping manifest
+MANIFEST_ELEMENTS = "mapping_manifest:elements"
+MANIFEST_BY_PAGE = "mapping_manifest:by_page"
+MANIFEST_BY_COMPONENT = "mapping_manifest:by_component"
+
+# Keys that stay global in a job view: what was learned about the Drupal
+# instance and state meant to outlive a single migration
+SHARED_PREFIXES = (
+    "capability_envelopes/",
+    "components/",
+    "training_summary",
+    "global_knowledge_base",
+    "last_probe_timestamp",
+    "entity_index",
+    "checkpoint:",
+)
+
+
+def _glob_escape(text: str) -> str:
+    """Escape Redis MATCH metacharacters so a prefix is matched literally."""
+    return "".join(f"\\{c}" if c in "*?[]\\" else c for c in text)
+
+
+def _entry_size(entry: dict) -> int:
+    """Encoded size of a local-backend entry."""
+    if "list" in entry:
+        return sum(len(raw) for raw in entry["list"])
+    if "hash" in entry:
+        return sum(len(f) + len(raw) for f, raw in entry["hash"].items())
+    return len(entry["value"])
+
+
+class NearCache:
+    """
+    Bounded LRU of deserialized values in front of Redis.
+
+    Every write through MemoryStore publishes the touched keys on
+    INVALIDATION_CHANNEL (in the same pipeline as the write); a daemon thread
+    in each process drops them from its cache. A fill is only stored if no
+    invalidation arrived while the value was being read (version stamp), and
+    the whole cache is dropped whenever the subscription is interrupted,
+    since messages may have been missed. NEAR_CACHE_TTL bounds staleness as a
+    last resort.
+
+    Entries are kept encoded and decoded on every hit, so each caller gets
+    its own copy and may mutate it freely.
+    """
+
+    def __init__(self, redis_client, maxsize: int = NEAR_CACHE_SIZE, ttl: float = NEAR_CACHE_TTL):
+        self._redis = redis_client
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self._ready = threading.Event()
+        self.hits = self.misses = self.invalidations = 0
+        self._thread = threading.Thread(target=self._listen, name="memory-invalidation", daemon=True)
+        self._thread.start()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: str):
+        """Returns (hit, value); value is a fresh decode of the cached bytes."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                raw = entry[0]
+            else:
+                if entry:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+        return True, decode(raw)
+
+    def put(self, key: str, value: Any, version: int):
+        """Store a value read from Redis while the cache was at version."""
+        if not self._ready.is_set() or version != self._version:
+            return
+        raw = encode(value)
+        with self._lock:
+            if version != self._version:
+                return  # something was invalidated during the read; it may have been this key
+            self._entries[key] = (raw, time.monotonic() + self._ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, keys: Optional[Iterable[str]] = None):
+        """Drop keys, or everything when keys is None."""
+        with self._lock:
+            self._version += 1
+            self.invalidations += 1
+            if keys is None:
+                self._entries.clear()
+            else:
+                for key in keys:
+                    self._entries.pop(key, None)
+
+    def _listen(self):
+        delay = 1.0
+        while True:
+            pubsub = None
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything cached before the subscription was live may be stale
+                self.invalidate()
+                self._ready.set()
+                delay = 1.0
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        keys = json.loads(message["data"])
+                        self.invalidate(keys)
+            except Exception as e:
+                self._ready.clear()
+                self.invalidate()
+                logger.warning(f"[MEMORY] Near-cache invalidation stream lost ({e}), retrying in {delay:.0f}s")
+                time.sleep(delay)
+                delay = min(delay * 2, 30.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self._maxsize, "hits": self.hits,
+                    "misses": self.misses, "invalidations": self.invalidations,
+                    "subscribed": self._ready.is_set()}
+
 
 class MemoryStore:
     """
     Shared key-value memory for all agents.
-    All values are JSON-serialized.
+    Values are JSON-serialized, compressed when large (see memory_codec).
+
+    for_job(job_id) returns a view over the same connection in which every
+    key outside SHARED_PREFIXES lives under "job:<job_id>:", so concurrent
+    migrations never see each other's blueprint, plan or pages.
     """
 
+    job_id: Optional[str] = None
+    _namespace = ""
+
     def __init__(self):
         self._local: dict = {}
         self._redis: Optional[Any] = None
         self._prefix = "drupalmind:"
+        self._near: Optional[NearCache] = None
+        self._local_lock = threading.Lock()
+        self._redis_url = os.getenv("REDIS_URL", "redis://redis:6379")
+        self._aio_clients = weakref.WeakKeyDictionary()
 
         if REDIS_AVAILABLE:
             try:
-                redis_url = os.getenv("REDIS_URL", "redis://redis:6379")
-                self._redis = redis.from_url(redis_url, decode_responses=True)
+                redis_url = self._redis_url
+                self._redis = redis.from_url(redis_url, decode_responses=False)
                 self._redis.ping()
+                self._account_script = self._redis.register_script(_ACCOUNT_SCRIPT)
             except Exception:
                 self._redis = None
 
+        # The local dict is already in-process; the near cache only pays off in front of Redis
+        if self._redis and NEAR_CACHE_ENABLED and NEAR_CACHE_SIZE > 0:
+            self._near = NearCache(self._redis)
+
     @property
     def backend(self) -> str:
         return "redis" if self._redis else "local"
 
+    def _scoped(self, key: str) -> str:
+        """Storage key (without the Redis prefix) for key in this view."""
+        if not self._namespace or key.startswith(SHARED_PREFIXES):
+            return key
+        return f"{self._namespace}{key}"
+
+    def _unscoped(self, stored: str) -> str:
+        return stored[len(self._namespace):] if self._namespace and stored.startswith(self._namespace) else stored
+
     def _key(self, key: str) -> str:
-        return f"{self._prefix}{key}"
+        return f"{self._prefix}{self._scoped(key)}"
+
+    def for_job(self, job_id: str) -> "MemoryStore":
+        """View of this store scoped to one job; shares the connection, local dict and near cache."""
+        view = copy.copy(self)
+        view.job_id = job_id
+        view._namespace = f"job:{job_id}:"
+        return view
+
+    @property
+    def aio(self) -> "AsyncMemoryStore":
+        """Non-blocking API over this store (or view) for code running on the event loop."""
+        return AsyncMemoryStore(self)
+
+    def _execute(self, pipe, keys: Optional[list[str]]) -> list:
+        """Run a write pipeline, invalidating keys (None: everything) in every process's near cache."""
+        if not self._near:
+            return pipe.execute()
+        keys = None if keys is None else [self._scoped(k) for k in keys]
+        pipe.publish(INVALIDATION_CHANNEL, json.dumps(keys))
+        try:
+            return pipe.execute()
+        finally:
+            self._near.invalidate(keys)
+
+    def near_cache_stats(self) -> Optional[dict]:
+        return self._near.stats() if self._near else None
 
     def set(self, key: str, value: Any, ttl: int = None) -> bool:
+        """Store value at key; without ttl, the MEMORY_TTL_POLICY entry for the key's prefix applies."""
+        return self.set_many({key: value}, ttl)
+
+    def _local_entry(self, key: str) -> Optional[dict]:
+        """Local-backend entry for key, dropping it once its ttl has passed."""
+        scoped = self._scoped(key)
+        entry = self._local.get(scoped)
+        if entry and entry.get("exp") and entry["exp"] <= time.time():
+            self._local.pop(scoped, None)
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[Any]:
+        """Decoded value at key; native lists and hashes come back as list and dict."""
         try:
-            serialized = json.dumps(value, default=str)
             if self._redis:
-                if ttl:
-                    self._redis.setex(self._key(key), ttl, serialized)
+                if self._near:
+                    hit, value = self._near.get(self._scoped(key))
+                    if hit:
+                        return value
+                    version = self._near.version
+                try:
+                    raw = self._redis.get(self._key(key))
+                    value = None if raw is None else decode(raw)
+                except redis.ResponseError as e:
+                    if "WRONGTYPE" not in str(e):
+                        raise
+                    value = self._get_native([key]).get(key)
+            else:
+                value = self._decode_local(self._local_entry(key))
+
+            if value is not None and self._budgeted(key):
+                self._touch(key)
+            if value is not None and self._near:
+                self._near.put(self._scoped(key), value, version)
+            return value
+        except Exception:
+            return None
+
+    @staticmethod
+    def _decode_local(entry: Optional[dict]) -> Optional[Any]:
+        if not entry:
+            return None
+        if "list" in entry:
+            return [decode(raw) for raw in entry["list"]]
+        if "hash" in entry:
+            return {field: decode(raw) for field, raw in entry["hash"].items()}
+        return decode(entry["value"])
+
+    def _get_native(self, keys: list[str]) -> dict[str, Any]:
+        """Read keys that may be Redis lists or hashes, in one round trip. Absent keys are left out."""
+        pipe = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.lrange(self._key(key), 0, -1)
+            pipe.hgetall(self._key(key))
+        results = pipe.execute(raise_on_error=False)
+        values = {}
+        for i, key in enumerate(keys):
+            items, fields = results[2 * i], results[2 * i + 1]
+            if isinstance(items, list) and items:
+                values[key] = [decode(raw) for raw in items]
+            elif isinstance(fields, dict) and fields:
+                values[key] = {field.decode(): decode(raw) for field, raw in fields.items()}
+        return values
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """
+        Fetch several keys in one round trip (pipelined MGET on Redis).
+        Returns {key: value}; missing or undecodable keys are left out.
+        """
+        keys = list(dict.fromkeys(keys))
+        values = {}
+        if self._near:
+            missing = []
+            for key in keys:
+                hit, value = self._near.get(self._scoped(key))
+                if hit:
+                    values[key] = value
                 else:
-                    self._redis.set(self._key(key), serialized)
+                    missing.append(key)
+            keys, version = missing, self._near.version
+        if not keys:
+            return values
+        try:
+            fetched = {}
+            if self._redis:
+                pipe = self._redis.pipeline(transaction=False)
+                for i in range(0, len(keys), MGET_CHUNK):
+                    pipe.mget([self._key(k) for k in keys[i:i + MGET_CHUNK]])
+                raws = [raw for chunk in pipe.execute() for raw in chunk]
+                for key, raw in zip(keys, raws):
+                    try:
+                        if raw is not None:
+                            fetched[key] = decode(raw)
+                    except Exception:
+                        continue
+                # MGET returns nil for lists and hashes too; one more round trip tells them apart
+                absent = [k for k, raw in zip(keys, raws) if raw is None]
+                if absent:
+                    fetched.update(self._get_native(absent))
             else:
-                self._local[key] = {"value": serialized, "ts": time.time()}
-            return True
+                for key in keys:
+                    try:
+                        value = self._decode_local(self._local_entry(key))
+                    except Exception:
+                        continue
+                    if value is not None:
+                        fetched[key] = value
         except Exception as e:
-            return False
+            logger.warning(f"get_many failed: {e}")
+            return values
 
-    def get(self, key: str) -> Optional[Any]:
+        if self._near:
+            for key, value in fetched.items():
+                self._near.put(self._scoped(key), value, version)
+        values.update(fetched)
+        return values
+
+    def set_many(self, mapping: dict[str, Any], ttl: int = None) -> bool:
+        """Store several keys in one pipelined round trip."""
+        if not mapping:
+            return True
         try:
+            serialized = {k: encode(v) for k, v in mapping.items()}
             if self._redis:
-                raw = self._redis.get(self._key(key))
+                pipe = self._redis.pipeline(transaction=False)
+                for key, raw in serialized.items():
+                    key_ttl = ttl or policy_ttl(key)
+                    if key_ttl:
+                        pipe.setex(self._key(key), key_ttl, raw)
+                    else:
+                        pipe.set(self._key(key), raw)
+                self._execute(pipe, list(serialized))
             else:
-                entry = self._local.get(key)
-                raw = entry["value"] if entry else None
-
-            if raw is None:
-                return None
-            return json.loads(raw)
-        except Exception:
-            return None
+                now = time.time()
+                for key, raw in serialized.items():
+                    key_ttl = ttl or policy_ttl(key)
+                    self._local[self._scoped(key)] = {"value": raw, "ts": now, "exp": now + key_ttl if key_ttl else None}
+            if self._namespace and JOB_MAX_BYTES:
+                self._account({k: len(raw) for k, raw in serialized.items()})
+            return True
+        except Exception as e:
+            logger.warning(f"set_many failed: {e}")
+            return False
 
     def delete(self, key: str) -> bool:
+        return bool(self.delete_many([key]))
+
+    def iter_keys(self, prefix: str = "", count: int = SCAN_COUNT) -> Iterator[str]:
+        """
+        Stream keys under prefix with cursor-based SCAN, so Redis is never
+        blocked the way KEYS blocks it. A key may be yielded more than once
+        if the keyspace is rehashed mid-scan.
+        """
+        scoped = self._scoped(prefix)
         if self._redis:
-            return bool(self._redis.delete(self._key(key)))
+            match = f"{_glob_escape(self._prefix + scoped)}*"
+            for key in self._redis.scan_iter(match=match, count=count):
+                yield self._unscoped(key.decode()[len(self._prefix):])
         else:
-            return bool(self._local.pop(key, None))
+            now = time.time()
+            yield from [self._unscoped(k) for k, e in list(self._local.items())
+                        if k.startswith(scoped) and not (e.get("exp") and e["exp"] <= now)]
 
     def list_keys(self, prefix: str = "") -> list[str]:
         """List all keys, optionally filtered by prefix."""
+        return list(dict.fromkeys(self.iter_keys(prefix)))
+
+    def delete_many(self, keys: Iterable[str], chunk_size: int = DELETE_CHUNK) -> int:
+        """
+        Delete keys in pipelined UNLINK batches (memory is reclaimed off the
+        Redis main thread). Accepts any iterable, e.g. iter_keys(), without
+        materializing it. Returns the number of keys removed.
+        """
+        removed = 0
+        keys = iter(keys)
+        while chunk := list(islice(keys, chunk_size)):
+            if self._redis:
+                pipe = self._redis.pipeline(transaction=False)
+                pipe.unlink(*[self._key(k) for k in chunk])
+                if self._namespace and JOB_MAX_BYTES:
+                    self._account_script(keys=[self._key(SIZES_KEY), self._key(BYTES_KEY)],
+                                         args=[a for k in chunk for a in (k, "-")], client=pipe)
+                    pipe.zrem(self._key(LRU_KEY), *chunk)
+                removed += self._execute(pipe, chunk)[0]
+            else:
+                removed += sum(1 for k in chunk if self._local.pop(self._scoped(k), None) is not None)
+        return removed
+
+    def key_count(self) -> int:
+        """Number of keys in the backing store (O(1) DBSIZE on Redis)."""
+        return self._redis.dbsize() if self._redis else len(self._local)
+
+    # ── Size accounting and job budget ────────────────────────
+
+    def _budgeted(self, key: str) -> bool:
+        return bool(self._namespace and JOB_MAX_BYTES and key.startswith(EVICTABLE_PREFIXES))
+
+    def _touch(self, key: str):
+        """Mark a regenerable artifact as recently used."""
+        if self._redis:
+            self._redis.zadd(self._key(LRU_KEY), {key: time.time()}, xx=True)
+        else:
+            entry = self._local_entry(key)
+            if entry:
+                entry["ts"] = time.time()
+
+    def _account(self, sizes: dict[str, int]):
+        """Record value sizes for this job and evict LRU artifacts once it exceeds JOB_MAX_BYTES."""
         if self._redis:
-            pattern = f"{self._prefix}{prefix}*"
-            keys = self._redis.keys(pattern)
-            return [k[len(self._prefix):] for k in keys]
+            pipe = self._redis.pipeline(transaction=False)
+            evictable = {k: time.time() for k in sizes if k.startswith(EVICTABLE_PREFIXES)}
+            if evictable:
+                pipe.zadd(self._key(LRU_KEY), evictable)
+            # Size changes and the running total in one atomic step: O(keys written), not O(keys in the job)
+            self._account_script(keys=[self._key(SIZES_KEY), self._key(BYTES_KEY)],
+                                 args=[a for k, size in sizes.items() for a in (k, size)], client=pipe)
+            total = int(pipe.execute()[-1])
         else:
-            return [k for k in self._local.keys() if k.startswith(prefix)]
+            now = time.time()
+            entries = [(k, e) for k, e in list(self._local.items())
+                       if k.startswith(self._namespace) and not (e.get("exp") and e["exp"] <= now)]
+            total = sum(_entry_size(e) for _, e in entries)
+        if total > JOB_MAX_BYTES:
+            self._evict(total - JOB_MAX_BYTES)
+
+    def _evict(self, excess: int):
+        if self._redis:
+            names = [n.decode() for n in self._redis.zrange(self._key(LRU_KEY), 0, -1)]
+            sizes = self._redis.hmget(self._key(SIZES_KEY), names) if names else []
+            candidates = [(n, int(size or 0)) for n, size in zip(names, sizes)]
+        else:
+            entries = sorted((e["ts"], self._unscoped(k), _entry_size(e)) for k, e in list(self._local.items())
+                             if k.startswith(self._namespace) and self._unscoped(k).startswith(EVICTABLE_PREFIXES))
+            candidates = [(name, size) for _, name, size in entries]
+
+        victims, freed = [], 0
+        for name, size in candidates:
+            if freed >= excess:
+                break
+            victims.append(name)
+            freed += size
+        if victims:
+            self.delete_many(victims)
+            logger.warning(f"[MEMORY] Job {self.job_id} over its {JOB_MAX_BYTES} byte budget: "
+                           f"evicted {len(victims)} artifacts ({freed} bytes)")
+
+    def stats(self, top: int = 10) -> dict:
+        """
+        Size accounting by key class and by job (Redis MEMORY USAGE, or the
+        encoded size locally). Walks the keyspace with SCAN, so it is meant
+        for the /memory/stats endpoint rather than hot paths.
+        """
+        classes: dict[str, dict] = {}
+        jobs: dict[str, dict] = {}
+        largest: list[tuple[int, str]] = []
+        keys = self.iter_keys()
+        while chunk := list(islice(keys, DELETE_CHUNK)):
+            if self._redis:
+                pipe = self._redis.pipeline(transaction=False)
+                for key in chunk:
+                    pipe.memory_usage(self._key(key))
+                    pipe.ttl(self._key(key))
+                results = pipe.execute(raise_on_error=False)
+                rows = [(k, results[2 * i], results[2 * i + 1]) for i, k in enumerate(chunk)]
+            else:
+                rows = []
+                for key in chunk:
+                    entry = self._local_entry(key)
+                    if entry:
+                        rows.append((key, _entry_size(entry), 1 if entry.get("exp") else -1))
+            for key, size, ttl in rows:
+                size = size if isinstance(size, int) else 0
+                stored = self._scoped(key)
+                job, rest = (stored.split(":", 2)[1:] if stored.startswith("job:") and stored.count(":") >= 2
+                             else (None, stored))
+                cls = classes.setdefault(key_class(rest), {"keys": 0, "bytes": 0, "with_ttl": 0})
+                cls["keys"] += 1
+                cls["bytes"] += size
+                cls["with_ttl"] += 1 if isinstance(ttl, int) and ttl >= 0 else 0
+                if job:
+                    totals = jobs.setdefault(job, {"keys": 0, "bytes": 0})
+                    totals["keys"] += 1
+                    totals["bytes"] += size
+                largest.append((size, stored))
+            largest = sorted(largest, reverse=True)[:top]
+
+        return {
+            "backend": self.backend,
+            "keys": sum(c["keys"] for c in classes.values()),
+            "bytes": sum(c["bytes"] for c in classes.values()),
+            "classes": dict(sorted(classes.items(), key=lambda c: c[1]["bytes"], reverse=True)),
+            "jobs": jobs,
+            "largest": [{"key": k, "bytes": b} for b, k in largest],
+            "ttl_policy": dict(TTL_POLICY),
+            "job_max_bytes": JOB_MAX_BYTES or None,
+            "near_cache": self.near_cache_stats(),
+        }
+
+    # ── Native lists and hashes ───────────────────────────────
+
+    def _write_native(self, key: str, kind: str, queue) -> list:
+        """
+        Run queue(pipe, redis_key) against a native list/hash at key. A value
+        written earlier with set() is converted in place first, once.
+        """
+        for attempt in range(2):
+            pipe = self._redis.pipeline(transaction=False)
+            queue(pipe, self._key(key))
+            if policy_ttl(key):
+                pipe.expire(self._key(key), policy_ttl(key))
+            try:
+                return self._execute(pipe, [key])
+            except redis.ResponseError as e:
+                if "WRONGTYPE" not in str(e) or attempt:
+                    raise
+                self._convert_legacy(key, kind)
+
+    def _convert_legacy(self, key: str, kind: str):
+        """Rewrite a JSON string value as a native list or hash, atomically (WATCH/MULTI)."""
+        redis_key = self._key(key)
+        with self._redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(redis_key)
+                    if pipe.type(redis_key) != b"string":
+                        return
+                    value = decode(pipe.get(redis_key))
+                    pipe.multi()
+                    pipe.delete(redis_key)
+                    if kind == "list":
+                        items = value if isinstance(value, list) else [value]
+                        if items:
+                            pipe.rpush(redis_key, *[encode(i) for i in items])
+                    elif isinstance(value, dict) and value:
+                        pipe.hset(redis_key, mapping={f: encode(v) for f, v in value.items()})
+                    pipe.execute()
+                    return
+                except redis.WatchError:
+                    continue
+
+    def _local_native(self, key: str, kind: str):
+        """Local-backend list/hash at key, converting a set() value. Caller holds _local_lock."""
+        entry = self._local_entry(key)
+        if entry is None or kind not in entry:
+            value = self._decode_local(entry) if entry and "value" in entry else None
+            if kind == "list":
+                items = [] if value is None else value if isinstance(value, list) else [value]
+                entry = {"list": [encode(i) for i in items]}
+            else:
+                fields = value if isinstance(value, dict) else {}
+                entry = {"hash": {f: encode(v) for f, v in fields.items()}}
+            self._local[self._scoped(key)] = entry
+        entry["ts"] = time.time()
+        if policy_ttl(key):
+            entry["exp"] = entry["ts"] + policy_ttl(key)
+        return entry[kind]
 
     def append_to_list(self, key: str, item: Any) -> int:
-        """Append an item to a list stored at key."""
-        current = self.get(key) or []
-        if not isinstance(current, list):
-            current = [current]
-        current.append(item)
-        self.set(key, current)
-        return len(current)
+        """Append an item to a list stored at key (O(1) RPUSH). Returns the new length."""
+        serialized = encode(item)
+        if self._redis:
+            return self._write_native(key, "list", lambda pipe, k: pipe.rpush(k, serialized))[0]
+        with self._local_lock:
+            items = self._local_native(key, "list")
+            items.append(serialized)
+            return len(items)
+
+    def get_list(self, key: str) -> list:
+        value = self.get(key)
+        return value if isinstance(value, list) else []
+
+    def set_fields(self, key: str, fields: dict):
+        """Set fields of the dict stored at key (HSET) without reading it back."""
+        if not fields:
+            return
+        serialized = {str(f): encode(v) for f, v in fields.items()}
+        if self._redis:
+            self._write_native(key, "hash", lambda pipe, k: pipe.hset(k, mapping=serialized))
+            return
+        with self._local_lock:
+            self._local_native(key, "hash").update(serialized)
+
+    def delete_fields(self, key: str, fields: Iterable[str]):
+        """Remove fields from the dict stored at key (HDEL)."""
+        fields = [str(f) for f in dict.fromkeys(fields)]
+        if not fields:
+            return
+        if self._redis:
+            self._write_native(key, "hash", lambda pipe, k: pipe.hdel(k, *fields))
+            return
+        with self._local_lock:
+            stored = self._local_native(key, "hash")
+            for f in fields:
+                stored.pop(f, None)
+
+    def get_dict(self, key: str) -> dict:
+        value = self.get(key)
+        return value if isinstance(value, dict) else {}
+
+    def get_fields(self, key: str, fields: Iterable[str]) -> dict[str, Any]:
+        """Only the named fields of the dict at key (HMGET); absent fields are left out."""
+        fields = [str(f) for f in dict.fromkeys(fields)]
+        if not fields:
+            return {}
+        try:
+            if self._redis:
+                try:
+                    raws = self._redis.hmget(self._key(key), fields)
+                except redis.ResponseError as e:
+                    if "WRONGTYPE" not in str(e):
+                        raise
+                    whole = self.get_dict(key)  # still a set() value
+                    return {f: whole[f] for f in fields if f in whole}
+            else:
+                entry = self._local_entry(key) or {}
+                if "hash" not in entry:
+                    whole = self._decode_local(entry) if entry else None
+                    whole = whole if isinstance(whole, dict) else {}
+                    return {f: whole[f] for f in fields if f in whole}
+                raws = [entry["hash"].get(f) for f in fields]
+            return {f: decode(raw) for f, raw in zip(fields, raws) if raw is not None}
+        except Exception as e:
+            logger.warning(f"get_fields failed: {e}")
+            return {}
+
+    def get_field(self, key: str, field: str) -> Optional[Any]:
+        return self.get_fields(key, [field]).get(str(field))
+
+    def exists(self, key: str) -> bool:
+        if self._redis:
+            return bool(self._redis.exists(self._key(key)))
+        return self._local_entry(key) is not None
+
+    def replace_dicts(self, dicts: dict[str, dict]):
+        """Atomically replace whole dicts (DEL + HSET per key in one MULTI)."""
+        if not dicts:
+            return
+        serialized = {key: {str(f): encode(v) for f, v in fields.items()} for key, fields in dicts.items()}
+        if self._redis:
+            pipe = self._redis.pipeline(transaction=True)
+            for key, fields in serialized.items():
+                pipe.delete(self._key(key))
+                if fields:
+                    pipe.hset(self._key(key), mapping=fields)
+            self._execute(pipe, list(serialized))
+            return
+        with self._local_lock:
+            now = time.time()
+            for key, fields in serialized.items():
+                self._local[self._scoped(key)] = {"hash": fields, "ts": now}
 
     def get_or_default(self, key: str, default: Any) -> Any:
         val = self.get(key)
         return val if val is not None else default
 
     def update_dict(self, key: str, updates: dict) -> dict:
-        """Merge updates into an existing dict at key."""
-        current = self.get(key) or {}
-        current.update(updates)
-        self.set(key, current)
-        return current
+        """Merge updates into the dict at key, field by field on the server."""
+        self.set_fields(key, updates)
+        return self.get_dict(key)
 
     # ── Convenience helpers ───────────────────────────────────
 
@@ -124,32 +810,39 @@ class MemoryStore:
     def list_components(self) -> list[str]:
         return [k.replace("components/", "", 1) for k in self.list_keys("components/")]
 
+    def get_components(self, names: Iterable[str] = None) -> dict[str, dict]:
+        """Component docs by name in one round trip (all of them when names is None)."""
+        names = self.list_components() if names is None else names
+        docs = self.get_many(f"components/{n}" for n in names)
+        return {k.replace("components/", "", 1): v for k, v in docs.items()}
+
+    def set_components(self, docs: dict[str, dict]):
+        self.set_many({f"components/{name}": doc for name, doc in docs.items()})
+
     def get_build_plan(self) -> Optional[dict]:
-        return self.get("build_plan")
+        values = self.get_many(["build_plan", "build_plan:status"])
+        return self._overlay_task_status(values.get("build_plan"), values.get("build_plan:status"))
+
+    @staticmethod
+    def _overlay_task_status(plan: Optional[dict], statuses: Optional[dict]) -> Optional[dict]:
+        if not isinstance(statuses, dict) or not statuses or not isinstance(plan, dict) \
+                or not isinstance(plan.get("tasks"), list):
+            return plan
+        # Overlay per-task status updates; copy rather than touch a possibly cached plan
+        return {**plan, "tasks": [
+            {**task, **statuses[str(task.get("id"))]}
+            if isinstance(task, dict) and str(task.get("id")) in statuses else task
+            for task in plan["tasks"]
+        ]}
 
     def set_build_plan(self, plan: dict):
         self.set("build_plan", plan)
+        # The plan written already carries every status it was read with
+        self.delete("build_plan:status")
 
     def update_task_status(self, task_id: int, status: str, detail: str = ""):
-        plan = self.get_build_plan()
-        
-        # Ensure plan is a dict
-        if not isinstance(plan, dict):
-            logger.warning(f"build_plan is not a dict: {type(plan)}, recreating")
-            plan = {"tasks": []}
-        
-        tasks = plan.get("tasks", [])
-        if not isinstance(tasks, list):
-            tasks = []
-            
-        for task in tasks:
-            if isinstance(task, dict) and task.get("id") == task_id:
-                task["status"] = status
-                task["detail"] = detail
-                break
-        
-        plan["tasks"] = tasks
-        self.set_build_plan(plan)
+        """Record one task's status in a hash beside the plan, so parallel updates never clobber each other."""
+        self.set_fields("build_plan:status", {str(task_id): {"status": status, "detail": detail}})
 
     def get_test_report(self) -> Optional[dict]:
         return self.get("test_report")
@@ -163,19 +856,26 @@ class MemoryStore:
     def set_qa_report(self, report: dict):
         self.set("qa_report", report)
 
-    def clear_job(self, job_id: str = None):
-        """Clear memory for a specific job, or all if no job_id provided."""
+    def clear_job(self, job_id: str = None) -> int:
+        """
+        Drop one job's namespace (this view's job when job_id is omitted),
+        or all memory when neither is given. Shared keys survive a job drop.
+        """
+        job_id = job_id or self.job_id
+        store = self.for_job(job_id) if job_id else self._global()
+        removed = store.delete_many(store.iter_keys())
         if job_id:
-            # Only clear keys related to this job
-            prefix = f"job_{job_id}"
-            keys = self.list_keys(prefix)
-            for key in keys:
-                self.delete(key)
-        else:
-            # Clear all memory
-            keys = self.list_keys()
-            for key in keys:
-                self.delete(key)
+            # Keys from before job namespaces existed
+            legacy = self._global()
+            removed += legacy.delete_many(legacy.iter_keys(f"job_{job_id}"))
+        return removed
+
+    def _global(self) -> "MemoryStore":
+        if not self._namespace:
+            return self
+        view = copy.copy(self)
+        view.job_id, view._namespace = None, ""
+        return view
 
     # ── v2: Capability Envelopes (ProbeAgent) ───────────────────
 
@@ -191,6 +891,16 @@ class MemoryStore:
         """List all available capability envelopes."""
         return [k.replace("capability_envelopes/", "", 1) for k in self.list_keys("capability_envelopes/")]
 
+    def get_capability_envelopes(self, components: Iterable[str] = None) -> dict[str, dict]:
+        """Capability envelopes by component in one round trip (all of them when components is None)."""
+        components = self.list_capability_envelopes() if components is None else components
+        envelopes = self.get_many(f"capability_envelopes/{c}" for c in components)
+        return {k.replace("capability_envelopes/", "", 1): v for k, v in envelopes.items()}
+
+    def set_capability_envelopes(self, envelopes: dict[str, dict]):
+        """Store several capability envelopes in one pipelined round trip."""
+        self.set_many({f"capability_envelopes/{c}": env for c, env in envelopes.items()})
+
     # ── v2: Mapping Manifest (MappingAgent) ────────────────────
 
     def get_mapping_manifest(self) -> Optional[dict]:
@@ -198,11 +908,44 @@ class MemoryStore:
         return self.get("mapping_manifest")
 
     def set_mapping_manifest(self, manifest: dict):
-        """Store mapping manifest with confidence scores."""
+        """
+        Store mapping manifest with confidence scores, plus hash indexes so
+        single lookups never load the whole manifest:
+          mapping_manifest:elements      {element_id: mapping}
+          mapping_manifest:by_page       {path: [element_id, ...]}
+          mapping_manifest:by_component  {drupal_component: [element_id, ...]}
+        """
         self.set("mapping_manifest", manifest)
+        elements, by_page, by_component = {}, {}, {}
+        mappings = manifest.get("mappings", []) if isinstance(manifest, dict) else []
+        for m in mappings:
+            if not isinstance(m, dict) or not m.get("element_id"):
+                continue
+            element_id = str(m["element_id"])
+            # The first mapping of an element wins, as with the old linear scan
+            elements.setdefault(element_id, m)
+            if m.get("path"):
+                # Sections folded into a consolidated page are looked up by that page too
+                page_ids = by_page.setdefault(str(m["path"]), [])
+                for i in [element_id] + [f"section_{index}" for index in m.get("sections_included") or []]:
+                    if i not in page_ids:
+                        page_ids.append(i)
+            if m.get("drupal_component"):
+                component_ids = by_component.setdefault(str(m["drupal_component"]), [])
+                if element_id not in component_ids:
+                    component_ids.append(element_id)
+        self.replace_dicts({
+            MANIFEST_ELEMENTS: elements,
+            MANIFEST_BY_PAGE: by_page,
+            MANIFEST_BY_COMPONENT: by_component,
+        })
 
     def get_mapping_for_element(self, element_id: str) -> Optional[dict]:
-        """Get mapping for a specific source element."""
+        """Get mapping for a specific source element (one HGET)."""
+        mapping = self.get_field(MANIFEST_ELEMENTS, element_id)
+        if mapping is not None or self.exists(MANIFEST_ELEMENTS):
+            return mapping
+        # Manifest stored before the index existed
         manifest = self.get_mapping_manifest()
         if manifest and "mappings" in manifest:
             for m in manifest["mappings"]:
@@ -210,30 +953,51 @@ class MemoryStore:
                     return m
         return None
 
+    def get_mappings_for_elements(self, element_ids: Iterable[str]) -> dict[str, dict]:
+        """Mappings of several elements in one HMGET."""
+        return self.get_fields(MANIFEST_ELEMENTS, element_ids)
+
+    def get_mappings_for_page(self, path: str) -> list[dict]:
+        """Mappings of a page and the sections consolidated into it."""
+        ids = self.get_field(MANIFEST_BY_PAGE, path) or []
+        found = self.get_mappings_for_elements(ids)
+        return [found[i] for i in ids if i in found]
+
+    def get_mappings_for_component(self, component: str) -> list[dict]:
+        """Mappings that target one Drupal component."""
+        ids = self.get_field(MANIFEST_BY_COMPONENT, component) or []
+        found = self.get_mappings_for_elements(ids)
+        return [found[i] for i in ids if i in found]
+
     # ── v2: Gap Report (QAAgent) ─────────────────────────────────
 
     def get_gap_report(self) -> Optional[dict]:
-        """Get the current gap report."""
-        return self.get("gap_report")
+        """Get the current gap report, including items added since it was last stored."""
+        values = self.get_many(["gap_report", "gap_report:items"])
+        report, added = values.get("gap_report"), values.get("gap_report:items")
+        if not added:
+            return report
+        report = dict(report) if isinstance(report, dict) else {"items": [], "total_fidelity": 0}
+        report["items"] = list(report.get("items") or []) + added
+        # Recalculate average fidelity
+        scores = [i.get("fidelity_score", 0) for i in report["items"] if isinstance(i, dict)]
+        if scores:
+            report["total_fidelity"] = sum(scores) / len(scores)
+        return report
 
     def set_gap_report(self, report: dict):
         """Store gap report with compromises and screenshots."""
         self.set("gap_report", report)
+        self.delete("gap_report:items")
 
     def add_gap_item(self, element: str, component: str, fidelity: float, compromise: str):
-        """Add an item to the gap report."""
-        report = self.get_gap_report() or {"items": [], "total_fidelity": 0}
-        report["items"].append({
+        """Add an item to the gap report (RPUSH; the fidelity average is computed on read)."""
+        self.append_to_list("gap_report:items", {
             "element": element,
             "component_used": component,
             "fidelity_score": fidelity,
             "compromise": compromise,
         })
-        # Recalculate average fidelity
-        if report["items"]:
-            scores = [i["fidelity_score"] for i in report["items"]]
-            report["total_fidelity"] = sum(scores) / len(scores)
-        self.set_gap_report(report)
 
     # ── v2: Global Knowledge Base (Cross-Migration Learning) ──
 
@@ -287,17 +1051,15 @@ class MemoryStore:
 
     def get_review_decisions(self) -> dict:
         """Get human review decisions for gap report items."""
-        return self.get("review_decisions") or {}
+        return self.get_dict("review_decisions")
 
     def set_review_decision(self, item_id: str, decision: str, detail: str = ""):
         """Store a review decision (accept/request_alternative/exclude/manual)."""
-        decisions = self.get_review_decisions()
-        decisions[item_id] = {
+        self.set_fields("review_decisions", {item_id: {
             "decision": decision,
             "detail": detail,
             "timestamp": time.time(),
-        }
-        self.set("review_decisions", decisions)
+        }})
 
     def all_review_items_decided(self) -> bool:
         """Check if all gap report items have been reviewed."""
@@ -308,5 +1070,241 @@ class MemoryStore:
         return len(decisions) >= len(report["items"])
 
 
+class AsyncMemoryStore:
+    """
+    asyncio counterpart of MemoryStore for coroutines: the orchestrator and
+    the API routes. Same keys, scoping, codec and near cache as the store it
+    wraps, but I/O goes through redis.asyncio with a pooled client per event
+    loop. With the local backend it simply calls the in-process store.
+    Thread-pooled agent code keeps using the sync API.
+    """
+
+    def __init__(self, store: MemoryStore):
+        self._store = store
+
+    @property
+    def _redis(self):
+        store = self._store
+        if not store._redis:
+            return None
+        loop = asyncio.get_running_loop()
+        client = store._aio_clients.get(loop)
+        if client is None:
+            client = aioredis.from_url(store._redis_url, decode_responses=False,
+                                       max_connections=ASYNC_MAX_CONNECTIONS)
+            store._aio_clients[loop] = client
+        return client
+
+    async def _execute(self, pipe, keys: Optional[list[str]]) -> list:
+        store = self._store
+        if not store._near:
+            return await pipe.execute()
+        keys = None if keys is None else [store._scoped(k) for k in keys]
+        pipe.publish(INVALIDATION_CHANNEL, json.dumps(keys))
+        try:
+            return await pipe.execute()
+        finally:
+            store._near.invalidate(keys)
+
+    async def get(self, key: str) -> Optional[Any]:
+        client = self._redis
+        if client is None:
+            return self._store.get(key)
+        store = self._store
+        try:
+            if store._near:
+                hit, value = store._near.get(store._scoped(key))
+                if hit:
+                    return value
+                version = store._near.version
+            try:
+                raw = await client.get(store._key(key))
+                value = None if raw is None else decode(raw)
+            except redis.ResponseError as e:
+                if "WRONGTYPE" not in str(e):
+                    raise
+                value = (await self._get_native([key])).get(key)
+            if value is not None and store._near:
+                store._near.put(store._scoped(key), value, version)
+            return value
+        except Exception:
+            return None
+
+    async def _get_native(self, keys: list[str]) -> dict[str, Any]:
+        store = self._store
+        pipe = self._redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.lrange(store._key(key), 0, -1)
+            pipe.hgetall(store._key(key))
+        results = await pipe.execute(raise_on_error=False)
+        values = {}
+        for i, key in enumerate(keys):
+            items, fields = results[2 * i], results[2 * i + 1]
+            if isinstance(items, list) and items:
+                values[key] = [decode(raw) for raw in items]
+            elif isinstance(fields, dict) and fields:
+                values[key] = {field.decode(): decode(raw) for field, raw in fields.items()}
+        return values
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        client = self._redis
+        if client is None:
+            return self._store.get_many(keys)
+        store = self._store
+        keys = list(dict.fromkeys(keys))
+        values = {}
+        if store._near:
+            missing = []
+            for key in keys:
+                hit, value = store._near.get(store._scoped(key))
+                if hit:
+                    values[key] = value
+                else:
+                    missing.append(key)
+            keys, version = missing, store._near.version
+        if not keys:
+            return values
+        try:
+            pipe = client.pipeline(transaction=False)
+            for i in range(0, len(keys), MGET_CHUNK):
+                pipe.mget([store._key(k) for k in keys[i:i + MGET_CHUNK]])
+            raws = [raw for chunk in await pipe.execute() for raw in chunk]
+            fetched = {}
+            for key, raw in zip(keys, raws):
+                try:
+                    if raw is not None:
+                        fetched[key] = decode(raw)
+                except Exception:
+                    continue
+            absent = [k for k, raw in zip(keys, raws) if raw is None]
+            if absent:
+                fetched.update(await self._get_native(absent))
+        except Exception as e:
+            logger.warning(f"get_many failed: {e}")
+            return values
+        if store._near:
+            for key, value in fetched.items():
+                store._near.put(store._scoped(key), value, version)
+        values.update(fetched)
+        return values
+
+    async def set(self, key: str, value: Any, ttl: int = None) -> bool:
+        return await self.set_many({key: value}, ttl)
+
+    async def set_many(self, mapping: dict[str, Any], ttl: int = None) -> bool:
+        client = self._redis
+        if client is None:
+            return self._store.set_many(mapping, ttl)
+        store = self._store
+        try:
+            serialized = {k: encode(v) for k, v in mapping.items()}
+            pipe = client.pipeline(transaction=False)
+            for key, raw in serialized.items():
+                key_ttl = ttl or policy_ttl(key)
+                if key_ttl:
+                    pipe.setex(store._key(key), key_ttl, raw)
+                else:
+                    pipe.set(store._key(key), raw)
+            await self._execute(pipe, list(serialized))
+            if store._namespace and JOB_MAX_BYTES:
+                await asyncio.to_thread(store._account, {k: len(raw) for k, raw in serialized.items()})
+            return True
+        except Exception as e:
+            logger.warning(f"set_many failed: {e}")
+            return False
+
+    async def delete(self, key: str) -> bool:
+        client = self._redis
+        if client is None:
+            return self._store.delete(key)
+        pipe = client.pipeline(transaction=False)
+        pipe.delete(self._store._key(key))
+        return bool((await self._execute(pipe, [key]))[0])
+
+    async def iter_keys(self, prefix: str = "", count: int = SCAN_COUNT):
+        client = self._redis
+        if client is None:
+            for key in self._store.iter_keys(prefix):
+                yield key
+            return
+        store = self._store
+        match = f"{_glob_escape(store._prefix + store._scoped(prefix))}*"
+        async for key in client.scan_iter(match=match, count=count):
+            yield store._unscoped(key.decode()[len(store._prefix):])
+
+    async def key_count(self) -> int:
+        client = self._redis
+        return await client.dbsize() if client is not None else self._store.key_count()
+
+    async def set_fields(self, key: str, fields: dict):
+        """HSET fields of the dict at key; values written with set() are converted by the sync path."""
+        client = self._redis
+        if client is None or not fields:
+            return self._store.set_fields(key, fields)
+        serialized = {str(f): encode(v) for f, v in fields.items()}
+        pipe = client.pipeline(transaction=False)
+        pipe.hset(self._store._key(key), mapping=serialized)
+        try:
+            await self._execute(pipe, [key])
+        except redis.ResponseError as e:
+            if "WRONGTYPE" not in str(e):
+                raise
+            await asyncio.to_thread(self._store.set_fields, key, fields)
+
+    async def get_fields(self, key: str, fields: Iterable[str]) -> dict[str, Any]:
+        """Only the named fields of the dict at key (HMGET); absent fields are left out."""
+        client = self._redis
+        if client is None:
+            return self._store.get_fields(key, fields)
+        fields = [str(f) for f in dict.fromkeys(fields)]
+        if not fields:
+            return {}
+        try:
+            try:
+                raws = await client.hmget(self._store._key(key), fields)
+            except redis.ResponseError as e:
+                if "WRONGTYPE" not in str(e):
+                    raise
+                return await asyncio.to_thread(self._store.get_fields, key, fields)
+            return {f: decode(raw) for f, raw in zip(fields, raws) if raw is not None}
+        except Exception as e:
+            logger.warning(f"get_fields failed: {e}")
+            return {}
+
+    async def get_dict(self, key: str) -> dict:
+        value = await self.get(key)
+        return value if isinstance(value, dict) else {}
+
+    async def get_or_default(self, key: str, default: Any) -> Any:
+        val = await self.get(key)
+        return val if val is not None else default
+
+    # ── Convenience helpers used on async paths ─────────────────
+
+    async def get_blueprint(self) -> Optional[dict]:
+        return await self.get("site_blueprint")
+
+    async def get_mapping_manifest(self) -> Optional[dict]:
+        return await self.get("mapping_manifest")
+
+    async def list_components(self) -> list[str]:
+        return list(dict.fromkeys([k.replace("components/", "", 1) async for k in self.iter_keys("components/")]))
+
+    async def get_build_plan(self) -> Optional[dict]:
+        values = await self.get_many(["build_plan", "build_plan:status"])
+        return MemoryStore._overlay_task_status(values.get("build_plan"), values.get("build_plan:status"))
+
+    async def set_build_plan(self, plan: dict):
+        await self.set("build_plan", plan)
+        await self.delete("build_plan:status")
+
+    async def update_task_status(self, task_id: int, status: str, detail: str = ""):
+        await self.set_fields("build_plan:status", {str(task_id): {"status": status, "detail": detail}})
+
+    async def clear_job(self, job_id: str = None) -> int:
+        # Bounded by SCAN + pipelined UNLINK batches; run off the loop
+        return await asyncio.to_thread(self._store.clear_job, job_id)
+
+
 # Singleton instance shared across agents in the same process
 memory = MemoryStore()
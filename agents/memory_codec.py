@@ -0,0 +1,113 @@
+"""
+DrupalMind — Memory value codec
+Encodes MemoryStore values as JSON (orjson when installed) or msgpack, and
+compresses them with zstd (zlib when zstandard is missing) above a size
+threshold. Binary values start with a short header; anything without it is
+plain JSON text, which is what older versions wrote, so existing Redis data
+stays readable. Small JSON values are still written as plain text.
+
+MEMORY_CODEC=json | msgpack, MEMORY_COMPRESSION=auto | zstd | zlib | none,
+MEMORY_COMPRESS_MIN_BYTES=<threshold>.
+"""
+import os
+import json
+import zlib
+import threading
+from typing import Any, Union
+
+import codec
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+MEMORY_CODEC = os.getenv("MEMORY_CODEC", "json").lower()
+MEMORY_COMPRESSION = os.getenv("MEMORY_COMPRESSION", "auto").lower()
+COMPRESS_MIN_BYTES = int(os.getenv("MEMORY_COMPRESS_MIN_BYTES", "4096"))
+ZSTD_LEVEL = int(os.getenv("MEMORY_ZSTD_LEVEL", "3"))
+
+if MEMORY_CODEC == "msgpack" and not MSGPACK_AVAILABLE:
+    raise ImportError("MEMORY_CODEC=msgpack but msgpack is not installed")
+if MEMORY_COMPRESSION == "zstd" and not ZSTD_AVAILABLE:
+    raise ImportError("MEMORY_COMPRESSION=zstd but zstandard is not installed")
+
+# Header: MAGIC + format byte + compression byte. 0xff never starts UTF-8 JSON text.
+MAGIC = b"\xffDM"
+HEADER_SIZE = len(MAGIC) + 2
+FORMAT_JSON, FORMAT_MSGPACK = b"j", b"m"
+COMPRESS_NONE, COMPRESS_ZLIB, COMPRESS_ZSTD = b"-", b"z", b"s"
+
+FORMAT = FORMAT_MSGPACK if MEMORY_CODEC == "msgpack" else FORMAT_JSON
+if MEMORY_COMPRESSION == "none":
+    COMPRESSION = COMPRESS_NONE
+elif MEMORY_COMPRESSION == "zlib" or (MEMORY_COMPRESSION == "auto" and not ZSTD_AVAILABLE):
+    COMPRESSION = COMPRESS_ZLIB
+else:
+    COMPRESSION = COMPRESS_ZSTD
+
+# zstandard (de)compressor objects are not thread-safe; keep one pair per thread
+_zstd = threading.local()
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    if not hasattr(_zstd, "c"):
+        _zstd.c = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return _zstd.c.compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    if not ZSTD_AVAILABLE:
+        raise ValueError("value is zstd-compressed but zstandard is not installed")
+    if not hasattr(_zstd, "d"):
+        _zstd.d = zstandard.ZstdDecompressor()
+    return _zstd.d.decompress(data)
+
+
+def _serialize(value: Any) -> bytes:
+    if FORMAT == FORMAT_MSGPACK:
+        return msgpack.packb(value, default=str, use_bin_type=True)
+    return codec.dumps(value)
+
+
+def encode(value: Any) -> bytes:
+    """Serialize a value for storage, compressing it when that pays off."""
+    body = _serialize(value)
+    compression = COMPRESS_NONE
+    if COMPRESSION != COMPRESS_NONE and len(body) >= COMPRESS_MIN_BYTES:
+        packed = _zstd_compress(body) if COMPRESSION == COMPRESS_ZSTD else zlib.compress(body, 6)
+        if len(packed) < len(body):
+            body, compression = packed, COMPRESSION
+    if FORMAT == FORMAT_JSON and compression == COMPRESS_NONE:
+        return body
+    return MAGIC + FORMAT + compression + body
+
+
+def decode(raw: Union[bytes, str]) -> Any:
+    """Inverse of encode; plain JSON (str or bytes) is accepted as well."""
+    if isinstance(raw, str):
+        return json.loads(raw)
+    if not raw.startswith(MAGIC):
+        return codec.loads(raw)
+    fmt, compression = raw[3:4], raw[4:5]
+    body = memoryview(raw)[HEADER_SIZE:]
+    if compression == COMPRESS_ZSTD:
+        body = _zstd_decompress(body)
+    elif compression == COMPRESS_ZLIB:
+        body = zlib.decompress(body)
+    elif compression != COMPRESS_NONE:
+        raise ValueError(f"unknown memory compression {compression!r}")
+    if fmt == FORMAT_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("value is msgpack-encoded but msgpack is not installed")
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    if fmt == FORMAT_JSON:
+        return codec.loads(body)
+    raise ValueError(f"unknown memory format {fmt!r}")
@@ -22,7 +22,9 @@ from agents import ThemeAgent, ContentAgent, TestAgent, QAAgent
 from probe_agent import ProbeAgent
 from mapping_agent import MappingAgent
 from visual_diff_agent import VisualDiffAgent
-from drupal_client import DrupalClient
+from drupal_client import DrupalClient, AsyncDrupalClient
+from drupal_metrics import DrupalMetrics, DRUPAL_METRICS_ENABLED
+import llm_usage
 
 # Configure logging for OrchestratorAgent
 logger = logging.getLogger("drupalmind.orchestrator")
@@ -46,6 +48,8 @@ class MigrationReport:
     warnings: List[str] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
     artifacts: Dict[str, Any] = field(default_factory=dict)
+    drupal_metrics: Dict[str, Any] = field(default_factory=dict)
+    llm_usage: Dict[str, Any] = field(default_factory=dict)
     start_time: datetime = field(default_factory=datetime.now)
     end_time: Optional[datetime] = None
     
@@ -86,6 +90,8 @@ class MigrationReport:
             "warnings": self.warnings,
             "errors": self.errors,
             "artifacts": self.artifacts,
+            "drupal_metrics": self.drupal_metrics,
+            "llm_usage": self.llm_usage,
             "duration_seconds": (self.end_time - self.start_time).total_seconds() if self.end_time else None,
         }
 
@@ -109,6 +115,7 @@ class OrchestratorAgent:
     def __init__(self, broadcast_cb: Callable = None):
         self._broadcast = broadcast_cb
         self.job_id: Optional[str] = None
+        self.memory = memory
 
         # Instantiate all agents
         self.prober     = ProbeAgent()
@@ -123,9 +130,75 @@ class OrchestratorAgent:
         self.visualdiff = VisualDiffAgent()
 
         # Wire up log callbacks
-        for agent in [self.prober, self.analyzer, self.trainer, self.mapper,
-                      self.builder, self.themer, self.content, self.tester, self.qa]:
+        self._agents = [self.prober, self.analyzer, self.trainer, self.mapper,
+                        self.builder, self.themer, self.content, self.tester, self.qa]
+        for agent in self._agents:
             agent.set_log_callback(self._relay_log)
+        self._agents_by_key = {agent.agent_key: agent for agent in self._agents}
+        # Every agent that talks to Drupal, VisualDiffAgent included
+        self._all_agents = self._agents + [self.visualdiff]
+        self.usage: Optional[llm_usage.UsageTracker] = None
+        self.async_drupal: Optional[AsyncDrupalClient] = None
+
+    # ── Job-scoped memory ────────────────────────────────────
+
+    async def _scope_memory(self):
+        """Give this job, and every agent, a fresh memory namespace of its own."""
+        self.memory = memory.for_job(self.job_id)
+        await self.memory.aio.clear_job()
+        for agent in self._all_agents:
+            agent.memory = self.memory
+
+    # ── Shared async Drupal client ───────────────────────────
+
+    def _open_drupal_client(self):
+        """One pooled AsyncDrupalClient for the whole job, shared by every agent."""
+        self.async_drupal = AsyncDrupalClient()
+        for agent in self._all_agents:
+            agent.use_async_drupal(self.async_drupal)
+
+    async def _close_drupal_client(self):
+        if self.async_drupal is not None:
+            await self.async_drupal.aclose()
+            self.async_drupal = None
+
+    # ── Drupal request metrics ───────────────────────────────
+
+    def _attach_drupal_metrics(self):
+        """Fresh per-agent DrupalMetrics for this job (DRUPAL_METRICS=true only)."""
+        for agent in self._all_agents:
+            agent.attach_drupal_metrics(DrupalMetrics() if DRUPAL_METRICS_ENABLED else None)
+
+    async def _collect_drupal_metrics(self, report: MigrationReport):
+        """Emit each agent's metrics and snapshot them into the report, keyed by agent."""
+        for agent in self._all_agents:
+            if agent.drupal.metrics is None:
+                continue
+            try:
+                await agent.log_drupal_metrics()
+            except Exception as e:
+                logger.warning(f"Failed to emit Drupal metrics for {agent.agent_key}: {e}")
+            report.drupal_metrics[agent.agent_key] = agent.drupal.metrics.snapshot()
+
+    # ── LLM usage ────────────────────────────────────────────
+
+    def _start_usage_tracking(self):
+        """Charge every LLM call made from this job's task (and its threads) to a fresh tracker."""
+        self.usage = llm_usage.UsageTracker(self.job_id)
+        llm_usage.current_tracker.set(self.usage)
+
+    async def _collect_llm_usage(self, report: MigrationReport):
+        """Emit each agent's LLM usage and snapshot per-agent/per-phase totals into the report."""
+        snapshot = self.usage.snapshot()
+        for key, stats in snapshot["by_agent"].items():
+            agent = self._agents_by_key.get(key)
+            if agent is None:
+                continue
+            try:
+                await agent.log_llm_usage(stats)
+            except Exception as e:
+                logger.warning(f"Failed to emit LLM usage for {key}: {e}")
+        report.llm_usage = snapshot
     
     # ── Preflight Checks ─────────────────────────────────────
     
@@ -195,10 +268,14 @@ class OrchestratorAgent:
         
         # Add memory state summary for debugging
         try:
-            mem_keys = list(memory._redis.keys("*")) if hasattr(memory, '_redis') else []
+            key_sample = []
+            async for key in self.memory.aio.iter_keys(count=10):
+                key_sample.append(key)
+                if len(key_sample) >= 5:
+                    break
             event["debug"] = {
-                "memory_keys_count": len(mem_keys),
-                "key_sample": mem_keys[:5] if mem_keys else [],
+                "memory_keys_count": await self.memory.aio.key_count(),
+                "key_sample": key_sample,
             }
         except:
             event["debug"] = {}
@@ -215,12 +292,12 @@ class OrchestratorAgent:
             "type": "status",
             "status": status,
             "message": message,
-            "tasks": memory.get_build_plan() or {},
+            "tasks": await self.memory.aio.get_build_plan() or {},
             "agents": self._agent_states(),
         })
 
     async def _emit_progress(self):
-        plan = memory.get_build_plan() or {"tasks": []}
+        plan = await self.memory.aio.get_build_plan() or {"tasks": []}
         tasks = plan.get("tasks", [])
         done = sum(1 for t in tasks if t["status"] == "done")
         total = len(tasks) or 1
@@ -249,7 +326,7 @@ class OrchestratorAgent:
 
     # ── Build plan ────────────────────────────────────────────
 
-    def _init_build_plan(self, source: str, mode: str) -> dict:
+    async def _init_build_plan(self, source: str, mode: str) -> dict:
         tasks = [dict(t) for t in BUILD_PHASES]
         for t in tasks:
             t["status"] = "pending"
@@ -260,12 +337,25 @@ class OrchestratorAgent:
             "tasks": tasks,
             "started_at": time.time(),
         }
-        memory.set_build_plan(plan)
+        await self.memory.aio.set_build_plan(plan)
         return plan
 
     async def _mark_task(self, task_id: int, status: str, detail: str = ""):
-        memory.update_task_status(task_id, status, detail)
+        await self.memory.aio.update_task_status(task_id, status, detail)
         await self._emit_progress()
+        phase = next((p for p in BUILD_PHASES if p["id"] == task_id), None)
+        if phase and status == "active":
+            # LLM calls until the next phase starts are attributed to this one
+            llm_usage.current_phase.set(phase["section"].lower())
+            llm_usage.current_agent.set(phase["agent"])
+        elif phase and status == "done":
+            await self._emit_phase_usage(phase)
+
+    async def _emit_phase_usage(self, phase: dict):
+        stats = self.usage.snapshot()["by_phase"].get(phase["section"].lower()) if self.usage else None
+        agent = self._agents_by_key.get(phase["agent"])
+        if stats and agent:
+            await agent.log_llm_usage(stats, category=f"llm.phase.{phase['section'].lower()}")
 
     # ── Main orchestration ────────────────────────────────────
 
@@ -284,9 +374,11 @@ class OrchestratorAgent:
         report = MigrationReport()
         
         self.job_id = job_id or str(uuid.uuid4())[:8]
-        memory.clear_job(self.job_id)
+        await self._scope_memory()
+        self._attach_drupal_metrics()
+        self._start_usage_tracking()
 
-        plan = self._init_build_plan(source, mode)
+        plan = await self._init_build_plan(source, mode)
         await self._emit({"type": "started", "job_id": self.job_id, "tasks": plan["tasks"], "report": report.to_dict()})
         await self._relay_log({
             "type": "log",
@@ -297,6 +389,7 @@ class OrchestratorAgent:
         })
 
         result = {}
+        self._open_drupal_client()
 
         try:
             # ── Preflight Checks ────────────────────────────────────
@@ -358,7 +451,7 @@ class OrchestratorAgent:
             except Exception as e:
                 report.add_failed_phase("training", str(e))
                 report.add_warning(f"Training failed (non-blocking): {str(e)}")
-            await self._mark_task(3, "done", f"{len(memory.list_components())} components documented")
+            await self._mark_task(3, "done", f"{len(await self.memory.aio.list_components())} components documented")
             logger.info(f"PHASE 3: TRAINING - Complete")
 
             # ── Phase 4: Mapping ───────────────────────────────────
@@ -390,7 +483,7 @@ class OrchestratorAgent:
                 report.add_failed_phase("build", str(e))
                 report.add_warning(f"Build failed (non-blocking): {str(e)}")
                 build_result = {}
-            built_pages = memory.get_or_default("built_pages", [])
+            built_pages = await self.memory.aio.get_or_default("built_pages", [])
             
             # Ensure built_pages is a list (defensive)
             if isinstance(built_pages, str):
@@ -475,7 +568,7 @@ class OrchestratorAgent:
             await self._mark_task(10, "active")
             
             # Check if there are items needing review
-            mapping_manifest = memory.get_mapping_manifest() or {}
+            mapping_manifest = await self.memory.aio.get_mapping_manifest() or {}
             review_needed = mapping_manifest.get("requires_review", False) if mapping_manifest else False
             
             if review_needed:
@@ -514,7 +607,10 @@ class OrchestratorAgent:
             # If tests failed, attempt one more build pass
             if not test_result.get("ready_for_qa", False):
                 fixes = test_result.get("fixes_needed", [])
-                if fixes:
+                budget_spent = llm_usage.budget_exceeded()
+                if fixes and budget_spent:
+                    report.add_warning(f"Skipped fix pass: {budget_spent}")
+                elif fixes:
                     await self._relay_log({
                         "type": "log",
                         "agent": "orchestrator",
@@ -532,6 +628,9 @@ class OrchestratorAgent:
             except:
                 site_url = ""
             
+            await self._collect_drupal_metrics(report)
+            await self._collect_llm_usage(report)
+
             # Determine final status
             if report.failed_phases:
                 if report.completed_phases:
@@ -574,6 +673,8 @@ class OrchestratorAgent:
             import traceback
             tb = traceback.format_exc()
             report.add_error(str(e))
+            await self._collect_drupal_metrics(report)
+            await self._collect_llm_usage(report)
             report.finalize(MigrationStatus.FAILED)
             result = {
                 "status": "error", 
@@ -588,8 +689,10 @@ class OrchestratorAgent:
                 "detail": f"{e}\n\nTraceback:\n{tb}",
             })
             await self._emit({"type": "error", "message": str(e), "report": report.to_dict()})
+        finally:
+            await self._close_drupal_client()
 
-        memory.set(f"job_{self.job_id}_result", result)
+        await self.memory.aio.set("result", result)
         return result
 
     def _build_summary(self, blueprint, built_pages, test_result, qa_result) -> str:
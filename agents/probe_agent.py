@@ -11,7 +11,6 @@ import logging
 import time
 from typing import Any, Optional
 from base_agent import BaseAgent
-from memory import memory as shared_memory
 from drupal_client import DrupalClient
 
 # Configure logging for ProbeAgent
@@ -38,6 +37,8 @@ Store results as capability envelopes in memory under key "capability_envelopes/
 class ProbeAgent(BaseAgent):
     """Empirically probes Drupal components and builds capability envelopes."""
 
+    PARALLEL_SAFE_TOOLS = BaseAgent.PARALLEL_SAFE_TOOLS | {"get_envelope", "list_envelopes"}
+
     def __init__(self):
         super().__init__("probe", "ProbeAgent")
         self.drupal = DrupalClient()
@@ -58,22 +59,24 @@ class ProbeAgent(BaseAgent):
         })
         
         # Check if we need to probe (not forced and recent probe exists)
-        last_probe = shared_memory.get("last_probe_timestamp")
+        last_probe = self.memory.get("last_probe_timestamp")
         if not force and last_probe:
             age = time.time() - last_probe
             if age < self._probe_interval:
                 await self.log(f"Skipping probe - last probe was {int(age/3600)}h ago")
-                envelopes = shared_memory.list_capability_envelopes()
+                envelopes = self.memory.list_capability_envelopes()
                 await self.log_extended("probe_skipped", {
                     "age_hours": int(age/3600),
                     "envelope_count": len(envelopes),
                 })
                 return {"status": "skipped", "envelopes_count": len(envelopes), "age_hours": int(age/3600)}
 
+        # A probe must see the live schema, not cached discovery results
+        self.drupal.invalidate_metadata()
         result = await asyncio.to_thread(self._probe_components)
         
         # Update timestamp
-        shared_memory.set("last_probe_timestamp", time.time())
+        self.memory.set("last_probe_timestamp", time.time())
         
         # Log detailed results
         envelope_count = len(result.get('envelopes', {}))
@@ -108,9 +111,9 @@ class ProbeAgent(BaseAgent):
             
             envelope = self._probe_content_type(machine_name, ct)
             envelopes[machine_name] = envelope
-            
-            # Store in memory
-            shared_memory.set_capability_envelope(machine_name, envelope)
+
+        # Store in memory in one pipelined write
+        self.memory.set_capability_envelopes(envelopes)
 
         # Also probe menus, taxonomy, blocks
         self._probe_menus()
@@ -318,7 +321,7 @@ class ProbeAgent(BaseAgent):
                 "available": [{"id": m["id"], "label": m["label"], "machine_name": m["machine_name"]} for m in menus],
                 "stable": True,
             }
-            shared_memory.set_capability_envelope("menus", envelope)
+            self.memory.set_capability_envelope("menus", envelope)
         except Exception as e:
             logger.warning(f"Menu probing failed: {e}")
 
@@ -328,15 +331,15 @@ class ProbeAgent(BaseAgent):
             # Try common vocabularies
             for vocab in ["tags", "categories"]:
                 try:
-                    terms = self.drupal.get_terms(vocab)
+                    term_count = sum(1 for _ in self.drupal.iter_terms(vocab, fields=["name"]))
                     envelope = {
                         "type": "taxonomy",
                         "vocabulary": vocab,
                         "probed_at": time.time(),
-                        "term_count": len(terms),
+                        "term_count": term_count,
                         "stable": True,
                     }
-                    shared_memory.set_capability_envelope(f"taxonomy_{vocab}", envelope)
+                    self.memory.set_capability_envelope(f"taxonomy_{vocab}", envelope)
                 except:
                     pass
         except Exception as e:
@@ -352,7 +355,7 @@ class ProbeAgent(BaseAgent):
                 "available": [b.get("id", "") for b in block_types],
                 "stable": True,
             }
-            shared_memory.set_capability_envelope("blocks", envelope)
+            self.memory.set_capability_envelope("blocks", envelope)
         except Exception as e:
             logger.warning(f"Block probing failed: {e}")
 
@@ -360,14 +363,14 @@ class ProbeAgent(BaseAgent):
 
     def _tool_get_envelope(self, component: str) -> str:
         """Get capability envelope for a specific component."""
-        envelope = shared_memory.get_capability_envelope(component)
+        envelope = self.memory.get_capability_envelope(component)
         if envelope:
             return json.dumps(envelope)
         return f"No envelope found for '{component}'. Run probe first."
 
     def _tool_list_envelopes(self) -> str:
         """List all available capability envelopes."""
-        envelopes = shared_memory.list_capability_envelopes()
+        envelopes = self.memory.list_capability_envelopes()
         return json.dumps(envelopes)
 
     # ── Background probe scheduler ─────────────────────────────────
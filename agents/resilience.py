@@ -0,0 +1,277 @@
+"""
+DrupalMind — Request resilience
+Retry, circuit breaking and adaptive concurrency for calls against Drupal.
+  - RetryPolicy: jittered exponential backoff that honors Retry-After
+  - CircuitBreaker: fails fast while an endpoint family keeps erroring
+    (transport errors and 5xx other than 503; overload is the limiter's job)
+  - AdaptiveLimiter: AIMD concurrency limit — halves on overload (429/503),
+    grows back by ~1 slot per round of successes
+State is shared per Drupal host so every client in the process sees the
+same picture of the server's capacity.
+"""
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger("drupalmind.resilience")
+
+
+RETRY_MAX_ATTEMPTS = int(os.getenv("DRUPAL_RETRY_MAX_ATTEMPTS", "5"))
+RETRY_BASE_DELAY = float(os.getenv("DRUPAL_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("DRUPAL_RETRY_MAX_DELAY", "30"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("DRUPAL_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("DRUPAL_BREAKER_RESET_TIMEOUT", "30"))
+ADAPTIVE_MIN_CONCURRENCY = int(os.getenv("DRUPAL_ADAPTIVE_MIN_CONCURRENCY", "1"))
+ADAPTIVE_INITIAL_CONCURRENCY = int(os.getenv("DRUPAL_ADAPTIVE_INITIAL_CONCURRENCY", "8"))
+ADAPTIVE_MAX_CONCURRENCY = int(os.getenv("DRUPAL_ADAPTIVE_MAX_CONCURRENCY", "32"))
+
+# The server is shedding load: back off and shrink concurrency
+OVERLOAD_STATUS = {429, 503}
+# Worth another attempt; 502/504 only for idempotent methods, since the write may have landed
+RETRYABLE_STATUS = OVERLOAD_STATUS | {502, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "PATCH"}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the endpoint family's breaker is open."""
+
+    def __init__(self, family: str, retry_in: float):
+        super().__init__(f"Circuit open for {family}; retry in {retry_in:.1f}s")
+        self.family = family
+        self.retry_in = retry_in
+
+
+def endpoint_family(url: str) -> str:
+    """Group URLs by entity type: /jsonapi/node/article/… → "jsonapi/node"."""
+    parts = [p for p in urlparse(url).path.split("/") if p]
+    if not parts:
+        return "/"
+    if parts[0] == "jsonapi" and len(parts) > 1:
+        return f"jsonapi/{parts[1]}"
+    return parts[0]
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# ── Retry ─────────────────────────────────────────────────────
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = RETRY_MAX_ATTEMPTS, base_delay: float = RETRY_BASE_DELAY,
+                 max_delay: float = RETRY_MAX_DELAY):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def retry_status(self, method: str, status: int, attempt: int) -> bool:
+        if attempt + 1 >= self.max_attempts or status not in RETRYABLE_STATUS:
+            return False
+        return status in OVERLOAD_STATUS or method.upper() in IDEMPOTENT_METHODS
+
+    def retry_error(self, method: str, connect_failed: bool, attempt: int) -> bool:
+        """Transport errors: safe to resend if the request never reached the server."""
+        if attempt + 1 >= self.max_attempts:
+            return False
+        return connect_failed or method.upper() in IDEMPOTENT_METHODS
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff; a server-supplied Retry-After is the floor."""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay) + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+# ── Circuit breaker ──────────────────────────────────────────
+
+class CircuitBreaker:
+    """
+    closed → open after `failure_threshold` consecutive failures; open → half-open
+    after `reset_timeout`, letting one trial request through; its outcome closes
+    or re-opens the circuit. Only transport errors and non-overload 5xx are
+    failures: 429/503 mean the server is healthy but busy, which the adaptive
+    limiter and Retry-After backoff handle.
+    """
+
+    def __init__(self, family: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.family = family
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        with self._lock:
+            if self.state == "closed":
+                return
+            elapsed = time.monotonic() - self.opened_at
+            if self.state == "open" and elapsed >= self.reset_timeout:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError(self.family, max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                logger.info(f"[RESILIENCE] Circuit closed for {self.family}")
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_response(self, status: int):
+        if status in OVERLOAD_STATUS:
+            self.record_overload()
+        elif status >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def record_overload(self):
+        """Neither success nor failure; a half-open trial just frees its slot for the next one."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    logger.warning(f"[RESILIENCE] Circuit opened for {self.family} after {self.failures} failures")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+# ── Adaptive concurrency ─────────────────────────────────────
+
+class _AIMD:
+    """Additive-increase / multiplicative-decrease window shared by both limiters."""
+
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        self.min_limit = max(1, minimum)
+        self.max_limit = max(self.min_limit, maximum)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.in_flight = 0
+        self._last_decrease = 0.0
+
+    def _grow(self):
+        # +1 slot once roughly `limit` requests have succeeded
+        self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+    def _shrink(self, rtt: float):
+        # Responses from the same overloaded window only count once
+        now = time.monotonic()
+        if now - self._last_decrease < max(rtt, 0.05):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit / 2)
+        logger.info(f"[RESILIENCE] Overload — concurrency limit now {int(self.limit)}")
+
+    def _has_slot(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+
+class AdaptiveLimiter(_AIMD):
+    """Blocking AIMD limiter for thread-pooled callers."""
+
+    def __init__(self, initial: int = ADAPTIVE_INITIAL_CONCURRENCY, minimum: int = ADAPTIVE_MIN_CONCURRENCY,
+                 maximum: int = ADAPTIVE_MAX_CONCURRENCY):
+        super().__init__(initial, minimum, maximum)
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            self._cond.wait_for(self._has_slot)
+            self.in_flight += 1
+
+    def release(self, overloaded: bool = False, ok: bool = True, rtt: float = 0.0):
+        with self._cond:
+            self.in_flight -= 1
+            if overloaded:
+                self._shrink(rtt)
+            elif ok:
+                self._grow()
+            self._cond.notify_all()
+
+
+class AsyncAdaptiveLimiter(_AIMD):
+    """AIMD limiter for coroutines on one event loop."""
+
+    def __init__(self, initial: int = ADAPTIVE_INITIAL_CONCURRENCY, minimum: int = ADAPTIVE_MIN_CONCURRENCY,
+                 maximum: int = ADAPTIVE_MAX_CONCURRENCY):
+        super().__init__(initial, minimum, maximum)
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(self._has_slot)
+            self.in_flight += 1
+
+    async def release(self, overloaded: bool = False, ok: bool = True, rtt: float = 0.0):
+        async with self._cond:
+            self.in_flight -= 1
+            if overloaded:
+                self._shrink(rtt)
+            elif ok:
+                self._grow()
+            self._cond.notify_all()
+
+
+# ── Per-host registry ────────────────────────────────────────
+
+class HostResilience:
+    """Retry policy, per-family breakers and the blocking limiter for one Drupal host."""
+
+    def __init__(self):
+        self.policy = RetryPolicy()
+        self.limiter = AdaptiveLimiter()
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        family = endpoint_family(url)
+        with self._lock:
+            if family not in self._breakers:
+                self._breakers[family] = CircuitBreaker(family)
+            return self._breakers[family]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            breakers = {f: b.state for f, b in self._breakers.items()}
+        return {"concurrency_limit": int(self.limiter.limit), "in_flight": self.limiter.in_flight,
+                "breakers": breakers}
+
+
+_hosts: dict[str, HostResilience] = {}
+_hosts_lock = threading.Lock()
+
+
+def for_host(base_url: str) -> HostResilience:
+    host = urlparse(base_url).netloc or base_url
+    with _hosts_lock:
+        if host not in _hosts:
+            _hosts[host] = HostResilience()
+        return _hosts[host]
@@ -6,7 +6,6 @@ v2: Reads ready-made envelopes from ProbeAgent instead of self-discovering.
 import json
 import asyncio
 from base_agent import BaseAgent
-from memory import memory as shared_memory
 
 
 SYSTEM_PROMPT = """You are the TrainAgent for DrupalMind. Your job is to:
@@ -51,35 +50,35 @@ class TrainAgent(BaseAgent):
         knowledge = {}
         
         # Get all capability envelopes from ProbeAgent
-        envelope_names = shared_memory.list_capability_envelopes()
+        envelope_names = self.memory.list_capability_envelopes()
         
         if not envelope_names:
             # No envelopes yet - fall back to direct discovery
             return self._fallback_discovery()
         
-        # Transform envelopes into component knowledge
+        # Transform envelopes into component knowledge (one MGET in, one pipeline out)
+        envelopes = self.memory.get_capability_envelopes(envelope_names)
         for env_name in envelope_names:
-            envelope = shared_memory.get_capability_envelope(env_name)
+            envelope = envelopes.get(env_name)
             if not envelope:
                 continue
                 
             # Convert envelope to component format for backward compatibility
-            component_doc = self._envelope_to_component(envelope)
-            
-            # Store in both locations
-            shared_memory.set_component(env_name, component_doc)
-            knowledge[env_name] = component_doc
+            knowledge[env_name] = self._envelope_to_component(envelope)
+        
+        # Store in both locations
+        components = dict(knowledge)
         
         # Also load menus and taxonomy from envelopes if available
-        if "menus" in envelope_names:
-            menus_envelope = shared_memory.get_capability_envelope("menus")
-            if menus_envelope:
-                shared_memory.set_component("menus", {
-                    "type": "menus",
-                    "description": "Drupal navigation menus",
-                    "available": menus_envelope.get("available", []),
-                    "usage": "Use menu_link_content API to add items",
-                })
+        menus_envelope = envelopes.get("menus")
+        if menus_envelope:
+            components["menus"] = {
+                "type": "menus",
+                "description": "Drupal navigation menus",
+                "available": menus_envelope.get("available", []),
+                "usage": "Use menu_link_content API to add items",
+            }
+        self.memory.set_components(components)
         
         # Store training summary
         summary = {
@@ -195,7 +194,7 @@ class TrainAgent(BaseAgent):
     def _train_specific(self, component: str) -> dict:
         """Train on a specific component - check envelopes first, then fallback."""
         # Try envelopes first
-        envelope = shared_memory.get_capability_envelope(component)
+        envelope = self.memory.get_capability_envelope(component)
         if envelope:
             return self._envelope_to_component(envelope)
         
@@ -273,12 +272,13 @@ class TrainAgent(BaseAgent):
             }
         ]
         try:
-            response = self.client.messages.create(
-                model=self.MODEL,
+            response = self.llm.call_with_tools(
+                model=self.llm.get_model(),
                 max_tokens=1024,
+                system="",
                 messages=messages,
             )
-            text = response.content[0].text.strip()
+            text = response["content"].strip()
             import re
             text = re.sub(r"^```json\s*", "", text)
             text = re.sub(r"```\s*$", "", text)
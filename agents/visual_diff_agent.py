@@ -8,10 +8,9 @@ import json
 import asyncio
 import logging
 import os
-import base64
 from typing import Any, Optional
 from base_agent import BaseAgent
-from memory import memory as shared_memory
+from blob_store import blob_store
 from drupal_client import DrupalClient
 
 # Configure logging for VisualDiffAgent
@@ -38,6 +37,8 @@ SIMILARITY_GOOD = 0.90
 class VisualDiffAgent(BaseAgent):
     """Compares source and Drupal visually using Playwright."""
 
+    PARALLEL_SAFE_TOOLS = BaseAgent.PARALLEL_SAFE_TOOLS | {"get_diff", "get_latest_diff"}
+
     def __init__(self):
         super().__init__("visualdiff", "VisualDiffAgent")
         self.drupal = DrupalClient()
@@ -131,7 +132,7 @@ class VisualDiffAgent(BaseAgent):
             
             # Store in memory
             scope_key = component_scope or drupal_path.replace("/", "_")
-            shared_memory.set_visual_diff(scope_key, result)
+            self.memory.set_visual_diff(scope_key, result)
             
             await self.log_done(
                 f"Visual diff complete - {result.get('similarity', 0)*100:.1f}% similarity"
@@ -165,32 +166,18 @@ class VisualDiffAgent(BaseAgent):
         page = self._browser.new_page()
         
         try:
-            # Capture source page as base64
-            sourceScreenshotB64 = self._capture_screenshot_base64(page, source_url)
-            
-            # Capture Drupal page as base64
+            # Capture both pages as raw PNG bytes
+            source_png = self._capture_screenshot(page, source_url)
             drupal_url = self.drupal.base_url + drupal_path
-            drupalScreenshotB64 = self._capture_screenshot_base64(page, drupal_url)
+            drupal_png = self._capture_screenshot(page, drupal_url)
             
             # Compute perceptual hash similarity
-            sourceBytes = sourceScreenshotB64.replace("data:image/png;base64,", "") if sourceScreenshotB64 else ""
-            drupalBytes = drupalScreenshotB64.replace("data:image/png;base64,", "") if drupalScreenshotB64 else ""
-            
-            import base64
             similarity = 0.0
-            if sourceBytes and drupalBytes:
-                similarity = self._compute_image_similarity(
-                    base64.b64decode(sourceBytes),
-                    base64.b64decode(drupalBytes)
-                )
-            
-            # Identify regions with differences (simplified)
             regions = []
-            if sourceBytes and drupalBytes:
-                regions = self._identify_differing_regions(
-                    base64.b64decode(sourceBytes),
-                    base64.b64decode(drupalBytes)
-                )
+            if source_png and drupal_png:
+                similarity = self._compute_image_similarity(source_png, drupal_png)
+                # Identify regions with differences (simplified)
+                regions = self._identify_differing_regions(source_png, drupal_png)
             
             # Generate refinement instructions
             instructions = self._generate_instructions(similarity, regions)
@@ -205,8 +192,9 @@ class VisualDiffAgent(BaseAgent):
                 "passed": similarity >= SIMILARITY_THRESHOLD,
                 "good_match": similarity >= SIMILARITY_GOOD,
                 "scope": scope or drupal_path,
-                "source_screenshot": sourceScreenshotB64,
-                "drupal_screenshot": drupalScreenshotB64,
+                # blob:<sha256> references, served by GET /blobs/{id}
+                "source_screenshot": blob_store.put(source_png, "image/png") if source_png else "",
+                "drupal_screenshot": blob_store.put(drupal_png, "image/png") if drupal_png else "",
             }
             
         finally:
@@ -221,17 +209,6 @@ class VisualDiffAgent(BaseAgent):
             logger.warning(f"Failed to capture {url}: {e}")
             return b""
 
-    def _capture_screenshot_base64(self, page, url: str) -> str:
-        """Capture screenshot of a URL as base64."""
-        try:
-            page.goto(url, wait_until="networkidle", timeout=30000)
-            import base64
-            screenshot_bytes = page.screenshot()
-            return f"data:image/png;base64,{base64.b64encode(screenshot_bytes).decode('utf-8')}"
-        except Exception as e:
-            logger.warning(f"Failed to capture {url}: {e}")
-            return ""
-
     def _compute_image_similarity(self, img1: bytes, img2: bytes) -> float:
         """
         Compute perceptual hash similarity between two images.
@@ -372,20 +349,20 @@ class VisualDiffAgent(BaseAgent):
 
     def _tool_get_diff(self, scope: str) -> str:
         """Get visual diff result for a specific scope."""
-        diff = shared_memory.get_visual_diff(scope)
+        diff = self.memory.get_visual_diff(scope)
         if diff:
             return json.dumps(diff, indent=2)
         return f"No diff found for scope '{scope}'"
 
     def _tool_get_latest_diff(self) -> str:
         """Get the most recent diff result."""
-        keys = shared_memory.list_keys("visual_diff/")
+        keys = self.memory.list_keys("visual_diff/")
         if not keys:
             return "No diffs available"
         
         # Get the most recent key
         latest_key = sorted(keys)[-1]
-        diff = shared_memory.get_visual_diff(latest_key.replace("visual_diff/", ""))
+        diff = self.memory.get_visual_diff(latest_key.replace("visual_diff/", ""))
         
         if diff:
             return json.dumps(diff, indent=2)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+DrupalMind Benchmark - Measure Drupal write throughput without a real Drupal.
+Usage: python run_benchmark.py [--items 500] [--latency-ms 40] [--rate-429 0.02] [--capacity 16]
+
+Starts the fake JSON:API server from agents/fake_drupal.py in-process (or uses
+--drupal-url) and times the Drupal-facing parts of the pipeline on synthetic input:
+  content  - ContentAgent._migrate_all over N blueprint sections
+  rerun    - the same migration again (upsert: everything unchanged)
+  build    - BuildAgent._build_individual_pages_v5 over N pages
+  list     - stream every article back with DrupalClient.iter_nodes
+  media    - MediaMigrator uploads of N files of --file-kb each
+  codec    - encode + decode a 50-node JSON:API page, stdlib json vs the active codec
+No LLM calls are made.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+# Add the agents directory to the path
+agents_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'agents')
+sys.path.insert(0, agents_dir)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark DrupalMind against a fake Drupal")
+    parser.add_argument("--items", type=int, default=200, help="sections / pages / files per scenario")
+    parser.add_argument("--file-kb", type=int, default=512, help="size of each media file")
+    parser.add_argument("--scenarios", default="content,rerun,build,list,media,codec")
+    parser.add_argument("--drupal-url", help="use an already running (fake) Drupal instead of starting one")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--rate-429", type=float, default=0)
+    parser.add_argument("--capacity", type=int, default=0)
+    parser.add_argument("--no-atomic", action="store_true")
+    parser.add_argument("--no-gzip", action="store_true")
+    return parser.parse_args()
+
+
+def synthetic_blueprint(source_url: str, n: int) -> dict:
+    return {
+        "source_url": source_url,
+        "title": "Benchmark Site",
+        "navigation": [{"title": f"Category {i}", "url": f"{source_url}/c{i}"} for i in range(5)],
+        "sections": [
+            {"index": i, "type": "content", "heading": f"Section {i}",
+             "text_preview": f"Benchmark body text for section {i}. " * 20}
+            for i in range(n)
+        ],
+        "pages": [
+            {"title": f"Page {i}", "path": f"/page-{i}", "content_type": "page"}
+            for i in range(n)
+        ],
+    }
+
+
+async def _with_agent(agent, run):
+    """Await run() and close the agent's pooled async Drupal client afterwards."""
+    try:
+        return await run()
+    finally:
+        await agent.aclose()
+
+
+def main():
+    args = parse_args()
+    server = None
+    if args.drupal_url:
+        os.environ["DRUPAL_API_URL"] = args.drupal_url
+    else:
+        from fake_drupal import FakeDrupalServer
+        server = FakeDrupalServer(
+            latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+            rate_429=args.rate_429, capacity=args.capacity, atomic=not args.no_atomic,
+            compress=not args.no_gzip,
+        ).start()
+        os.environ["DRUPAL_API_URL"] = server.url
+    # Agents need a provider configured even though no LLM call is made here
+    os.environ.setdefault("LLM_PROVIDER", "ollama")
+
+    import codec
+    from drupal_metrics import DrupalMetrics
+    from agents import ContentAgent
+    from build_agent import BuildAgent
+    from media_migrator import MediaMigrator
+
+    print(f"Drupal: {os.environ['DRUPAL_API_URL']}  items={args.items}  codec={codec.CODEC_NAME}  "
+          f"accept-encoding={codec.ACCEPT_ENCODING}")
+    print("=" * 60)
+
+    # Fresh source URL so the entity index never matches an earlier benchmark run
+    blueprint = synthetic_blueprint(f"https://bench-{uuid.uuid4().hex[:8]}.example", args.items)
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    results = []
+
+    for name in scenarios:
+        metrics = DrupalMetrics()
+        started = time.perf_counter()
+        if name in ("content", "rerun"):
+            agent = ContentAgent()
+            agent.attach_drupal_metrics(metrics)
+            outcome = asyncio.run(_with_agent(agent, lambda: agent._migrate_all(blueprint, {})))
+            items = len(blueprint["sections"])
+            detail = f"written={outcome['created']} unchanged={outcome.get('unchanged', 0)} errors={len(outcome['errors'])}"
+        elif name == "build":
+            agent = BuildAgent()
+            agent.attach_drupal_metrics(metrics)
+            outcome = asyncio.run(_with_agent(
+                agent, lambda: agent.run_in_thread(agent._build_individual_pages_v5, blueprint)
+            ))
+            items = len(blueprint["pages"])
+            detail = f"built={outcome['built_pages']} errors={len(outcome['errors'])}"
+        elif name == "list":
+            agent = ContentAgent()
+            agent.attach_drupal_metrics(metrics)
+            items = sum(1 for _ in agent.drupal.iter_nodes("article"))
+            detail = "streamed with links.next"
+        elif name == "codec":
+            page = json.dumps({"data": [
+                {"type": "node--article", "id": str(uuid.uuid4()),
+                 "attributes": {"title": f"Node {i}", "body": {"value": "<p>Lorem ipsum</p>" * 100,
+                                                               "format": "full_html"}}}
+                for i in range(50)
+            ]}).encode()
+            rounds = max(args.items, 50)
+            t0 = time.perf_counter()
+            for _ in range(rounds):
+                json.dumps(json.loads(page.decode()))
+            stdlib = time.perf_counter() - t0
+            started = time.perf_counter()
+            for _ in range(rounds):
+                codec.dumps(codec.loads(page))
+            items = rounds
+            detail = f"{codec.CODEC_NAME} vs stdlib json: {stdlib / max(time.perf_counter() - started, 1e-9):.1f}x ({len(page) // 1024} KiB page)"
+        elif name == "media":
+            agent = ContentAgent()
+            agent.attach_drupal_metrics(metrics)
+            with tempfile.TemporaryDirectory() as tmp:
+                migrator = MediaMigrator(agent.async_drupal, blueprint["source_url"], cache_dir=tmp)
+                payload = os.urandom(args.file_kb * 1024)
+                paths = []
+                for i in range(args.items):
+                    path = os.path.join(tmp, f"bench_{i}.jpg")
+                    with open(path, "wb") as f:
+                        f.write(payload)
+                    paths.append(path)
+                async def _upload_all() -> int:
+                    file_ids = await asyncio.gather(*(migrator._upload_to_drupal(p, p) for p in paths))
+                    return sum(1 for file_id in file_ids if file_id)
+
+                started = time.perf_counter()
+                uploaded = asyncio.run(_with_agent(agent, _upload_all))
+            items = args.items
+            detail = f"uploaded={uploaded} ({args.file_kb} KiB each)"
+        else:
+            print(f"Unknown scenario: {name}")
+            continue
+        elapsed = time.perf_counter() - started
+        snap = metrics.snapshot()
+        results.append({"scenario": name, "items": items, "seconds": round(elapsed, 3),
+                        "items_per_second": round(items / elapsed, 1) if elapsed else None,
+                        "requests": snap["total_requests"], "errors": snap["total_errors"], "detail": detail})
+        print(f"{name:<8} {items:>6} items  {elapsed:8.2f}s  {items / elapsed if elapsed else 0:8.1f}/s  "
+              f"requests={snap['total_requests']}  {detail}")
+
+    print("=" * 60)
+    if server:
+        print(f"Server: {json.dumps(server.drupal.stats)}")
+        server.stop()
+    return results
+
+
+if __name__ == "__main__":
+    main()